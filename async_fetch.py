@@ -0,0 +1,236 @@
+import asyncio
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+import pandas as pd
+
+import data_download as dd
+from batch_analysis import TickerResult
+
+
+class TransientFetchError(Exception):
+    """Временная ошибка загрузки (сеть, ограничение частоты запросов), после которой запрос стоит повторить."""
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Определяет, является ли ошибка временной: сетевые ошибки и тайм-ауты (OSError, в том числе ошибки соединения
+    requests), ограничение частоты запросов Yahoo Finance (YFRateLimitError, если он есть в установленной версии
+    yfinance) и TransientFetchError.
+
+    Parameters:
+        error (BaseException): Ошибка загрузки.
+
+    Returns:
+        bool: True, если запрос стоит повторить.
+    """
+    if isinstance(error, (TransientFetchError, OSError, TimeoutError)):
+        return True
+    yfinance = sys.modules.get('yfinance')
+    if yfinance is None:
+        return False
+    # В закреплённой версии yfinance (0.2.37) YFRateLimitError ещё нет
+    rate_limit_error = getattr(getattr(yfinance, 'exceptions', None), 'YFRateLimitError', ())
+    return isinstance(error, rate_limit_error)
+
+
+class TokenBucket:
+    """
+    Ограничение частоты запросов алгоритмом token bucket: токены пополняются со скоростью rate в секунду до capacity,
+    каждый запрос забирает один токен и при их отсутствии ждёт пополнения.
+
+    Parameters:
+        rate (float): Число запросов в секунду.
+        capacity (int, optional): Размер всплеска (сколько запросов можно сделать сразу). По умолчанию - max(1, rate).
+    """
+
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate должен быть положительным")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Забирает один токен, при необходимости дожидаясь его появления."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class YFinanceProvider:
+    """
+    Источник данных Yahoo Finance для AsyncStockFetcher. yfinance работает синхронно, поэтому запросы выполняются в
+    пуле потоков; все тикеры используют одну HTTP-сессию (общий пул соединений): переданную session или общую сессию
+    yfinance. Запросы выполняются с raise_errors=True: иначе yfinance перехватывает сетевые ошибки и возвращает пустые
+    данные, и повтор временных ошибок не срабатывает.
+
+    Parameters:
+        session (optional): HTTP-сессия для yfinance (например, requests.Session).
+        max_workers (int): Число потоков для одновременных запросов.
+    """
+
+    def __init__(self, session=None, max_workers: int = 32):
+        self.session = session
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='yfinance')
+
+    async def history(self, ticker: str, period: str, start: Optional[str] = None, end: Optional[str] = None,
+                      interval: str = '1d') -> pd.DataFrame:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            lambda: dd.download_stock_data(ticker, period, start=start, end=end, interval=interval,
+                                           session=self.session, raise_errors=True))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class AsyncStockFetcher:
+    """
+    Асинхронная загрузка данных об акциях для сотен тикеров одновременно: ограничение числа одновременных запросов,
+    ограничение частоты (token bucket) и повтор временных ошибок с экспоненциальной задержкой. Данные имеют тот же
+    формат, что и у fetch_stock_data.
+
+    Parameters:
+        provider (optional): Источник данных с асинхронным методом history(ticker, period, start, end, interval).
+            По умолчанию - YFinanceProvider.
+        concurrency (int): Максимальное число одновременных запросов.
+        rate (float, optional): Максимальное число запросов в секунду. По умолчанию без ограничения.
+        burst (int, optional): Размер всплеска для ограничения частоты.
+        retries (int): Число повторов после временной ошибки.
+        backoff (float): Задержка перед первым повтором в секундах; каждая следующая вдвое больше.
+        max_backoff (float): Максимальная задержка перед повтором.
+        jitter (bool): Случайно уменьшать задержку (до половины), чтобы повторы разных тикеров не совпадали.
+        retry_on (callable): Функция, определяющая, повторять ли запрос после ошибки.
+    """
+
+    def __init__(self, provider=None, concurrency: int = 32, rate: Optional[float] = None, burst: Optional[int] = None,
+                 retries: int = 3, backoff: float = 0.5, max_backoff: float = 30.0, jitter: bool = True,
+                 retry_on: Callable[[BaseException], bool] = is_transient_error):
+        self.provider = provider if provider is not None else YFinanceProvider(max_workers=concurrency)
+        self.concurrency = max(1, concurrency)
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self._semaphore = None
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+
+    def _delay(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.0) if self.jitter else delay
+
+    async def fetch(self, ticker: str, period: str, start: Optional[str] = None, end: Optional[str] = None,
+                    interval: str = '1d') -> pd.DataFrame:
+        """
+        Загружает данные одного тикера с повтором временных ошибок.
+
+        Parameters:
+            ticker (str): Тикер акции.
+            period (str): Период данных.
+            start (str, optional): Начальная дата периода данных.
+            end (str, optional): Конечная дата периода данных.
+            interval (str): Интервал баров.
+
+        Returns:
+            pd.DataFrame: Данные об акциях.
+
+        Raises:
+            Exception: Последняя ошибка, если попытки исчерпаны или ошибка не временная.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        attempt = 0
+        while True:
+            # Семафор удерживается только на время запроса, ожидание перед повтором не занимает слот
+            async with self._semaphore:
+                if self.bucket is not None:
+                    await self.bucket.acquire()
+                self.requests += 1
+                try:
+                    return await self.provider.history(ticker, period, start=start, end=end, interval=interval)
+                except Exception as e:
+                    if attempt >= self.retries or not self.retry_on(e):
+                        self.failures += 1
+                        raise
+            await asyncio.sleep(self._delay(attempt))
+            attempt += 1
+            self.retried += 1
+
+    async def fetch_many(self, tickers: Iterable[str], period: str, start: Optional[str] = None,
+                         end: Optional[str] = None, interval: str = '1d') -> List[TickerResult]:
+        """
+        Загружает данные списка тикеров одновременно. Ошибка по одному тикеру не влияет на остальные и сохраняется в
+        результате; пустые данные тоже считаются ошибкой, чтобы тикер не пропадал из результатов незаметно.
+
+        Parameters:
+            tickers (iterable): Список тикеров.
+            period (str): Период данных.
+            start (str, optional): Начальная дата периода данных.
+            end (str, optional): Конечная дата периода данных.
+            interval (str): Интервал баров.
+
+        Returns:
+            list: Результаты TickerResult в порядке исходного списка тикеров.
+        """
+        async def fetch_one(ticker):
+            started = time.perf_counter()
+            try:
+                data = await self.fetch(ticker, period, start=start, end=end, interval=interval)
+                if data is None or data.empty:
+                    raise ValueError("данные не получены")
+                return TickerResult(ticker, data=data, elapsed=time.perf_counter() - started)
+            except Exception as e:
+                return TickerResult(ticker, error=f"{type(e).__name__}: {e}", elapsed=time.perf_counter() - started)
+
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        return list(await asyncio.gather(*(fetch_one(ticker) for ticker in tickers)))
+
+    def stats(self) -> dict:
+        """Возвращает число запросов, повторов и неудачных загрузок."""
+        return {'requests': self.requests, 'retries': self.retried, 'failures': self.failures}
+
+    def close(self) -> None:
+        """Освобождает ресурсы источника данных (пул потоков)."""
+        close = getattr(self.provider, 'close', None)
+        if close is not None:
+            close()
+
+
+def fetch_batch(tickers: Iterable[str], period: str, start: Optional[str] = None, end: Optional[str] = None,
+                interval: str = '1d', **fetcher_params) -> List[TickerResult]:
+    """
+    Синхронная обёртка над AsyncStockFetcher.fetch_many для вызова из обычного кода.
+
+    Parameters:
+        tickers (iterable): Список тикеров.
+        period (str): Период данных.
+        start (str, optional): Начальная дата периода данных.
+        end (str, optional): Конечная дата периода данных.
+        interval (str): Интервал баров.
+        **fetcher_params: Параметры AsyncStockFetcher (concurrency, rate, retries и т.д.).
+
+    Returns:
+        list: Результаты TickerResult в порядке исходного списка тикеров.
+    """
+    fetcher = AsyncStockFetcher(**fetcher_params)
+    try:
+        return asyncio.run(fetcher.fetch_many(tickers, period, start=start, end=end, interval=interval))
+    finally:
+        fetcher.close()
@@ -0,0 +1,143 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+import data_download as dd
+from compact_frames import compact_frame
+from data_cache import StockDataCache
+
+
+@dataclass
+class TickerResult:
+    """
+    Результат обработки одного тикера в пакетном режиме.
+
+    Attributes:
+        ticker (str): Тикер акции.
+        data (pd.DataFrame): Данные с рассчитанными индикаторами или None в случае ошибки.
+        error (str): Текст ошибки или None, если тикер обработан успешно.
+        elapsed (float): Время обработки тикера в секундах.
+        actions (pd.DataFrame): Дивиденды и сплиты в компактном режиме (data без этих колонок), иначе None.
+    """
+    ticker: str
+    data: Optional[pd.DataFrame] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    actions: Optional[pd.DataFrame] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def read_tickers_file(filename: str) -> List[str]:
+    """
+    Читает список тикеров из файла: по одному или несколько через запятую/пробел в строке, строки с '#' пропускаются.
+
+    Parameters:
+        filename (str): Путь к файлу со списком тикеров.
+
+    Returns:
+        list: Список тикеров в верхнем регистре без повторов.
+    """
+    tickers = []
+    with open(filename, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0]
+            tickers.extend(t.strip().upper() for t in line.replace(',', ' ').split() if t.strip())
+    return list(dict.fromkeys(tickers))
+
+
+def analyze_ticker(ticker: str, period: str, start: Optional[str] = None, end: Optional[str] = None,
+                   cache: Optional[StockDataCache] = None, ma_window: int = 5, rsi_window: int = 5,
+                   macd_windows: tuple = (12, 26, 9), compact: bool = False) -> TickerResult:
+    """
+    Загружает данные одного тикера и рассчитывает скользящее среднее, RSI и MACD.
+    Ошибки не выводятся в консоль, а сохраняются в результате.
+
+    Parameters:
+        ticker (str): Тикер акции.
+        period (str): Период данных.
+        start (str, optional): Начальная дата периода данных.
+        end (str, optional): Конечная дата периода данных.
+        cache (StockDataCache, optional): Локальный кэш данных.
+        ma_window (int): Размер окна скользящего среднего.
+        rsi_window (int): Размер окна RSI.
+        macd_windows (tuple): Короткое, длинное и сигнальное окна MACD.
+        compact (bool): Хранить результат в компактном представлении (compact_frames): индикаторы считаются в
+            float64, затем данные переводятся в узкие типы, а дивиденды и сплиты - в поле actions.
+
+    Returns:
+        TickerResult: Результат обработки тикера.
+    """
+    started = time.perf_counter()
+    try:
+        data = dd.download_stock_data(ticker, period, start=start, end=end, cache=cache)
+        if data is None or data.empty:
+            raise ValueError("данные не получены")
+        data = dd.add_moving_average(data, window_size=ma_window)
+        if data is not None:
+            data = dd.calculate_rsi(data, window_size=rsi_window)
+        if data is not None:
+            short_window, long_window, signal_window = macd_windows
+            data = dd.calculate_macd(data, short_window=short_window, long_window=long_window,
+                                     signal_window=signal_window)
+        if data is None:
+            raise ValueError("ошибка при расчёте индикаторов")
+        if compact:
+            compacted = compact_frame(data)
+            return TickerResult(ticker, data=compacted.data, elapsed=time.perf_counter() - started,
+                                actions=compacted.actions)
+        return TickerResult(ticker, data=data, elapsed=time.perf_counter() - started)
+    except Exception as e:
+        return TickerResult(ticker, error=f"{type(e).__name__}: {e}", elapsed=time.perf_counter() - started)
+
+
+def analyze_batch(tickers: Iterable[str], period: str, start: Optional[str] = None, end: Optional[str] = None,
+                  max_workers: int = 8, cache: Optional[StockDataCache] = None,
+                  **indicator_params) -> List[TickerResult]:
+    """
+    Параллельно загружает и обрабатывает список тикеров пулом потоков ограниченного размера.
+    Ошибка по одному тикеру не влияет на остальные.
+
+    Parameters:
+        tickers (iterable): Список тикеров.
+        period (str): Период данных.
+        start (str, optional): Начальная дата периода данных.
+        end (str, optional): Конечная дата периода данных.
+        max_workers (int): Максимальное число одновременных загрузок.
+        cache (StockDataCache, optional): Локальный кэш данных.
+        **indicator_params: Параметры индикаторов, передаваемые в analyze_ticker.
+
+    Returns:
+        list: Результаты TickerResult в порядке исходного списка тикеров.
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [executor.submit(analyze_ticker, ticker, period, start, end, cache, **indicator_params)
+                   for ticker in tickers]
+        return [future.result() for future in futures]
+
+
+def summarize_batch(results: List[TickerResult], wall_time: float) -> dict:
+    """
+    Формирует сводку по пакетной обработке: число успешных и неудачных тикеров и пропускную способность.
+
+    Parameters:
+        results (list): Результаты TickerResult.
+        wall_time (float): Общее время обработки в секундах.
+
+    Returns:
+        dict: Сводка по пакету.
+    """
+    succeeded = sum(result.ok for result in results)
+    return {
+        'tickers': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'wall_time': wall_time,
+        'tickers_per_second': len(results) / wall_time if wall_time > 0 else float('inf'),
+    }
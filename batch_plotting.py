@@ -0,0 +1,106 @@
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+# Шаблон графика в процессе-исполнителе, создаётся один раз и переиспользуется для всех тикеров
+_worker_template = None
+_worker_style = None
+
+
+@dataclass
+class ChartJob:
+    """
+    Задание на построение статического графика одного тикера.
+
+    Attributes:
+        ticker (str): Тикер акции.
+        data (pd.DataFrame): Данные с рассчитанными индикаторами (Moving_Average, RSI, MACD, Signal_Line).
+        std_deviation (float): Стандартное отклонение цены закрытия.
+        filename (str): Имя PNG файла.
+    """
+    ticker: str
+    data: pd.DataFrame
+    std_deviation: float
+    filename: str
+
+
+@dataclass
+class ChartResult:
+    """
+    Результат построения графика.
+
+    Attributes:
+        ticker (str): Тикер акции.
+        filename (str): Имя PNG файла.
+        seconds (float): Время построения и сохранения графика.
+        peak_rss_mb (float): Пиковый объём памяти процесса-исполнителя после построения, МБ.
+        error (str): Текст ошибки или None.
+    """
+    ticker: str
+    filename: str
+    seconds: float
+    peak_rss_mb: float
+    error: Optional[str] = None
+
+
+def _peak_rss_mb() -> float:
+    # В Linux ru_maxrss измеряется в килобайтах
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _init_worker(style: Optional[str]) -> None:
+    """Настраивает процесс-исполнитель: графики строятся без окна (backend Agg)."""
+    global _worker_template, _worker_style
+    import matplotlib
+    matplotlib.use('Agg')
+    _worker_template = None
+    _worker_style = style
+
+
+def _render(job: ChartJob, downsample: Optional[str] = None, max_points: Optional[int] = None) -> ChartResult:
+    """Строит график тикера в шаблоне процесса и сохраняет его в файл."""
+    global _worker_template
+    import data_plotting as dplt
+
+    started = time.perf_counter()
+    try:
+        with dplt._style_context(_worker_style):
+            if _worker_template is None:
+                _worker_template = dplt.build_static_figure()
+            dplt.update_static_figure(_worker_template, job.data, job.ticker, job.std_deviation,
+                                      downsample=downsample, max_points=max_points)
+            _worker_template['figure'].savefig(job.filename)
+        error = None
+    except Exception as e:
+        # Шаблон мог остаться в несогласованном состоянии, при следующем задании он будет создан заново
+        _worker_template = None
+        error = f"{type(e).__name__}: {e}"
+    return ChartResult(job.ticker, job.filename, time.perf_counter() - started, _peak_rss_mb(), error)
+
+
+def render_charts_batch(jobs: Iterable[ChartJob], workers: int = 4, style: Optional[str] = None,
+                        downsample: Optional[str] = None, max_points: Optional[int] = None) -> List[ChartResult]:
+    """
+    Строит статические графики для списка тикеров в нескольких процессах.
+
+    Каждый процесс один раз создаёт шаблон графика (build_static_figure) и для каждого тикера только обновляет данные
+    линий, поэтому память процесса не растёт с числом графиков. Результат совпадает с create_and_save_plot.
+
+    Parameters:
+        jobs (iterable): Задания ChartJob.
+        workers (int): Число процессов.
+        style (str, optional): Стиль графика.
+        downsample (str, optional): Метод прореживания длинных рядов 'lttb' или 'minmax'.
+        max_points (int, optional): Число точек на ряд при прореживании.
+
+    Returns:
+        list: Результаты ChartResult в порядке заданий.
+    """
+    jobs = list(jobs)
+    with ProcessPoolExecutor(max_workers=max(1, workers), initializer=_init_worker, initargs=(style,)) as executor:
+        futures = [executor.submit(_render, job, downsample, max_points) for job in jobs]
+        return [future.result() for future in futures]
@@ -0,0 +1,48 @@
+"""
+Память набора тикеров в компактном представлении (compact_frames: float32 вместо float64, узкий тип объёма, дивиденды
+и сплиты отдельно) против исходного (float64 и int64 для всех колонок), а также ошибка индикаторов, рассчитанных по
+компактным ценам.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_compact --tickers 500 --rows 2520
+"""
+import argparse
+import time
+
+import pandas as pd
+
+import data_download as dd
+from benchmarks.synthetic import generate_universe
+from compact_frames import compact_frame, precision_report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк компактного представления данных.")
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--rows', type=int, default=2520, help="Число строк на тикер (2520 - около 10 лет).")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    universe = generate_universe(args.tickers, args.rows, seed=args.seed)
+    for data in universe.values():
+        # Рабочий набор как после run_analysis: цены и индикаторы
+        dd.add_moving_average(data, 5)
+        dd.calculate_rsi(data, 14)
+        dd.calculate_macd(data)
+
+    started = time.perf_counter()
+    compact = {ticker: compact_frame(data) for ticker, data in universe.items()}
+    elapsed = time.perf_counter() - started
+
+    before = sum(int(data.memory_usage(deep=True).sum()) for data in universe.values())
+    after = sum(frame.memory_usage() for frame in compact.values())
+    print(f"{args.tickers} тикеров x {args.rows} строк: {before / 2 ** 20:.1f} МБ -> {after / 2 ** 20:.1f} МБ "
+          f"(экономия {(1 - after / before) * 100:.1f}%), перевод за {elapsed:.2f} с")
+
+    errors = pd.concat([precision_report(universe[ticker], compact[ticker]) for ticker in list(universe)[:50]])
+    print("\nНаибольшая ошибка индикаторов по компактным ценам (первые 50 тикеров):")
+    print(errors.groupby(level=0, sort=False).max().to_string(float_format='{:.2e}'.format))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Экспорт интерактивных графиков набора тикеров: панель dashboard_export (общий plotly.min.js, данные тикеров float32 в
+base64, загрузка по выбору) против отдельного HTML файла на тикер, как в create_and_show_plot (fig.write_html со
+встроенным plotly.js и рядами в JSON). Сравниваются размер на диске и время записи.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_dashboard --tickers 50 --rows 2520
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import data_download as dd
+import data_plotting as dplt
+from benchmarks.synthetic import generate_universe
+from dashboard_export import export_dashboard
+
+
+def per_file_export(frames: dict, directory: str) -> int:
+    """Отдельный HTML файл на тикер (как create_and_show_plot без открытия браузера). Возвращает размер в байтах."""
+    total = 0
+    for ticker, data in frames.items():
+        fig = dplt.build_interactive_figure(data, ticker, float(data['Close'].std(ddof=1)))
+        path = os.path.join(directory, f'{ticker}_interactive_chart.html')
+        fig.write_html(path)
+        total += os.path.getsize(path)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк экспорта интерактивных графиков набора тикеров.")
+    parser.add_argument('--tickers', type=int, default=50)
+    parser.add_argument('--rows', type=int, default=2520, help="Число строк на тикер (2520 - около 10 лет).")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    frames = generate_universe(args.tickers, args.rows, seed=args.seed)
+    for data in frames.values():
+        dd.add_moving_average(data)
+        dd.calculate_rsi(data, 5)
+        dd.calculate_macd(data)
+    # plotly загружается до замеров
+    dplt.build_interactive_figure(next(iter(frames.values())), 'WARMUP', 1.0)
+
+    print(f"{args.tickers} тикеров x {args.rows} строк:")
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        size = per_file_export(frames, tmp)
+        elapsed = time.perf_counter() - started
+        print(f"  HTML файл на тикер:  {size / 2 ** 20:8.1f} МБ, {elapsed:6.2f} с "
+              f"({size / args.tickers / 2 ** 10:.0f} КБ на тикер)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result = export_dashboard(frames, tmp)
+        data_size = sum(entry.stat().st_size for entry in os.scandir(os.path.join(tmp, 'data')))
+        print(f"  dashboard_export:    {result.bytes_written / 2 ** 20:8.1f} МБ, {result.seconds:6.2f} с "
+              f"({data_size / args.tickers / 2 ** 10:.0f} КБ данных на тикер, "
+              f"plotly.min.js {os.path.getsize(os.path.join(tmp, 'plotly.min.js')) / 2 ** 20:.1f} МБ один раз)")
+
+
+if __name__ == '__main__':
+    main()
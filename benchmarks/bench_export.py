@@ -0,0 +1,70 @@
+"""
+Сравнение времени экспорта и загрузки данных: CSV (export_data_to_csv / pd.read_csv) против Parquet и Feather
+(data_export).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_export --rows 1000000
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+import data_download as dd
+from benchmarks.synthetic import generate_ohlcv
+from data_export import export_data, load_data
+
+
+def timed(func, *args, **kwargs) -> float:
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(*args, **kwargs)
+    return time.perf_counter() - started
+
+
+def run(n_rows: int) -> list:
+    data = generate_ohlcv(n_rows, freq='min', volatility=0.001)
+    start = data.index[n_rows // 2].strftime('%Y-%m-%d')
+    end = data.index[-1].strftime('%Y-%m-%d')
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'data.csv')
+        results.append({
+            'format': 'csv (export_data_to_csv)',
+            'export_seconds': timed(dd.export_data_to_csv, data, csv_path),
+            'load_seconds': timed(pd.read_csv, csv_path, index_col=0),
+            'load_range_seconds': timed(load_data, csv_path, columns=['Close'], start=start, end=end),
+            'size_bytes': os.path.getsize(csv_path),
+        })
+        for name, path in (('parquet', os.path.join(tmp, 'data_parquet')),
+                           ('feather', os.path.join(tmp, 'data.feather'))):
+            export_seconds = timed(export_data, data, path, chunk_size=100_000)
+            size = (sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+                    if os.path.isdir(path) else os.path.getsize(path))
+            results.append({
+                'format': name,
+                'export_seconds': export_seconds,
+                'load_seconds': timed(load_data, path),
+                'load_range_seconds': timed(load_data, path, columns=['Close'], start=start, end=end),
+                'size_bytes': size,
+            })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк форматов экспорта данных.")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    print(f"{'формат':<28}{'экспорт, с':>12}{'загрузка, с':>14}{'Close за период, с':>20}{'размер, МБ':>12}")
+    for result in run(args.rows):
+        print(f"{result['format']:<28}{result['export_seconds']:>12.3f}{result['load_seconds']:>14.3f}"
+              f"{result['load_range_seconds']:>20.3f}{result['size_bytes'] / 1e6:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Поиск сильных колебаний в скользящих окнах для набора тикеров: fluctuation_scanner (скользящие максимум и минимум за
+O(n), параллельно по частям набора) против пересчёта каждого окна целиком и цикла по тикерам с pandas rolling.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_fluctuations --dates 2520 --tickers 1000 --window 20 --threshold 30
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_panel
+from fluctuation_scanner import _column_alerts, scan_universe
+
+
+def window_recompute_scan(panel: pd.DataFrame, window: int, threshold: float) -> list:
+    """Максимум и минимум каждого окна считаются заново: O(n * window) на тикер."""
+    alerts = []
+    for ticker in panel.columns:
+        close = panel[ticker].to_numpy()
+        high, low = np.full(len(close), np.nan), np.full(len(close), np.nan)
+        if len(close) >= window:
+            windows = np.lib.stride_tricks.sliding_window_view(close, window)
+            high[window - 1:], low[window - 1:] = windows.max(axis=1), windows.min(axis=1)
+        fluctuation = (high - low) / low * 100
+        alerts.extend(_column_alerts(ticker, panel.index, fluctuation, high, low, window, threshold))
+    return alerts
+
+
+def pandas_loop_scan(panel: pd.DataFrame, window: int, threshold: float) -> list:
+    """Цикл по тикерам с Series.rolling(window).max() / min()."""
+    alerts = []
+    for ticker in panel.columns:
+        rolling = panel[ticker].rolling(window)
+        high, low = rolling.max().to_numpy(), rolling.min().to_numpy()
+        fluctuation = (high - low) / low * 100
+        alerts.extend(_column_alerts(ticker, panel.index, fluctuation, high, low, window, threshold))
+    return alerts
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк поиска сильных колебаний.")
+    parser.add_argument('--dates', type=int, default=2520, help="Число торговых дней (2520 - около 10 лет).")
+    parser.add_argument('--tickers', type=int, default=1000)
+    parser.add_argument('--window', type=int, nargs='+', default=[20, 250])
+    parser.add_argument('--threshold', type=float, default=30.0)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    # Без пропусков внутри истории: все три способа считают окна с неполными данными одинаково
+    panel = generate_panel(args.dates, args.tickers, gap_rate=0)
+    print(f"Панель {args.dates} дат x {args.tickers} тикеров, порог {args.threshold}%")
+    for window in args.window:
+        scanner_time, alerts = timed(lambda: list(scan_universe(panel, window, args.threshold,
+                                                                workers=args.workers)))
+        pandas_time, pandas_alerts = timed(pandas_loop_scan, panel, window, args.threshold)
+        naive_time, naive_alerts = timed(window_recompute_scan, panel, window, args.threshold)
+        assert len(alerts) == len(pandas_alerts) == len(naive_alerts)
+        print(f"окно {window:>4}: fluctuation_scanner {scanner_time:.2f} с, цикл с pandas rolling {pandas_time:.2f} с, "
+              f"пересчёт каждого окна {naive_time:.2f} с; уведомлений: {len(alerts)}")
+
+
+if __name__ == '__main__':
+    main()
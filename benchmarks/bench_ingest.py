@@ -0,0 +1,93 @@
+"""
+Потоковая загрузка файла минутных баров со сменой разрешения (chunked_ingest) против чтения файла целиком
+(pd.read_csv / pd.read_parquet + resample): пропускная способность (строк в секунду) и пиковая выделенная память
+(tracemalloc) для файлов разного размера. Пиковая память потоковой загрузки определяется размером части, а не файла.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_ingest --rows 1000000 4000000 --chunk-size 250000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_ohlcv
+from chunked_ingest import AGGREGATIONS, ingest_file, iter_chunks
+
+PIECE_ROWS = 500_000
+
+
+def write_files(directory: str, n_rows: int) -> dict:
+    """Пишет CSV и Parquet файлы минутных баров частями, не создавая все данные в памяти."""
+    paths = {'csv': os.path.join(directory, f'bars_{n_rows}.csv'),
+             'parquet': os.path.join(directory, f'bars_{n_rows}.parquet')}
+    os.makedirs(paths['parquet'])
+    start = pd.Timestamp('2000-01-03 09:30')
+    for i, offset in enumerate(range(0, n_rows, PIECE_ROWS)):
+        piece = generate_ohlcv(min(PIECE_ROWS, n_rows - offset), seed=i, start=str(start), freq='min',
+                               volatility=0.0005)[list(AGGREGATIONS)]
+        piece.to_csv(paths['csv'], mode='a', header=i == 0)
+        piece.reset_index().to_parquet(os.path.join(paths['parquet'], f'part-{i:05d}.parquet'))
+        start = piece.index[-1].tz_localize(None) + pd.Timedelta(minutes=1)
+    return paths
+
+
+def read_whole(path: str, fmt: str, rule: str) -> pd.DataFrame:
+    """Чтение файла целиком и resample в памяти."""
+    if fmt == 'csv':
+        data = pd.read_csv(path)
+        data['Date'] = pd.to_datetime(data['Date'], utc=True, format='ISO8601')
+    else:
+        data = pd.read_parquet(path)
+    data = data.set_index('Date').tz_convert('America/New_York')
+    resampler = data.resample(rule)
+    return resampler.agg(AGGREGATIONS)[resampler.size() > 0]
+
+
+def measure(func, *args, **kwargs) -> tuple:
+    """Время выполнения и пиковая выделенная память (МБ, отдельным запуском под tracemalloc)."""
+    started = time.perf_counter()
+    func(*args, **kwargs)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк потоковой загрузки файлов баров.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 4_000_000])
+    parser.add_argument('--chunk-size', type=int, default=250_000)
+    parser.add_argument('--rule', default='1D')
+    parser.add_argument('--formats', nargs='+', default=['csv', 'parquet'], choices=['csv', 'parquet'])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            paths = write_files(tmp, n_rows)
+            for fmt in args.formats:
+                size = (os.path.getsize(paths[fmt]) if fmt == 'csv'
+                        else sum(entry.stat().st_size for entry in os.scandir(paths[fmt])))
+                print(f"{n_rows} строк, {fmt}, {size / 2 ** 20:.0f} МБ на диске:")
+                elapsed, peak = measure(ingest_file, paths[fmt], args.rule, args.chunk_size, fmt=fmt)
+                print(f"  chunked_ingest (части по {args.chunk_size}): {elapsed:.2f} с, "
+                      f"{n_rows / elapsed:,.0f} строк/с, пик памяти {peak:.0f} МБ")
+                elapsed, peak = measure(read_whole, paths[fmt], fmt, args.rule)
+                print(f"  чтение целиком + resample:       {elapsed:.2f} с, "
+                      f"{n_rows / elapsed:,.0f} строк/с, пик памяти {peak:.0f} МБ")
+        # Проверка границ частей: бары совпадают с расчётом в памяти
+        data, _ = ingest_file(paths['parquet'], args.rule, args.chunk_size // 7)
+        expected = read_whole(paths['parquet'], 'parquet', args.rule)
+        pd.testing.assert_frame_equal(data[list(AGGREGATIONS)], expected, check_freq=False)
+        assert sum(len(chunk) for chunk in iter_chunks(paths['csv'], args.chunk_size)) == args.rows[-1]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Сравнение панельного расчёта индикаторов (panel_indicators) с циклом по тикерам и параметрам через функции
+data_download.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_panel --dates 2520 --tickers 500
+"""
+import argparse
+import time
+
+import pandas as pd
+
+import data_download as dd
+from benchmarks.synthetic import generate_panel
+from panel_indicators import compute_panel_indicators
+
+
+def loop_indicators(panel: pd.DataFrame, ma_windows, rsi_windows, macd_params) -> None:
+    """Текущий способ: отдельный вызов функций data_download для каждого тикера и набора параметров."""
+    for ticker in panel.columns:
+        data = panel[[ticker]].rename(columns={ticker: 'Close'})
+        for window in ma_windows:
+            dd.add_moving_average(data, window)
+        for window in rsi_windows:
+            dd.calculate_rsi(data, window)
+        for params in macd_params:
+            dd.calculate_macd(data, *params)
+
+
+def run(n_dates: int, n_tickers: int, ma_windows, rsi_windows, macd_params) -> dict:
+    panel = generate_panel(n_dates, n_tickers)
+
+    started = time.perf_counter()
+    compute_panel_indicators(panel, ma_windows, rsi_windows, macd_params)
+    panel_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    loop_indicators(panel, ma_windows, rsi_windows, macd_params)
+    loop_time = time.perf_counter() - started
+
+    return {'dates': n_dates, 'tickers': n_tickers, 'panel_seconds': panel_time, 'loop_seconds': loop_time,
+            'speedup': loop_time / panel_time}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк панельного расчёта индикаторов.")
+    parser.add_argument('--dates', type=int, default=2520)
+    parser.add_argument('--tickers', type=int, default=500)
+    args = parser.parse_args(argv)
+
+    result = run(args.dates, args.tickers, ma_windows=[5, 10, 20, 50], rsi_windows=[5, 14, 21],
+                 macd_params=[(12, 26, 9), (5, 35, 5)])
+    print(f"Панель {result['dates']} дат x {result['tickers']} тикеров: "
+          f"панельный расчёт {result['panel_seconds']:.2f} с, цикл по тикерам {result['loop_seconds']:.2f} с, "
+          f"ускорение x{result['speedup']:.1f}")
+
+
+if __name__ == '__main__':
+    main()
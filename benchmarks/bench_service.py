@@ -0,0 +1,80 @@
+"""
+Нагрузочный тест локального HTTP сервиса (service.py): параллельные клиенты запрашивают данные, индикаторы и графики
+для набора тикеров с повторами, источник данных - синтетический с задержкой, имитирующей сеть. Сравниваются сервис с
+общим кэшем ответов и без кэша (каждый запрос заново загружает данные и строит ответ).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_service --requests 400 --clients 16 --tickers 20 --latency 0.2
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.synthetic import generate_universe
+from service import make_server
+
+ENDPOINTS = ('/data', '/indicators', '/chart.png', '/chart.html')
+
+
+def synthetic_provider(universe: dict, latency: float):
+    """Источник данных с задержкой latency секунд на запрос."""
+    def provider(ticker, period, start, end):
+        time.sleep(latency)
+        return universe[ticker]
+    return provider
+
+
+def run_load(base: str, paths: list, clients: int) -> dict:
+    """Выполняет запросы из paths в clients потоков и возвращает пропускную способность и задержки."""
+    def request(path):
+        started = time.perf_counter()
+        with urllib.request.urlopen(base + path) as response:
+            response.read()
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(clients) as executor:
+        latencies = sorted(executor.map(request, paths))
+    wall = time.perf_counter() - started
+    return {'requests_per_second': len(paths) / wall, 'p50': statistics.median(latencies),
+            'p95': latencies[int(0.95 * (len(latencies) - 1))], 'wall': wall}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Нагрузочный тест HTTP сервиса.")
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--tickers', type=int, default=20)
+    parser.add_argument('--rows', type=int, default=250, help="Число строк данных тикера.")
+    parser.add_argument('--latency', type=float, default=0.2, help="Задержка источника данных в секундах.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    universe = generate_universe(args.tickers, args.rows, seed=args.seed)
+    rng = random.Random(args.seed)
+    paths = [f"{rng.choice(ENDPOINTS)}?ticker={rng.choice(list(universe))}" for _ in range(args.requests)]
+    print(f"{args.requests} запросов, {args.clients} клиентов, {args.tickers} тикеров по {args.rows} строк, "
+          f"задержка источника {args.latency} с")
+
+    for name, cache_entries in (('с кэшем', 256), ('без кэша', 0)):
+        server = make_server(port=0, provider=synthetic_provider(universe, args.latency), cache_entries=cache_entries)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+            # Первый запрос загружает plotly и matplotlib и не входит в замер
+            run_load(base, [f"/chart.png?ticker={next(iter(universe))}&warmup=1"], 1)
+            result = run_load(base, paths, args.clients)
+            hit_rate = server.RequestHandlerClass.service.response_cache.stats()['hit_rate']
+        finally:
+            server.shutdown()
+            server.server_close()
+        print(f"{name:>9}: {result['requests_per_second']:7.1f} запросов/с, p50 {result['p50'] * 1000:7.1f} мс, "
+              f"p95 {result['p95'] * 1000:7.1f} мс, доля попаданий в кэш {hit_rate:.0%}")
+
+
+if __name__ == '__main__':
+    main()
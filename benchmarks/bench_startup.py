@@ -0,0 +1,55 @@
+"""
+Время запуска: импорт main.py с отложенной загрузкой yfinance, matplotlib и plotly против импорта, при котором эти
+библиотеки загружаются сразу (как было до перехода на отложенные импорты). Каждый вариант запускается в отдельном
+процессе интерпретатора.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_startup --repeat 10
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ('yfinance', 'matplotlib.pyplot', 'matplotlib.figure', 'plotly.graph_objects', 'plotly.subplots')
+
+VARIANTS = {
+    'import main (отложенные импорты)': [sys.executable, '-c', 'import main'],
+    'import main + yfinance/matplotlib/plotly': [
+        sys.executable, '-c', 'import main; ' + '; '.join(f'import {m}' for m in HEAVY_MODULES)],
+    'main.py --help': [sys.executable, 'main.py', '--help'],
+}
+
+
+def measure(command: list, repeat: int) -> list:
+    """Время выполнения команды в отдельном процессе для каждого повтора."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def loaded_heavy_modules() -> list:
+    """Тяжёлые библиотеки, загруженные после import main."""
+    code = ("import sys, main; print(','.join(m for m in ('yfinance', 'matplotlib', 'plotly') "
+            "if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    return [name for name in output.strip().split(',') if name]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк времени запуска main.py.")
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    for name, command in VARIANTS.items():
+        timings = measure(command, args.repeat)
+        print(f"{name:<45} медиана {statistics.median(timings):.3f} с, минимум {min(timings):.3f} с")
+    print(f"Загружено при import main: {', '.join(loaded_heavy_modules()) or 'ничего из yfinance/matplotlib/plotly'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+"""
+Бенчмарк этапов конвейера main.main (загрузка, индикаторы, экспорт, графики) на синтетических данных.
+
+Загрузка из Yahoo Finance подменяется генератором benchmarks.synthetic, поэтому результаты воспроизводимы и не
+зависят от сети. Для каждого этапа измеряется время (минимум по повторам) и пиковый объём выделенной памяти
+(tracemalloc, отдельный прогон). Результаты сохраняются в JSON; режим --compare сравнивает их с базовым файлом и
+завершается с кодом 1 при регрессии. Под tracemalloc построение графиков заметно медленнее, для больших объёмов
+данных удобно отключить замер памяти (--no-memory) или включить прореживание (--downsample).
+
+Запуск из корня проекта:
+    python -m benchmarks.run_benchmarks --rows 1000 10000 --tickers 1 10 --output bench.json
+    python -m benchmarks.run_benchmarks --rows 1000 10000 --tickers 1 10 --compare bench.json
+    python -m benchmarks.run_benchmarks --rows 1000000 10000000 --stages fetch rsi_macd --no-memory --freq min
+"""
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import data_download as dd
+import data_plotting as dplt
+from benchmarks.synthetic import generate_universe
+
+STAGES = ('fetch', 'moving_average', 'average_price', 'std_deviation', 'fluctuations', 'export_csv', 'rsi_macd',
+          'plot_png', 'plot_html')
+PLOT_STAGES = ('plot_png', 'plot_html')
+# Колонки, которые должны появиться в данных тикера после этапа
+STAGE_COLUMNS = {
+    'fetch': ('Open', 'High', 'Low', 'Close', 'Volume'),
+    'moving_average': ('Moving_Average',),
+    'rsi_macd': ('RSI', 'MACD', 'Signal_Line'),
+}
+
+
+class _FakeTicker:
+    """Замена yf.Ticker: history возвращает копию заранее сгенерированных данных."""
+
+    def __init__(self, frames: dict, ticker: str, *args, **kwargs):
+        # Остальные аргументы yf.Ticker (например, session) не используются
+        self.data = frames[ticker]
+
+    def history(self, *args, **kwargs) -> pd.DataFrame:
+        return self.data.copy()
+
+
+def _stage_functions(state: dict, workdir: str, downsample: str = None) -> dict:
+    """Функции этапов в порядке main.main; состояние тикера передаётся через словарь state."""
+
+    def fetch(ticker):
+        state[ticker] = {'data': dd.fetch_stock_data(ticker, '1mo')}
+
+    def moving_average(ticker):
+        state[ticker]['data'] = dd.add_moving_average(state[ticker]['data'])
+
+    def average_price(ticker):
+        dd.calculate_and_display_average_price(state[ticker]['data'], ticker)
+
+    def std_deviation(ticker):
+        state[ticker]['std'] = dd.calculate_standard_deviation(state[ticker]['data'])
+
+    def fluctuations(ticker):
+        dd.notify_if_strong_fluctuations(state[ticker]['data'], ticker)
+
+    def export_csv(ticker):
+        dd.export_data_to_csv(state[ticker]['data'], os.path.join(workdir, f'{ticker}_1mo_stock_data.csv'))
+
+    def rsi_macd(ticker):
+        data = dd.calculate_rsi(state[ticker]['data'], window_size=5)
+        state[ticker]['data'] = dd.calculate_macd(data, short_window=12, long_window=26, signal_window=9)
+
+    def plot_png(ticker):
+        dplt.create_and_save_plot(state[ticker]['data'], ticker, '1mo', None, None, state[ticker]['std'],
+                                  filename=os.path.join(workdir, f'{ticker}_1mo_chart.png'), downsample=downsample)
+
+    def plot_html(ticker):
+        dplt.create_and_show_plot(state[ticker]['data'], ticker, state[ticker]['std'], downsample=downsample)
+
+    return {'fetch': fetch, 'moving_average': moving_average, 'average_price': average_price,
+            'std_deviation': std_deviation, 'fluctuations': fluctuations, 'export_csv': export_csv,
+            'rsi_macd': rsi_macd, 'plot_png': plot_png, 'plot_html': plot_html}
+
+
+def _check_stage(name: str, state: dict) -> None:
+    """Проверяет результат этапа по всем тикерам, чтобы не измерять время этапов, обработавших None."""
+    for ticker, ticker_state in state.items():
+        data = ticker_state['data']
+        if data is None or not len(data):
+            raise RuntimeError(f"Этап {name}: нет данных для тикера {ticker}")
+        columns = [column for stage in STAGES[:STAGES.index(name) + 1] for column in STAGE_COLUMNS.get(stage, ())]
+        missing = [column for column in columns if column not in data.columns]
+        if missing:
+            raise RuntimeError(f"Этап {name}: в данных тикера {ticker} нет колонок {missing}")
+
+
+def run_pipeline(frames: dict, stages=STAGES, trace_memory: bool = False, downsample: str = None) -> dict:
+    """
+    Выполняет этапы конвейера для всех тикеров (каждый этап - по всем тикерам подряд).
+
+    Parameters:
+        frames (dict): Тикер -> синтетические данные.
+        stages (iterable): Выполняемые этапы; предшествующие им этапы выполняются без замера.
+        trace_memory (bool): Измерять пиковый объём памяти этапа через tracemalloc.
+        downsample (str, optional): Метод прореживания для этапов построения графиков.
+
+    Returns:
+        dict: Этап -> {'seconds': ..., 'peak_mb': ...}.
+
+    Raises:
+        RuntimeError: Если этап не вернул данные или в них нет ожидаемых колонок.
+    """
+    import plotly.graph_objects as go
+
+    measured = {}
+    last = max(STAGES.index(stage) for stage in stages)
+    with tempfile.TemporaryDirectory() as workdir, contextlib.ExitStack() as stack:
+        stack.enter_context(mock.patch('data_download.yf.Ticker', side_effect=functools.partial(_FakeTicker, frames)))
+        stack.enter_context(mock.patch.object(go.Figure, 'show'))
+        stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        stack.callback(os.chdir, cwd)
+        if trace_memory:
+            tracemalloc.start()
+            stack.callback(tracemalloc.stop)
+
+        state = {}
+        functions = _stage_functions(state, workdir, downsample)
+        for name in STAGES[:last + 1]:
+            if trace_memory:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            for ticker in frames:
+                functions[name](ticker)
+            elapsed = time.perf_counter() - started
+            if name in STAGE_COLUMNS:
+                _check_stage(name, state)
+            if name in stages:
+                measured[name] = {'seconds': elapsed}
+                if trace_memory:
+                    measured[name]['peak_mb'] = (tracemalloc.get_traced_memory()[1] - base) / 2 ** 20
+    return measured
+
+
+def run(rows_list, tickers_list, stages=STAGES, repeat: int = 3, max_plot_rows: int = 100_000,
+        downsample: str = None, seed: int = 0, memory: bool = True, freq: str = None) -> list:
+    """
+    Запускает конвейер для всех сочетаний числа строк и тикеров.
+
+    Parameters:
+        rows_list (iterable): Числа строк на тикер.
+        tickers_list (iterable): Числа тикеров.
+        stages (iterable): Измеряемые этапы.
+        repeat (int): Число повторов замера времени (берётся минимум).
+        max_plot_rows (int): Графики строятся только для рядов не длиннее (если не задано прореживание).
+        downsample (str, optional): Метод прореживания для этапов построения графиков.
+        seed (int): Зерно генератора данных.
+        memory (bool): Измерять пиковую память отдельным прогоном.
+        freq (str, optional): Частота баров синтетических данных (по умолчанию см. generate_ohlcv).
+
+    Returns:
+        list: Записи {'rows', 'tickers', 'stage', 'seconds', 'peak_mb'}.
+    """
+    results = []
+    for n_rows in rows_list:
+        for n_tickers in tickers_list:
+            frames = generate_universe(n_tickers, n_rows, seed=seed, freq=freq)
+            selected = [stage for stage in stages
+                        if stage not in PLOT_STAGES or (n_rows <= max_plot_rows or downsample)]
+            timings = [run_pipeline(frames, selected, downsample=downsample) for _ in range(repeat)]
+            peaks = run_pipeline(frames, selected, trace_memory=True, downsample=downsample) if memory else {}
+            for stage in selected:
+                record = {'rows': n_rows, 'tickers': n_tickers, 'stage': stage,
+                          'seconds': min(timing[stage]['seconds'] for timing in timings)}
+                if stage in peaks:
+                    record['peak_mb'] = peaks[stage]['peak_mb']
+                results.append(record)
+            del frames
+    return results
+
+
+def compare_results(current: list, baseline: list, tolerance: float = 0.25, min_seconds: float = 0.005,
+                    min_mb: float = 1.0) -> list:
+    """
+    Сравнивает результаты с базовыми и возвращает регрессии: этапы, время или пиковая память которых выросли больше
+    чем на долю tolerance (и больше абсолютных порогов min_seconds / min_mb, чтобы не реагировать на шум).
+
+    Parameters:
+        current (list): Текущие результаты run.
+        baseline (list): Базовые результаты.
+        tolerance (float): Допустимый относительный рост.
+        min_seconds (float): Минимальный абсолютный рост времени, с.
+        min_mb (float): Минимальный абсолютный рост памяти, МБ.
+
+    Returns:
+        list: Записи {'rows', 'tickers', 'stage', 'metric', 'baseline', 'current', 'change'}.
+    """
+    base = {(r['rows'], r['tickers'], r['stage']): r for r in baseline}
+    regressions = []
+    for record in current:
+        reference = base.get((record['rows'], record['tickers'], record['stage']))
+        if reference is None:
+            continue
+        for metric, threshold in (('seconds', min_seconds), ('peak_mb', min_mb)):
+            if metric not in record or metric not in reference:
+                continue
+            old, new = reference[metric], record[metric]
+            if new > old * (1 + tolerance) and new - old > threshold:
+                regressions.append({'rows': record['rows'], 'tickers': record['tickers'], 'stage': record['stage'],
+                                    'metric': metric, 'baseline': old, 'current': new,
+                                    'change': new / old - 1 if old else float('inf')})
+    return regressions
+
+
+def environment() -> dict:
+    """Сведения об окружении для сопоставления результатов разных запусков."""
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'numpy': np.__version__,
+            'pandas': pd.__version__, 'cpu_count': os.cpu_count(), 'timestamp': datetime.now().isoformat()}
+
+
+def print_table(results: list) -> None:
+    print(f"{'строк':>10} {'тикеров':>8}  {'этап':<16}{'время, с':>12}{'память, МБ':>12}")
+    for r in results:
+        peak = f"{r['peak_mb']:.1f}" if 'peak_mb' in r else '-'
+        print(f"{r['rows']:>10} {r['tickers']:>8}  {r['stage']:<16}{r['seconds']:>12.4f}{peak:>12}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк этапов конвейера на синтетических данных.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10_000], help="Число строк на тикер.")
+    parser.add_argument('--tickers', type=int, nargs='+', default=[1], help="Число тикеров.")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=3, help="Число повторов замера времени.")
+    parser.add_argument('--max-plot-rows', type=int, default=100_000,
+                        help="Графики строятся только для рядов не длиннее (если не задан --downsample).")
+    parser.add_argument('--downsample', choices=('lttb', 'minmax'), help="Прореживание рядов на графиках.")
+    parser.add_argument('--no-memory', action='store_true', help="Не измерять пиковую память.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--freq', help="Частота баров ('B', 'min' и т.д.); по умолчанию 'B', для рядов длиннее "
+                                       "50000 строк - 'min'.")
+    parser.add_argument('--output', help="JSON файл для результатов.")
+    parser.add_argument('--compare', help="JSON файл с базовыми результатами.")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Допустимый относительный рост (0.25 = 25%%).")
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.tickers, args.stages, repeat=args.repeat, max_plot_rows=args.max_plot_rows,
+                  downsample=args.downsample, seed=args.seed, memory=not args.no_memory,
+                  freq=args.freq)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2)
+        print(f"Результаты сохранены в {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare_results(results, baseline, args.tolerance)
+        for r in regressions:
+            print(f"РЕГРЕССИЯ {r['stage']} ({r['rows']} строк, {r['tickers']} тикеров): {r['metric']} "
+                  f"{r['baseline']:.4f} -> {r['current']:.4f} (+{r['change']:.0%})")
+        if regressions:
+            return 1
+        print("Регрессий не обнаружено.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
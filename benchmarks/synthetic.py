@@ -0,0 +1,103 @@
+"""
+Генератор синтетических биржевых данных для бенчмарков и тестов. Формат совпадает с данными fetch_stock_data
+(см. AAPL_3mo_stock_data.csv): индекс Date с часовым поясом America/New_York, колонки Open, High, Low, Close, Volume,
+Dividends и Stock Splits. Результат полностью определяется параметром seed.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.errors import OutOfBoundsDatetime, OutOfBoundsTimedelta
+from pandas.tseries.frequencies import to_offset
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Dividends', 'Stock Splits']
+# Больше рабочих дней (около 190 лет) по умолчанию генерируются минутные бары
+MAX_DAILY_ROWS = 50_000
+
+
+def generate_ohlcv(n_rows: int, seed: int = 0, start: str = '2000-01-03', freq: Optional[str] = None,
+                   start_price: float = 190.0, volatility: float = 0.015) -> pd.DataFrame:
+    """
+    Генерирует бары OHLCV со случайным блужданием цены (геометрическое броуновское движение).
+
+    Parameters:
+        n_rows (int): Число баров.
+        seed (int): Зерно генератора случайных чисел.
+        start (str): Дата первого бара.
+        freq (str, optional): Частота баров ('B' - рабочие дни, 'min' - минуты и т.д.). По умолчанию 'B', а для
+            n_rows больше MAX_DAILY_ROWS - 'min'.
+        start_price (float): Начальная цена.
+        volatility (float): Стандартное отклонение относительного изменения цены за бар.
+
+    Returns:
+        pd.DataFrame: Данные в формате fetch_stock_data.
+
+    Raises:
+        ValueError: Если даты баров выходят за диапазон pd.Timestamp (до 2262 года).
+    """
+    if freq is None:
+        freq = 'B' if n_rows <= MAX_DAILY_ROWS else 'min'
+    try:
+        end = pd.Timestamp(start).as_unit('ns') + to_offset(freq) * max(n_rows - 1, 0)
+    except (OverflowError, OutOfBoundsDatetime, OutOfBoundsTimedelta):
+        end = None
+    if end is None or end > pd.Timestamp.max - pd.Timedelta(days=1):
+        raise ValueError(f"{n_rows} баров с частотой {freq!r} от {start} выходят за диапазон дат pandas "
+                         f"(до {pd.Timestamp.max:%Y-%m-%d}); задайте более частые бары, например freq='min'")
+    index = pd.date_range(start, periods=n_rows, freq=freq, tz='America/New_York', name='Date')
+
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0, volatility, n_rows)))
+    open_ = np.empty(n_rows)
+    open_[0] = start_price
+    open_[1:] = close[:-1] * (1 + rng.normal(0, volatility / 4, n_rows - 1))
+    spread = np.abs(rng.normal(0, volatility / 2, (2, n_rows)))
+    high = np.maximum(open_, close) * (1 + spread[0])
+    low = np.minimum(open_, close) * (1 - spread[1])
+    volume = rng.lognormal(np.log(5e7), 0.3, n_rows).astype(np.int64)
+
+    dividends = np.zeros(n_rows)
+    dividends[63::63] = 0.24
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume,
+                         'Dividends': dividends, 'Stock Splits': np.zeros(n_rows)}, index=index)
+
+
+def generate_universe(n_tickers: int, n_rows: int, seed: int = 0, **kwargs) -> Dict[str, pd.DataFrame]:
+    """
+    Генерирует данные для набора тикеров T0000, T0001, ...
+
+    Parameters:
+        n_tickers (int): Число тикеров.
+        n_rows (int): Число баров на тикер.
+        seed (int): Зерно генератора; тикер i использует seed + i.
+        **kwargs: Параметры generate_ohlcv.
+
+    Returns:
+        dict: Тикер -> DataFrame.
+    """
+    return {f'T{i:04d}': generate_ohlcv(n_rows, seed=seed + i, **kwargs) for i in range(n_tickers)}
+
+
+def generate_panel(n_dates: int, n_tickers: int, seed: int = 0, ragged: bool = True,
+                   gap_rate: float = 0.001) -> pd.DataFrame:
+    """
+    Генерирует панель цен закрытия (даты x тикеры) с разными датами начала истории и пропусками.
+
+    Parameters:
+        n_dates (int): Число дат.
+        n_tickers (int): Число тикеров.
+        seed (int): Зерно генератора.
+        ragged (bool): Начинать историю тикеров в случайные даты первой четверти периода.
+        gap_rate (float): Доля пропусков (NaN).
+
+    Returns:
+        pd.DataFrame: Панель цен.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_dates, n_tickers)), axis=0))
+    if ragged:
+        starts = rng.integers(0, n_dates // 4 + 1, n_tickers)
+        close[np.arange(n_dates)[:, None] < starts[None, :]] = np.nan
+    close[rng.random((n_dates, n_tickers)) < gap_rate] = np.nan
+    return pd.DataFrame(close, index=pd.bdate_range('2000-01-03', periods=n_dates),
+                        columns=[f'T{i:04d}' for i in range(n_tickers)])
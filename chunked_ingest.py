@@ -0,0 +1,224 @@
+import re
+import time
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+import data_export as de
+from streaming_indicators import IndicatorStream
+
+# Агрегирование баров при смене разрешения
+AGGREGATIONS = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+_OFFSET = re.compile(r'[+-]\d\d:\d\d')
+
+
+@dataclass
+class IngestStats:
+    """
+    Статистика потоковой загрузки файла баров.
+
+    Attributes:
+        rows (int): Прочитано строк исходного файла.
+        chunks (int): Прочитано частей.
+        bars (int): Получено баров нового разрешения.
+        seconds (float): Время загрузки в секундах.
+    """
+    rows: int = 0
+    chunks: int = 0
+    bars: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def _parse_dates(dates: pd.Series) -> pd.DatetimeIndex:
+    """
+    Переводит даты из CSV ('2024-01-30 09:30:00-05:00') в UTC. Разбор строк со смещением в pandas медленный, поэтому
+    дата без смещения и смещение (одно-два значения на файл, зимнее и летнее время) разбираются отдельно; строки
+    другого вида разбираются pd.to_datetime.
+    """
+    dates = dates.astype(str)
+    codes, offsets = pd.factorize(dates.str.slice(19))
+    if len(offsets) and all(_OFFSET.fullmatch(offset) for offset in offsets):
+        try:
+            local = pd.to_datetime(dates.str.slice(0, 19), format='%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            pass
+        else:
+            minutes = np.array([(-1 if offset[0] == '-' else 1) * (int(offset[1:3]) * 60 + int(offset[4:6]))
+                                for offset in offsets])
+            return pd.DatetimeIndex(local - pd.to_timedelta(minutes[codes], unit='min')).tz_localize('UTC')
+    return pd.DatetimeIndex(pd.to_datetime(dates, utc=True, format='ISO8601'))
+
+
+def iter_chunks(path: str, chunk_size: int = 500_000, fmt: Optional[str] = None, index_name: str = 'Date',
+                tz: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Читает файл баров частями не больше chunk_size строк: CSV - через pd.read_csv(chunksize=...), Parquet и Feather -
+    пакетами pyarrow без загрузки файла целиком.
+
+    Parameters:
+        path (str): Файл CSV или Feather, файл или каталог Parquet.
+        chunk_size (int): Число строк в части.
+        fmt (str, optional): 'csv', 'feather' или 'parquet'. По умолчанию определяется по path.
+        index_name (str): Колонка с датами.
+        tz (str, optional): Часовой пояс индекса. Даты из CSV читаются в UTC и переводятся в tz.
+
+    Yields:
+        pd.DataFrame: Часть данных с индексом DatetimeIndex.
+    """
+    fmt = fmt or de.detect_format(path)
+    if fmt == 'csv':
+        batches = pd.read_csv(path, chunksize=chunk_size)
+    else:
+        dataset = ds.dataset(path, format='feather' if fmt == 'feather' else 'parquet')
+        batches = (batch.to_pandas() for batch in dataset.to_batches(batch_size=chunk_size))
+    for chunk in batches:
+        dates = chunk.pop(index_name)
+        if not isinstance(dates.dtype, pd.DatetimeTZDtype) and not pd.api.types.is_datetime64_dtype(dates.dtype):
+            dates = _parse_dates(dates)
+        index = pd.DatetimeIndex(dates, name=index_name)
+        if tz is not None:
+            index = index.tz_localize(tz) if index.tz is None else index.tz_convert(tz)
+        yield chunk.set_axis(index)
+
+
+class OHLCVResampler:
+    """
+    Потоковая смена разрешения баров (например, минутные -> дневные): части данных агрегируются по мере чтения,
+    последний бар части может продолжиться в следующей, поэтому он удерживается до прихода следующей части.
+    Данные должны быть отсортированы по времени.
+
+    Parameters:
+        rule (str): Новое разрешение в формате pandas resample ('1D', '1h', '30min', ...).
+    """
+
+    def __init__(self, rule: str = '1D'):
+        self.rule = rule
+        self._partial: Optional[pd.DataFrame] = None
+
+    def _merge(self, bars: pd.DataFrame) -> None:
+        """Объединяет удерживаемый бар с первым баром новой части (тот же интервал)."""
+        label = bars.index[0]
+        for column, how in AGGREGATIONS.items():
+            if column not in bars.columns:
+                continue
+            held, new = self._partial[column].iloc[0], bars[column].iloc[0]
+            if how == 'first':
+                value = held if pd.notna(held) else new
+            elif how == 'last':
+                value = new if pd.notna(new) else held
+            elif how == 'max':
+                value = np.fmax(held, new)
+            elif how == 'min':
+                value = np.fmin(held, new)
+            else:
+                value = held + new
+            bars.loc[label, column] = value
+
+    def update(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Добавляет часть исходных баров.
+
+        Parameters:
+            chunk (pd.DataFrame): Бары с индексом DatetimeIndex и колонками Open, High, Low, Close, Volume.
+
+        Returns:
+            pd.DataFrame: Завершённые бары нового разрешения (все, кроме последнего).
+        """
+        if chunk.empty:
+            return chunk.iloc[:0][[column for column in AGGREGATIONS if column in chunk.columns]]
+        if not chunk.index.is_monotonic_increasing:
+            raise ValueError("Данные должны быть отсортированы по времени")
+        aggregations = {column: how for column, how in AGGREGATIONS.items() if column in chunk.columns}
+        resampler = chunk[list(aggregations)].resample(self.rule)
+        bars = resampler.agg(aggregations)
+        # Интервалы без исходных баров (ночи, выходные) не создают бар
+        bars = bars[resampler.size().to_numpy() > 0]
+
+        if self._partial is not None:
+            held = self._partial.index[0]
+            if bars.index[0] < held:
+                raise ValueError("Данные должны быть отсортированы по времени")
+            if bars.index[0] == held:
+                self._merge(bars)
+            else:
+                bars = pd.concat([self._partial, bars])
+        self._partial = bars.iloc[-1:]
+        return bars.iloc[:-1]
+
+    def flush(self) -> pd.DataFrame:
+        """Возвращает удерживаемый последний бар (в конце файла)."""
+        partial, self._partial = self._partial, None
+        return partial if partial is not None else pd.DataFrame(columns=list(AGGREGATIONS))
+
+
+def iter_bars(path: str, rule: str = '1D', chunk_size: int = 500_000, fmt: Optional[str] = None,
+              index_name: str = 'Date', tz: Optional[str] = 'America/New_York', ma_window: int = 5,
+              rsi_window: int = 5, macd_windows: tuple = (12, 26, 9),
+              stats: Optional[IngestStats] = None) -> Iterator[pd.DataFrame]:
+    """
+    Потоково читает файл баров, меняет разрешение и рассчитывает индикаторы (IndicatorStream, совпадает с
+    add_moving_average, calculate_rsi и calculate_macd). В памяти одновременно находится одна часть файла, поэтому
+    пиковая память не зависит от размера файла.
+
+    Parameters:
+        path (str): Файл баров (CSV, Parquet, Feather).
+        rule (str): Новое разрешение ('1D', '1h', ...).
+        chunk_size (int): Число строк в части.
+        fmt (str, optional): Формат файла. По умолчанию определяется по path.
+        index_name (str): Колонка с датами.
+        tz (str, optional): Часовой пояс, в котором определяются границы баров (для дневных - торговые дни).
+        ma_window (int): Размер окна скользящего среднего.
+        rsi_window (int): Размер окна RSI.
+        macd_windows (tuple): Короткое, длинное и сигнальное окна MACD.
+        stats (IngestStats, optional): Статистика, которая обновляется по мере чтения.
+
+    Yields:
+        pd.DataFrame: Завершённые бары с колонками Moving_Average, RSI, MACD, Signal_Line.
+    """
+    stats = stats if stats is not None else IngestStats()
+    resampler = OHLCVResampler(rule)
+    indicators = IndicatorStream(ma_window, rsi_window, macd_windows)
+    started = time.perf_counter()
+
+    def with_indicators(bars):
+        stats.bars += len(bars)
+        stats.seconds = time.perf_counter() - started
+        return bars.join(indicators.update_frame(bars))
+
+    for chunk in iter_chunks(path, chunk_size, fmt, index_name, tz):
+        stats.rows += len(chunk)
+        stats.chunks += 1
+        bars = resampler.update(chunk)
+        if len(bars):
+            yield with_indicators(bars)
+    bars = resampler.flush()
+    if len(bars):
+        yield with_indicators(bars)
+    stats.seconds = time.perf_counter() - started
+
+
+def ingest_file(path: str, rule: str = '1D', chunk_size: int = 500_000, **kwargs) -> tuple:
+    """
+    Загружает файл баров частями, меняет разрешение и рассчитывает индикаторы. Исходные бары в память целиком не
+    загружаются, в памяти собираются только бары нового разрешения.
+
+    Parameters:
+        path (str): Файл баров (CSV, Parquet, Feather).
+        rule (str): Новое разрешение ('1D', '1h', ...).
+        chunk_size (int): Число строк в части.
+        **kwargs: Параметры iter_bars.
+
+    Returns:
+        tuple: Бары с индикаторами (pd.DataFrame) и статистика IngestStats.
+    """
+    stats = IngestStats()
+    parts = list(iter_bars(path, rule, chunk_size, stats=stats, **kwargs))
+    data = pd.concat(parts) if parts else pd.DataFrame(columns=list(AGGREGATIONS))
+    return data, stats
@@ -0,0 +1,199 @@
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+import data_download as dd
+
+SPARSE_COLUMNS = ('Dividends', 'Stock Splits')
+INDICATOR_COLUMNS = ('Close', 'Moving_Average', 'RSI', 'MACD', 'Signal_Line')
+
+
+@dataclass
+class CompactFrame:
+    """
+    Компактное представление данных тикера.
+
+    Attributes:
+        data (pd.DataFrame): Цены и индикаторы в узких типах (float32, где позволяет точность), объём - в наименьшем
+            целом типе, индекс - DatetimeIndex с часовым поясом. Колонок Dividends и Stock Splits нет.
+        actions (pd.DataFrame): Только строки с ненулевыми дивидендами или сплитами (обычно несколько строк в год).
+    """
+    data: pd.DataFrame
+    actions: pd.DataFrame
+
+    def memory_usage(self) -> int:
+        """Память данных и корпоративных событий в байтах вместе с индексами."""
+        return int(self.data.memory_usage(deep=True).sum() + self.actions.memory_usage(deep=True).sum())
+
+
+def _datetime_index(index: pd.Index, tz: Optional[str]) -> pd.DatetimeIndex:
+    """
+    Индекс дат без объектов Python на строку. Строки из CSV со смещениями переводятся в DatetimeIndex с часовым поясом
+    tz (по умолчанию UTC); даты без часового пояса локализуются в tz, только если он задан явно.
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        dates = pd.Index(index).astype(str)
+        if len(dates) and dates.str.contains(r'(?:[+-]\d{2}:?\d{2}|Z)$').all():
+            # Смещения в CSV меняются при переходе на летнее время, поэтому даты сначала приводятся к UTC
+            return pd.DatetimeIndex(pd.to_datetime(dates, utc=True), name=index.name).tz_convert(tz or 'UTC')
+        index = pd.DatetimeIndex(pd.to_datetime(dates), name=index.name)
+    if index.tz is None and tz is not None:
+        index = index.tz_localize(tz)
+    return index
+
+
+def _narrow_float(values: pd.Series, float_dtype, tolerance: float) -> pd.Series:
+    """Переводит ряд в float_dtype, если ошибка округления не больше tolerance, иначе оставляет как есть."""
+    narrowed = values.astype(float_dtype)
+    error = np.abs(narrowed.to_numpy(dtype=np.float64) - values.to_numpy(dtype=np.float64))
+    return narrowed if np.nanmax(error, initial=0.0) <= tolerance else values
+
+
+def compact_frame(data: pd.DataFrame, float_dtype='float32', tolerance: float = 1e-4,
+                  tz: Optional[str] = None) -> CompactFrame:
+    """
+    Переводит данные тикера (fetch_stock_data, с индикаторами или без) в компактное представление.
+
+    Parameters:
+        data (pd.DataFrame): Данные об акциях.
+        float_dtype: Узкий тип для цен и индикаторов.
+        tolerance (float): Допустимая абсолютная ошибка округления. Колонки, для которых она больше (например, цены в
+            сотни тысяч при float32), остаются float64.
+        tz (str, optional): Часовой пояс индекса, например 'America/New_York'. Даты из CSV со смещениями переводятся
+            в него (по умолчанию - в UTC), индекс без часового пояса локализуется в него. По умолчанию индекс без
+            часового пояса остаётся без него.
+
+    Returns:
+        CompactFrame: Компактные данные и корпоративные события.
+    """
+    index = _datetime_index(data.index, tz)
+    sparse = [column for column in SPARSE_COLUMNS if column in data.columns]
+    actions = data[sparse].set_axis(index)
+    actions = actions[(actions.fillna(0) != 0).any(axis=1)].copy()
+
+    columns = {}
+    for column in data.columns.drop(sparse):
+        values = data[column]
+        if pd.api.types.is_float_dtype(values.dtype):
+            values = _narrow_float(values, float_dtype, tolerance)
+        elif pd.api.types.is_integer_dtype(values.dtype) and len(values):
+            values = pd.to_numeric(values, downcast='unsigned' if values.min() >= 0 else 'integer')
+        columns[column] = values.to_numpy()
+    return CompactFrame(pd.DataFrame(columns, index=index), actions)
+
+
+def expand_frame(compact: CompactFrame, float_dtype=None, int_dtype=None) -> pd.DataFrame:
+    """
+    Восстанавливает колонки Dividends и Stock Splits (нули вне событий) после Volume, как в fetch_stock_data.
+
+    Parameters:
+        compact (CompactFrame): Компактные данные.
+        float_dtype (optional): Тип, в который переводятся колонки с плавающей точкой (например, 'float64'). По
+            умолчанию типы не меняются.
+        int_dtype (optional): Тип, в который переводятся целочисленные колонки (например, 'int64'). По умолчанию
+            типы не меняются.
+
+    Returns:
+        pd.DataFrame: Данные в исходном наборе колонок.
+    """
+    data = compact.data.copy()
+    if float_dtype is not None:
+        floats = data.select_dtypes('floating').columns
+        data[floats] = data[floats].astype(float_dtype)
+    if int_dtype is not None:
+        integers = data.select_dtypes('integer').columns
+        data[integers] = data[integers].astype(int_dtype)
+    position = data.columns.get_loc('Volume') + 1 if 'Volume' in data.columns else len(data.columns)
+    for offset, column in enumerate(compact.actions.columns):
+        values = compact.actions[column].reindex(data.index, fill_value=0.0)
+        data.insert(position + offset, column, values.fillna(0.0).to_numpy())
+    return data
+
+
+def compact_universe(universe: Mapping[str, pd.DataFrame], **kwargs) -> dict:
+    """
+    Переводит данные набора тикеров в компактное представление.
+
+    Parameters:
+        universe (dict): Словарь тикер -> данные.
+        **kwargs: Параметры compact_frame.
+
+    Returns:
+        dict: Словарь тикер -> CompactFrame.
+    """
+    return {ticker: compact_frame(data, **kwargs) for ticker, data in universe.items()}
+
+
+def memory_report(original: pd.DataFrame, compact: CompactFrame) -> pd.DataFrame:
+    """
+    Сравнивает память исходных и компактных данных по колонкам.
+
+    Parameters:
+        original (pd.DataFrame): Исходные данные.
+        compact (CompactFrame): Компактные данные.
+
+    Returns:
+        pd.DataFrame: Байты до и после для индекса, каждой колонки и итога (строка 'Total'), тип после и экономия в
+            процентах. Память корпоративных событий учитывается в их колонках.
+    """
+    before = original.memory_usage(deep=True)
+    after = compact.data.memory_usage(deep=True)
+    for column in compact.actions.columns:
+        after[column] = compact.actions[column].memory_usage(deep=True)
+    report = pd.DataFrame({'before_bytes': before, 'after_bytes': after.reindex(before.index, fill_value=0)})
+    report['dtype'] = [str(compact.data.index.dtype) if name == 'Index'
+                       else str(compact.data[name].dtype) if name in compact.data.columns
+                       else 'sparse' for name in report.index]
+    report.loc['Total'] = [report['before_bytes'].sum(), compact.memory_usage(), '']
+    report[['before_bytes', 'after_bytes']] = report[['before_bytes', 'after_bytes']].astype('int64')
+    before_bytes = report['before_bytes'].where(report['before_bytes'] > 0)
+    report['saved_percent'] = (1 - report['after_bytes'] / before_bytes) * 100
+    return report
+
+
+def _indicators(close: pd.Series, ma_window: int, rsi_window: int, macd_windows: tuple) -> pd.DataFrame:
+    data = close.to_frame('Close')
+    dd.add_moving_average(data, ma_window)
+    dd.calculate_rsi(data, rsi_window)
+    dd.calculate_macd(data, *macd_windows)
+    return data
+
+
+def precision_report(original: pd.DataFrame, compact: CompactFrame, ma_window: int = 5, rsi_window: int = 14,
+                     macd_windows: tuple = (12, 26, 9)) -> pd.DataFrame:
+    """
+    Оценивает влияние компактного представления на индикаторы: индикаторы считаются по исходным ценам закрытия
+    (float64) и по компактным, результат компактного расчёта хранится в типе компактной колонки Close.
+
+    Parameters:
+        original (pd.DataFrame): Исходные данные.
+        compact (CompactFrame): Компактные данные.
+        ma_window (int): Размер окна скользящего среднего.
+        rsi_window (int): Размер окна RSI.
+        macd_windows (tuple): Короткое, длинное и сигнальное окна MACD.
+
+    Returns:
+        pd.DataFrame: Наибольшая абсолютная и относительная ошибка для Close, Moving_Average, RSI, MACD, Signal_Line,
+            средней цены (average) и стандартного отклонения (std).
+    """
+    close = original['Close'].astype(np.float64)
+    expected = _indicators(close, ma_window, rsi_window, macd_windows)
+    compact_close = compact.data['Close']
+    actual = _indicators(compact_close.set_axis(close.index), ma_window, rsi_window, macd_windows)
+    actual = actual.astype(compact_close.dtype)
+
+    rows = {}
+    for column in INDICATOR_COLUMNS:
+        reference = expected[column].to_numpy()
+        error = np.abs(actual[column].to_numpy(dtype=np.float64) - reference)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            relative = error / np.abs(reference)
+        rows[column] = (np.nanmax(error, initial=0.0), np.nanmax(np.where(np.isfinite(relative), relative, np.nan),
+                                                                 initial=0.0))
+    for name, reference, value in (('average', close.mean(), compact_close.mean()),
+                                   ('std', close.std(ddof=1), compact_close.std(ddof=1))):
+        error = abs(float(value) - reference)
+        rows[name] = (error, error / abs(reference) if reference else np.nan)
+    return pd.DataFrame.from_dict(rows, orient='index', columns=['max_abs_error', 'max_rel_error'])
@@ -0,0 +1,248 @@
+import base64
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+import data_plotting as dplt
+
+SERIES = ('Close', 'Moving_Average', 'RSI', 'MACD', 'Signal_Line')
+PLOTLY_BUNDLE = 'plotly.min.js'
+DATA_DIR = 'data'
+# Подстановка тикера в заголовки общего макета
+TICKER_PLACEHOLDER = '__TICKER__'
+
+
+@dataclass
+class DashboardResult:
+    """
+    Результат экспорта панели графиков.
+
+    Attributes:
+        path (str): Путь к index.html.
+        tickers (list): Тикеры панели.
+        files (int): Число записанных файлов.
+        bytes_written (int): Суммарный размер записанных файлов в байтах.
+        seconds (float): Время экспорта в секундах.
+    """
+    path: str
+    tickers: List[str] = field(default_factory=list)
+    files: int = 0
+    bytes_written: int = 0
+    seconds: float = 0.0
+
+
+def encode_array(values, dtype='<f4') -> str:
+    """Кодирует массив в base64 (little-endian), в браузере читается как Float32Array / Int32Array."""
+    return base64.b64encode(np.ascontiguousarray(values, dtype=dtype).tobytes()).decode('ascii')
+
+
+def _encode_dates(index: pd.Index) -> dict:
+    """
+    Даты в виде смещений в секундах (Int32) от первой даты. Время - местное время биржи, как его показывает
+    create_and_show_plot для индекса с часовым поясом.
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    seconds = index.as_unit('s').asi8
+    base = int(seconds[0]) if len(seconds) else 0
+    return {'base': base * 1000, 'offsets': encode_array(seconds - base, '<i4')}
+
+
+def ticker_payload(data: pd.DataFrame, std_deviation: Optional[float] = None, downsample: Optional[str] = None,
+                   max_points: Optional[int] = None, pixel_width: int = 800) -> dict:
+    """
+    Компактные данные графика одного тикера: ряды Close, Moving_Average, RSI, MACD, Signal_Line в float32 (base64),
+    даты - смещения Int32; ряды с одинаковыми датами ссылаются на один массив дат.
+
+    Parameters:
+        data (pd.DataFrame): Данные с рассчитанными индикаторами.
+        std_deviation (float, optional): Стандартное отклонение цены закрытия. По умолчанию рассчитывается по Close.
+        downsample (str, optional): Метод прореживания 'lttb' или 'minmax'.
+        max_points (int, optional): Число точек на ряд при прореживании.
+        pixel_width (int): Ширина графика для выбора числа точек при прореживании.
+
+    Returns:
+        dict: Данные для файла тикера.
+    """
+    if std_deviation is None:
+        std_deviation = float(data['Close'].std(ddof=1))
+    series = (dplt.prepare_plot_series(data, downsample, max_points, pixel_width=pixel_width) if downsample
+              else {column: data[column] for column in SERIES})
+    dates, payload = [], {}
+    for column in SERIES:
+        values = series[column]
+        position = next((i for i, index in enumerate(dates) if index is values.index or index.equals(values.index)),
+                        None)
+        if position is None:
+            dates.append(values.index)
+            position = len(dates) - 1
+        payload[column] = {'x': position, 'y': encode_array(values.to_numpy(dtype=np.float64))}
+    return {'std': float(std_deviation), 'dates': [_encode_dates(index) for index in dates], 'series': payload}
+
+
+def _write(path: str, content: str) -> int:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return os.path.getsize(path)
+
+
+def _figure_template(data: pd.DataFrame) -> dict:
+    """Макет и трассы графика create_and_show_plot без данных; тикер в заголовках заменён на TICKER_PLACEHOLDER."""
+    fig = dplt.build_interactive_figure(data.iloc[:2], TICKER_PLACEHOLDER, 0.0)
+    traces = []
+    for trace in fig.to_plotly_json()['data']:
+        trace = {key: value for key, value in trace.items() if key not in ('x', 'y')}
+        trace['type'] = 'scatter'
+        traces.append(trace)
+    layout = json.loads(fig.layout.to_json())
+    for axis in ('xaxis', 'xaxis2', 'xaxis3'):
+        layout.setdefault(axis, {})['type'] = 'date'
+    return {'traces': traces, 'layout': layout}
+
+
+_INDEX_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Анализ акций</title>
+<script src="{bundle}"></script>
+<style>
+body {{ font-family: sans-serif; margin: 0; display: flex; }}
+#tickers {{ width: 160px; height: 100vh; overflow-y: auto; border-right: 1px solid #ddd; }}
+#tickers input {{ width: 140px; margin: 8px; }}
+#tickers div {{ padding: 2px 10px; cursor: pointer; }}
+#tickers div.active {{ background: #e8eefc; font-weight: bold; }}
+</style>
+</head>
+<body>
+<div id="tickers"><input id="filter" placeholder="Тикер"></div>
+<div id="chart"></div>
+<script>
+const TICKERS = {tickers};
+const TEMPLATE = {template};
+const WEBGL_THRESHOLD = {webgl_threshold};
+const cache = {{}};
+const pending = {{}};
+
+function decode(text, type) {{
+  const bytes = Uint8Array.from(atob(text), c => c.charCodeAt(0));
+  return new type(bytes.buffer);
+}}
+
+// Файлы данных подключаются тегом script: так они загружаются и при открытии index.html с диска (file://)
+window.dashboardData = function (ticker, payload) {{
+  const dates = payload.dates.map(d => Float64Array.from(decode(d.offsets, Int32Array), s => d.base + s * 1000));
+  const series = {{}};
+  for (const [name, s] of Object.entries(payload.series)) {{
+    series[name] = {{x: dates[s.x], y: decode(s.y, Float32Array)}};
+  }}
+  cache[ticker] = {{std: payload.std, series: series}};
+  (pending[ticker] || []).forEach(callback => callback(cache[ticker]));
+  delete pending[ticker];
+}};
+
+function load(ticker, callback) {{
+  if (cache[ticker]) return callback(cache[ticker]);
+  const loading = ticker in pending;
+  (pending[ticker] = pending[ticker] || []).push(callback);
+  if (!loading) {{
+    const script = document.createElement('script');
+    script.src = '{data_dir}/' + encodeURIComponent(ticker) + '.js';
+    script.onerror = () => {{
+      delete pending[ticker];
+      document.getElementById('chart').textContent = 'Нет данных для тикера ' + ticker;
+    }};
+    document.head.appendChild(script);
+  }}
+}}
+
+function substitute(value, ticker) {{
+  return JSON.parse(JSON.stringify(value).split('{placeholder}').join(ticker));
+}}
+
+function show(ticker) {{
+  document.querySelectorAll('#tickers div').forEach(el => el.classList.toggle('active', el.textContent === ticker));
+  load(ticker, data => {{
+    const s = data.series;
+    const band = sign => Float32Array.from(s.Close.y, v => v + sign * data.std);
+    const values = [s.Close, s.Moving_Average, {{x: s.Close.x, y: band(1)}}, {{x: s.Close.x, y: band(-1)}},
+                    s.RSI, s.MACD, s.Signal_Line];
+    const large = s.Close.y.length > WEBGL_THRESHOLD;
+    const traces = TEMPLATE.traces.map((trace, i) => Object.assign({{}}, trace, values[i],
+                                                                   {{type: large ? 'scattergl' : 'scatter'}}));
+    Plotly.react('chart', traces, substitute(TEMPLATE.layout, ticker));
+  }});
+}}
+
+const list = document.getElementById('tickers');
+TICKERS.forEach(ticker => {{
+  const item = document.createElement('div');
+  item.textContent = ticker;
+  item.onclick = () => show(ticker);
+  list.appendChild(item);
+}});
+document.getElementById('filter').oninput = event => {{
+  const text = event.target.value.toUpperCase();
+  document.querySelectorAll('#tickers div').forEach(el => {{
+    el.style.display = el.textContent.includes(text) ? '' : 'none';
+  }});
+}};
+if (TICKERS.length) show(TICKERS[0]);
+</script>
+</body>
+</html>
+"""
+
+
+def export_dashboard(frames: Mapping[str, pd.DataFrame], output_dir: str = 'dashboard',
+                     std_deviations: Optional[Mapping[str, float]] = None, downsample: Optional[str] = None,
+                     max_points: Optional[int] = None, webgl_threshold: int = 10000) -> DashboardResult:
+    """
+    Экспортирует панель интерактивных графиков для набора тикеров: plotly.js записывается один раз в plotly.min.js,
+    общий макет графика - в index.html, данные каждого тикера - в отдельный небольшой файл data/<тикер>.js
+    (float32 в base64), который загружается только при выборе тикера на странице.
+
+    Parameters:
+        frames (dict): Словарь тикер -> данные с колонками Close, Moving_Average, RSI, MACD, Signal_Line.
+        output_dir (str): Каталог панели.
+        std_deviations (dict, optional): Стандартные отклонения цены закрытия по тикерам. По умолчанию
+            рассчитываются по Close.
+        downsample (str, optional): Метод прореживания длинных рядов 'lttb' или 'minmax'.
+        max_points (int, optional): Число точек на ряд при прореживании.
+        webgl_threshold (int): Число точек, начиная с которого используются WebGL графики (Scattergl).
+
+    Returns:
+        DashboardResult: Путь к index.html, число и размер записанных файлов, время экспорта.
+    """
+    started = time.perf_counter()
+    std_deviations = std_deviations or {}
+    result = DashboardResult(os.path.join(output_dir, 'index.html'), tickers=list(frames))
+    os.makedirs(os.path.join(output_dir, DATA_DIR), exist_ok=True)
+
+    bundle = os.path.join(output_dir, PLOTLY_BUNDLE)
+    if not os.path.exists(bundle):
+        from plotly.offline import get_plotlyjs
+        result.bytes_written += _write(bundle, get_plotlyjs())
+        result.files += 1
+
+    template = None
+    for ticker, data in frames.items():
+        template = template or _figure_template(data)
+        payload = ticker_payload(data, std_deviations.get(ticker), downsample, max_points)
+        content = f"dashboardData({json.dumps(ticker)}, {json.dumps(payload, separators=(',', ':'))});\n"
+        result.bytes_written += _write(os.path.join(output_dir, DATA_DIR, f'{ticker}.js'), content)
+        result.files += 1
+
+    page = _INDEX_HTML.format(bundle=PLOTLY_BUNDLE, data_dir=DATA_DIR, placeholder=TICKER_PLACEHOLDER,
+                              tickers=json.dumps(result.tickers), webgl_threshold=webgl_threshold,
+                              template=json.dumps(template or {'traces': [], 'layout': {}}, ensure_ascii=False))
+    result.bytes_written += _write(result.path, page)
+    result.files += 1
+    result.seconds = time.perf_counter() - started
+    return result
@@ -0,0 +1,289 @@
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+
+import pandas as pd
+
+# Смещения для периодов Yahoo Finance, которые можно перевести в диапазон дат
+_PERIOD_OFFSETS = {
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+# Периоды в торговых днях: запрашиваем с запасом по календарю и обрезаем до N последних дней
+_TRADING_DAY_PERIODS = {'1d': 1, '5d': 5}
+
+
+def resolve_date_range(period: Optional[str], start: Optional[str] = None, end: Optional[str] = None,
+                       today: Optional[pd.Timestamp] = None) -> Tuple[Optional[pd.Timestamp], pd.Timestamp, bool]:
+    """
+    Переводит период или пару дат в диапазон дат [start, end).
+
+    Parameters:
+        period (str): Период данных ('1mo', '1y', 'ytd', 'max' и т.д.).
+        start (str, optional): Начальная дата периода данных.
+        end (str, optional): Конечная дата периода данных (не включается).
+        today (pd.Timestamp, optional): Текущая дата. По умолчанию - сегодня.
+
+    Returns:
+        tuple: Начало диапазона (None - вся история), конец диапазона и признак открытого конца (до текущего дня).
+    """
+    today = (today or pd.Timestamp.now()).normalize()
+    open_ended = end is None
+    end_ts = pd.Timestamp(end).normalize() if end is not None else today + pd.Timedelta(days=1)
+
+    if start is not None:
+        return pd.Timestamp(start).normalize(), end_ts, open_ended
+    if not period or period == 'max':
+        return None, end_ts, open_ended
+    if period == 'ytd':
+        return pd.Timestamp(year=today.year, month=1, day=1), end_ts, open_ended
+    if period in _TRADING_DAY_PERIODS:
+        # Выходные и праздники: берем календарный запас, лишние дни отрезаются после выборки
+        pad_days = _TRADING_DAY_PERIODS[period] * 2 + 5
+        return end_ts - pd.Timedelta(days=pad_days), end_ts, open_ended
+    if period in _PERIOD_OFFSETS:
+        return today - _PERIOD_OFFSETS[period], end_ts, open_ended
+    raise ValueError(f"Неизвестный период: {period}")
+
+
+def _index_dates(index: pd.Index) -> pd.DatetimeIndex:
+    """Возвращает даты индекса без часового пояса для сравнения с границами диапазона."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+class StockDataCache:
+    """
+    Локальный кэш исторических данных (OHLCV) в формате Parquet.
+
+    Данные хранятся по ключу (тикер, интервал). Для каждого ключа запоминается покрытый диапазон дат, поэтому при
+    повторном запросе загружаются только недостающие участки: начало, если запрошен более ранний период, и хвост
+    начиная с последнего сохранённого бара.
+
+    Parameters:
+        cache_dir (str): Каталог для хранения файлов кэша.
+        max_age (timedelta): Срок, после которого данные за текущий день считаются устаревшими.
+        max_bytes (int, optional): Максимальный размер кэша на диске. При превышении удаляются наименее
+            востребованные записи.
+
+    Экземпляр можно использовать из нескольких потоков: чтение и запись файлов, вытеснение и счётчики защищены общей
+    блокировкой, а запросы одного ключа выполняются по очереди (загрузка разных тикеров идёт параллельно).
+    """
+
+    def __init__(self, cache_dir: str = '.stock_cache', max_age: timedelta = timedelta(hours=1),
+                 max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+        self._key_locks = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _key(self, ticker: str, interval: str) -> str:
+        return re.sub(r'[^A-Za-z0-9_.-]', '_', f'{ticker.upper()}_{interval}')
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, key)
+        return base + '.parquet', base + '.json'
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _read(self, key: str) -> Tuple[Optional[pd.DataFrame], Optional[dict]]:
+        data_path, meta_path = self._paths(key)
+        with self._lock:
+            if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+                return None, None
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            return pd.read_parquet(data_path), meta
+
+    def _write(self, key: str, data: pd.DataFrame, meta: dict) -> None:
+        data_path, meta_path = self._paths(key)
+        with self._lock:
+            data.to_parquet(data_path)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+
+    def _touch(self, key: str, meta: dict) -> None:
+        meta['last_access'] = time.time()
+        with self._lock:
+            with open(self._paths(key)[1], 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+
+    def _missing_ranges(self, cached: pd.DataFrame, meta: dict, start: Optional[pd.Timestamp], end: pd.Timestamp,
+                        open_ended: bool) -> List[Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]]:
+        """Определяет участки диапазона, которых нет в кэше."""
+        missing = []
+        cached_start = pd.Timestamp(meta['start']) if meta['start'] is not None else None
+        cached_end = pd.Timestamp(meta['end'])
+
+        if cached_start is not None and (start is None or start < cached_start):
+            missing.append((start, cached_start))
+
+        fetched_at = datetime.fromisoformat(meta['fetched_at'])
+        stale = datetime.now() - fetched_at > self.max_age
+        if end > cached_end or (open_ended and stale):
+            # Последний бар мог быть неполным на момент загрузки, поэтому хвост перезапрашивается с его даты
+            tail_start = _index_dates(cached.index).max() if len(cached) else cached_end
+            missing.append((min(tail_start, cached_end), None if open_ended else end))
+        return missing
+
+    def get(self, ticker: str, period: Optional[str], loader: Callable[[Optional[pd.Timestamp],
+                                                                       Optional[pd.Timestamp]], pd.DataFrame],
+            start: Optional[str] = None, end: Optional[str] = None, interval: str = '1d') -> pd.DataFrame:
+        """
+        Возвращает данные за запрошенный диапазон, догружая только отсутствующие в кэше участки.
+
+        Parameters:
+            ticker (str): Тикер акции.
+            period (str): Период данных.
+            loader (callable): Функция загрузки loader(start, end) -> pd.DataFrame. start=None означает всю
+                историю, end=None - до текущего момента.
+            start (str, optional): Начальная дата периода данных.
+            end (str, optional): Конечная дата периода данных.
+            interval (str): Интервал баров.
+
+        Returns:
+            pd.DataFrame: Данные об акциях за запрошенный диапазон.
+        """
+        with self._key_lock(self._key(ticker, interval)):
+            return self._get(ticker, period, loader, start, end, interval)
+
+    def _get(self, ticker: str, period: Optional[str], loader: Callable, start: Optional[str], end: Optional[str],
+             interval: str) -> pd.DataFrame:
+        range_start, range_end, open_ended = resolve_date_range(period, start, end)
+        key = self._key(ticker, interval)
+        cached, meta = self._read(key)
+
+        if cached is None:
+            missing = [(range_start, None if open_ended else range_end)]
+        else:
+            missing = self._missing_ranges(cached, meta, range_start, range_end, open_ended)
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            elif missing:
+                self.partial_hits += 1
+            else:
+                self.hits += 1
+
+        if missing:
+            parts = [] if cached is None else [cached]
+            head_loaded = tail_loaded = False
+            for part_start, part_end in missing:
+                part = loader(part_start, part_end)
+                loaded = part is not None and len(part) > 0
+                if loaded:
+                    parts.append(part)
+                if part_end is None or part_end >= range_end:
+                    tail_loaded = tail_loaded or loaded
+                else:
+                    head_loaded = head_loaded or loaded
+            if cached is None and not tail_loaded:
+                # Пустой ответ загрузчика не сохраняется как покрытый диапазон: следующий запрос повторит загрузку
+                return pd.DataFrame()
+            merged = pd.concat(parts) if parts else pd.DataFrame()
+            if len(merged):
+                merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+
+            if cached is None:
+                new_start, new_end = range_start, range_end
+            else:
+                # Границы расширяются только на участки, для которых загрузчик вернул данные
+                known_start = pd.Timestamp(meta['start']) if meta['start'] is not None else None
+                new_start = known_start
+                if head_loaded:
+                    new_start = None if range_start is None or known_start is None else min(range_start, known_start)
+                new_end = max(range_end, pd.Timestamp(meta['end'])) if tail_loaded else pd.Timestamp(meta['end'])
+            meta = {
+                'start': None if new_start is None else new_start.isoformat(),
+                'end': new_end.isoformat(),
+                'fetched_at': datetime.now().isoformat() if tail_loaded else meta['fetched_at'],
+                'last_access': time.time(),
+            }
+            self._write(key, merged, meta)
+            cached = merged
+            self._evict(keep=key)
+        else:
+            self._touch(key, meta)
+
+        return self._slice(cached, period, range_start, range_end)
+
+    @staticmethod
+    def _slice(data: pd.DataFrame, period: Optional[str], start: Optional[pd.Timestamp],
+               end: pd.Timestamp) -> pd.DataFrame:
+        if not len(data):
+            return data
+        dates = _index_dates(data.index)
+        mask = dates < end
+        if start is not None:
+            mask &= dates >= start
+        result = data[mask]
+        if period in _TRADING_DAY_PERIODS:
+            last_days = pd.Index(dates[mask]).unique()[-_TRADING_DAY_PERIODS[period]:]
+            result = result[_index_dates(result.index).isin(last_days)]
+        return result
+
+    def size_bytes(self) -> int:
+        """Возвращает суммарный размер файлов кэша в байтах."""
+        with self._lock:
+            return sum(os.path.getsize(os.path.join(self.cache_dir, name))
+                       for name in os.listdir(self.cache_dir) if name.endswith('.parquet'))
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Удаляет наименее востребованные записи, пока размер кэша превышает max_bytes."""
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.json'):
+                    continue
+                key = name[:-len('.json')]
+                with open(os.path.join(self.cache_dir, name), encoding='utf-8') as f:
+                    entries.append((json.load(f).get('last_access', 0), key))
+            entries.sort()
+
+            total = self.size_bytes()
+            for _, key in entries:
+                if total <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                data_path, meta_path = self._paths(key)
+                total -= os.path.getsize(data_path) if os.path.exists(data_path) else 0
+                for path in (data_path, meta_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """Возвращает счётчики попаданий и промахов кэша."""
+        with self._lock:
+            requests = self.hits + self.partial_hits + self.misses
+            return {
+                'hits': self.hits,
+                'partial_hits': self.partial_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / requests if requests else 0.0,
+                'size_bytes': self.size_bytes(),
+            }
@@ -1,12 +1,31 @@
 import os
 
-import yfinance as yf
 from typing import Optional, Union
 import pandas as pd
 
+from data_cache import StockDataCache
+
+
+def _yfinance():
+    """
+    Возвращает модуль yfinance. Импорт занимает заметную долю времени запуска, поэтому выполняется при первой загрузке
+    данных, а не при импорте модуля.
+    """
+    global yf
+    import yfinance as yf
+    return yf
+
+
+def __getattr__(name):
+    # data_download.yf по-прежнему доступен как атрибут модуля (например, для patch('data_download.yf.Ticker'))
+    if name == 'yf':
+        return _yfinance()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def fetch_stock_data(ticker: str, period: str, start: Optional[str] = None,
-                     end: Optional[str] = None) -> Union[pd.DataFrame, None]:
+                     end: Optional[str] = None, cache: Optional[StockDataCache] = None,
+                     interval: str = '1d') -> Union[pd.DataFrame, None]:
     """
     Получает данные об акциях для указанного тикера из Yahoo Finance.
 
@@ -15,16 +34,15 @@ def fetch_stock_data(ticker: str, period: str, start: Optional[str] = None,
         period (str): Период данных.
         start (str, optional): Начальная дата периода данных.
         end (str, optional): Конечная дата периода данных.
+        cache (StockDataCache, optional): Локальный кэш данных. Если указан, загружаются только отсутствующие
+            в кэше участки периода.
+        interval (str): Интервал баров.
 
     Returns:
         pd.DataFrame: Данные об акциях или None в случае ошибки.
     """
     try:
-        stock = yf.Ticker(ticker)
-        if start is not None:
-            data = stock.history(period=period, start=start, end=end)
-        else:
-            data = stock.history(period=period)
+        data = download_stock_data(ticker, period, start=start, end=end, cache=cache, interval=interval)
         print(data)
         return data
     except Exception as e:
@@ -32,6 +50,43 @@ def fetch_stock_data(ticker: str, period: str, start: Optional[str] = None,
         return None
 
 
+def download_stock_data(ticker: str, period: str, start: Optional[str] = None, end: Optional[str] = None,
+                        cache: Optional[StockDataCache] = None, interval: str = '1d', session=None,
+                        raise_errors: bool = False) -> pd.DataFrame:
+    """
+    Загружает данные об акциях из Yahoo Finance без перехвата ошибок (для пакетной обработки, где ошибку нужно
+    сохранить вместе с тикером).
+
+    Parameters:
+        ticker (str): Символ акции, для которой нужно получить данные.
+        period (str): Период данных.
+        start (str, optional): Начальная дата периода данных.
+        end (str, optional): Конечная дата периода данных.
+        cache (StockDataCache, optional): Локальный кэш данных.
+        interval (str): Интервал баров.
+        session (optional): HTTP-сессия yfinance, общая для нескольких запросов. По умолчанию - сессия yfinance.
+        raise_errors (bool): Пробрасывать ошибки загрузки (тайм-аут, ограничение частоты запросов, разрыв
+            соединения). По умолчанию yfinance перехватывает их и возвращает пустой DataFrame.
+
+    Returns:
+        pd.DataFrame: Данные об акциях.
+    """
+    stock = _yfinance().Ticker(ticker, session=session)
+    options = {'interval': interval}
+    if raise_errors:
+        options['raise_errors'] = True
+    if cache is not None:
+        def loader(range_start, range_end):
+            if range_start is None:
+                return stock.history(period='max', end=range_end, **options)
+            return stock.history(start=range_start, end=range_end, **options)
+
+        return cache.get(ticker, period, loader, start=start, end=end, interval=interval)
+    if start is not None:
+        return stock.history(period=period, start=start, end=end, **options)
+    return stock.history(period=period, **options)
+
+
 def add_moving_average(data: pd.DataFrame, window_size: int = 5) -> Union[pd.DataFrame, None]:
     """
     Считает и добавляет в DataFrame колонку со скользящим средним, рассчитанным на основе цен закрытия.
@@ -122,7 +177,7 @@ def export_data_to_csv(data: pd.DataFrame, filename: str) -> None:
             raise TypeError("Параметр 'filename' должен быть строкой")
 
         if os.path.exists(filename):
-            print(f"Файл {filename} уже существует. Перезаписать?")
+            print(f"Файл {filename} уже существует и будет перезаписан.")
 
         data.to_csv(filename)
         print(f"\nДанные по запросу сохранены в файл {filename}")
@@ -0,0 +1,189 @@
+import os
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+FORMATS = ('parquet', 'feather', 'csv')
+
+
+def detect_format(path: str) -> str:
+    """
+    Определяет формат хранения по имени файла: .csv, .feather, иначе - набор данных Parquet (каталог или .parquet).
+
+    Parameters:
+        path (str): Путь к файлу или каталогу.
+
+    Returns:
+        str: 'csv', 'feather' или 'parquet'.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.feather', '.arrow'):
+        return 'feather'
+    return 'parquet'
+
+
+def _index_name(data: pd.DataFrame) -> str:
+    return data.index.name or 'Date'
+
+
+def _to_table(data: pd.DataFrame) -> pa.Table:
+    return pa.Table.from_pandas(data.reset_index(names=_index_name(data)), preserve_index=False)
+
+
+def _last_timestamp(path: str, fmt: str, index_name: str) -> Optional[pd.Timestamp]:
+    """Возвращает последнюю дату уже сохранённых данных, читая только колонку дат."""
+    if not os.path.exists(path):
+        return None
+    if fmt == 'parquet':
+        dates = ds.dataset(path, format='parquet').to_table(columns=[index_name]).column(0)
+    elif fmt == 'feather':
+        dates = feather.read_table(path, columns=[index_name]).column(0)
+    else:
+        dates = pd.read_csv(path, usecols=[index_name])[index_name]
+        return pd.to_datetime(dates, utc=True).max() if len(dates) else None
+    return pd.Timestamp(dates.to_pandas().max()) if len(dates) else None
+
+
+def _new_rows(data: pd.DataFrame, last: Optional[pd.Timestamp]) -> pd.DataFrame:
+    if last is None or pd.isna(last):
+        return data
+    index = pd.DatetimeIndex(data.index)
+    if index.tz is not None and last.tz is None:
+        last = last.tz_localize(index.tz)
+    elif index.tz is None and last.tz is not None:
+        last = last.tz_convert(None)
+    return data[index > last]
+
+
+def export_data(data: pd.DataFrame, path: str, fmt: Optional[str] = None, append: bool = False,
+                chunk_size: Optional[int] = None) -> int:
+    """
+    Экспортирует данные в колоночном формате (Parquet, Feather) или в CSV.
+
+    Parquet сохраняется как набор данных (каталог): при дозаписи добавляется новый файл только с новыми строками.
+    Feather не поддерживает дозапись, поэтому при append файл читается и перезаписывается целиком вместе с новыми
+    строками: время дозаписи растёт с размером всего файла, а не только новых строк. Для регулярной дозаписи больших
+    историй используйте Parquet.
+
+    Parameters:
+        data (pd.DataFrame): Данные для экспорта (индекс - даты).
+        path (str): Каталог набора данных Parquet или путь к файлу.
+        fmt (str, optional): 'parquet', 'feather' или 'csv'. По умолчанию определяется по path.
+        append (bool): Дозаписать только строки новее последней сохранённой даты.
+        chunk_size (int, optional): Число строк в одной части при записи.
+
+    Returns:
+        int: Число записанных строк.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат: {fmt}")
+    index_name = _index_name(data)
+    chunk_size = chunk_size or max(len(data), 1)
+
+    if append:
+        data = _new_rows(data, _last_timestamp(path, fmt, index_name))
+    if append and data.empty:
+        return 0
+
+    if fmt == 'parquet':
+        if not append and os.path.isdir(path):
+            for name in os.listdir(path):
+                if name.endswith('.parquet'):
+                    os.remove(os.path.join(path, name))
+        os.makedirs(path, exist_ok=True)
+        part = len([name for name in os.listdir(path) if name.endswith('.parquet')])
+        schema = _to_table(data.iloc[:0]).schema
+        with pq.ParquetWriter(os.path.join(path, f'part-{part:05d}.parquet'), schema) as writer:
+            for offset in range(0, len(data), chunk_size):
+                writer.write_table(_to_table(data.iloc[offset:offset + chunk_size]).cast(schema))
+    elif fmt == 'feather':
+        table = _to_table(data)
+        if append and os.path.exists(path):
+            existing = feather.read_table(path)
+            table = pa.concat_tables([existing, table.cast(existing.schema)])
+        feather.write_feather(table, path, chunksize=chunk_size)
+    else:
+        exists = append and os.path.exists(path)
+        data.to_csv(path, mode='a' if exists else 'w', header=not exists, index_label=index_name,
+                    chunksize=chunk_size)
+    return len(data)
+
+
+def _bound(value, field_type: pa.DataType) -> pa.Scalar:
+    """Приводит границу диапазона дат к типу колонки дат (с учётом часового пояса)."""
+    timestamp = pd.Timestamp(value)
+    tz = getattr(field_type, 'tz', None)
+    if tz and timestamp.tz is None:
+        timestamp = timestamp.tz_localize(tz)
+    elif not tz and timestamp.tz is not None:
+        timestamp = timestamp.tz_convert(None)
+    return pa.scalar(timestamp, type=field_type)
+
+
+def _local_times(dates: pd.Series, utc: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Местное время записей CSV: UTC плюс смещение, записанное в конце строки даты ('-05:00')."""
+    offsets = dates.astype(str).str.extract(r'([+-])(\d{2}):?(\d{2})$')
+    minutes = (offsets[1].astype(float) * 60 + offsets[2].astype(float)).fillna(0).to_numpy()
+    minutes = np.where(offsets[0].to_numpy() == '-', -minutes, minutes)
+    return utc.tz_localize(None) + pd.to_timedelta(minutes, unit='min')
+
+
+def load_data(path: str, columns: Optional[List[str]] = None, start: Optional[str] = None,
+              end: Optional[str] = None, fmt: Optional[str] = None, index_name: str = 'Date') -> pd.DataFrame:
+    """
+    Загружает сохранённые данные, читая только выбранные колонки и диапазон дат.
+    Для Parquet фильтр по датам применяется при чтении и пропускает части файлов вне диапазона.
+
+    Parameters:
+        path (str): Каталог набора данных Parquet или путь к файлу.
+        columns (list, optional): Колонки для чтения. По умолчанию - все.
+        start (str, optional): Начальная дата (включительно).
+        end (str, optional): Конечная дата (не включается).
+        fmt (str, optional): 'parquet', 'feather' или 'csv'. По умолчанию определяется по path.
+        index_name (str): Колонка с датами.
+
+    Returns:
+        pd.DataFrame: Данные с индексом по датам.
+    """
+    fmt = fmt or detect_format(path)
+    read_columns = None if columns is None else [index_name] + [c for c in columns if c != index_name]
+
+    if fmt == 'csv':
+        data = pd.read_csv(path, usecols=read_columns)
+        dates = data[index_name]
+        data[index_name] = pd.to_datetime(dates, utc=True)
+        data = data.set_index(index_name)
+        # CSV не хранит название часового пояса, поэтому даты читаются в UTC, а границы без часового пояса, как и для
+        # Parquet и Feather, относятся к местному времени данных - дате и времени в том виде, как они записаны в файл
+        mask = np.ones(len(data), dtype=bool)
+        local = None
+        for bound, lower in ((start, True), (end, False)):
+            if bound is None:
+                continue
+            bound = pd.Timestamp(bound)
+            if bound.tz is None:
+                local = _local_times(dates, data.index) if local is None else local
+                values = local
+            else:
+                values = data.index
+            mask &= (values >= bound) if lower else (values < bound)
+        return data[mask]
+
+    dataset = ds.dataset(path, format='feather' if fmt == 'feather' else 'parquet')
+    field_type = dataset.schema.field(index_name).type
+    condition = None
+    if start is not None:
+        condition = ds.field(index_name) >= _bound(start, field_type)
+    if end is not None:
+        upper = ds.field(index_name) < _bound(end, field_type)
+        condition = upper if condition is None else condition & upper
+    table = dataset.to_table(columns=read_columns, filter=condition)
+    return table.to_pandas().set_index(index_name).sort_index()
@@ -1,13 +1,137 @@
+import contextlib
+import io
 import os
-import matplotlib.pyplot as plt
 import pandas as pd
 
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+# matplotlib и plotly импортируются внутри функций построения графиков: их загрузка занимает большую часть времени
+# запуска, а при работе без графиков (--headless) они не нужны.
+from plot_downsampling import downsample_series, point_budget
+
+# Колонки, которые выводятся на графиках
+PLOT_COLUMNS = ('Close', 'Moving_Average', 'RSI', 'MACD', 'Signal_Line')
+
+
+def prepare_plot_series(data: pd.DataFrame, downsample: str = None, max_points: int = None,
+                        pixel_width: int = 1800) -> dict:
+    """
+    Возвращает ряды для построения графиков, при необходимости прореженные до числа точек, соответствующего ширине
+    графика в пикселях.
+
+    Parameters:
+        data (pd.DataFrame): Данные о биржевой акции с рассчитанными индикаторами.
+        downsample (str, optional): Метод прореживания 'lttb' или 'minmax'. По умолчанию - без прореживания.
+        max_points (int, optional): Число точек на ряд. По умолчанию определяется по pixel_width.
+        pixel_width (int): Ширина графика в пикселях.
+
+    Returns:
+        dict: Название колонки -> pd.Series.
+    """
+    series = {name: data[name] for name in PLOT_COLUMNS if name in data}
+    if not downsample:
+        return series
+    budget = max_points or point_budget(pixel_width, downsample)
+    if len(data) <= budget:
+        return series
+    print(f"Прореживание ({downsample}): {budget} точек на ряд вместо {len(data)}")
+    return {name: downsample_series(values, budget, downsample) for name, values in series.items()}
+
+
+def _style_context(style: str = None):
+    """Применяет стиль графика только на время построения, не меняя глобальные настройки matplotlib."""
+    if not style:
+        return contextlib.nullcontext()
+    import matplotlib.style
+    return matplotlib.style.context(style)
+
+
+def build_static_figure() -> dict:
+    """
+    Создаёт шаблон статического графика: фигуру с тремя областями (цена, RSI, MACD), пустыми линиями, подписями и
+    легендами. Шаблон заполняется данными функцией update_static_figure и может использоваться повторно для
+    нескольких тикеров.
+
+    Returns:
+        dict: Фигура, области графиков, линии, заливка стандартного отклонения и заголовки.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(18, 25))
+    axs = fig.subplots(3, 1)
+
+    # График цены закрытия, скользящего среднего и стандартного отклонения
+    close_line, = axs[0].plot([], [], label='Цена закрытия', color='blue')
+    ma_line, = axs[0].plot([], [], label='Скользящее среднее', color='orange')
+    fill = axs[0].fill_between([], [], [], color='lightblue', alpha=0.5, label='Стандартное отклонение')
+    axs[0].set_ylabel('Цена')
+    titles = [axs[0].set_title('', fontweight='bold', fontsize=16)]
+    axs[0].legend()
+
+    # График RSI
+    rsi_line, = axs[1].plot([], [], label='RSI', color='purple')
+    axs[1].axhline(70, color='r', linestyle='--')
+    axs[1].axhline(30, color='g', linestyle='--')
+    axs[1].set_ylabel('RSI')
+    titles.append(axs[1].set_title('', fontweight='bold', fontsize=16))
+    axs[1].legend()
+
+    # График MACD
+    macd_line, = axs[2].plot([], [], label='MACD', color='blue')
+    signal_line, = axs[2].plot([], [], label='Сигнальная линия', color='orange')
+    axs[2].set_ylabel('MACD')
+    titles.append(axs[2].set_title('', fontweight='bold', fontsize=16))
+    axs[2].legend()
+    axs[2].set_xlabel("Дата")
+
+    return {
+        'figure': fig,
+        'axes': axs,
+        'lines': {'Close': close_line, 'Moving_Average': ma_line, 'RSI': rsi_line, 'MACD': macd_line,
+                  'Signal_Line': signal_line},
+        'fill': fill,
+        'titles': titles,
+        'suptitle': fig.suptitle('', fontsize=20, fontweight='bold'),  # Общий заголовок
+    }
+
+
+def update_static_figure(template: dict, data: pd.DataFrame, ticker: str, std_deviation: float,
+                         downsample: str = None, max_points: int = None) -> None:
+    """
+    Заполняет шаблон статического графика данными тикера: обновляет данные линий, заливку стандартного отклонения,
+    заголовки и масштаб осей.
+
+    Parameters:
+        template (dict): Шаблон, созданный build_static_figure.
+        data (pd.DataFrame): Данные о биржевой акции с рассчитанными индикаторами.
+        ticker (str): Тикер акции.
+        std_deviation (float): Стандартное отклонение цены закрытия.
+        downsample (str, optional): Метод прореживания длинных рядов 'lttb' или 'minmax'.
+        max_points (int, optional): Число точек на ряд при прореживании.
+    """
+    fig, axs = template['figure'], template['axes']
+    series = prepare_plot_series(data, downsample, max_points, pixel_width=int(fig.get_figwidth() * fig.dpi))
+    for ax in axs:
+        ax.xaxis.update_units(data.index)
+    for name, line in template['lines'].items():
+        line.set_data(series[name].index, series[name].to_numpy())
+
+    template['fill'].remove()
+    for ax in axs:
+        ax.relim()
+    close = series['Close']
+    template['fill'] = axs[0].fill_between(close.index, close - std_deviation, close + std_deviation,
+                                           color='lightblue', alpha=0.5, label='Стандартное отклонение')
+    for ax in axs:
+        ax.autoscale_view()
+
+    template['titles'][0].set_text(f"\nЦены акций {ticker}, скользящее среднее и стандартное отклонение\n")
+    template['titles'][1].set_text(f"\nОтносительный индекс силы {ticker} (RSI)\n")
+    template['titles'][2].set_text(f"\nСхождение и расхождение скользящих средних {ticker} (MACD)\n")
+    template['suptitle'].set_text(f"Анализ акций {ticker}")
 
 
 def create_and_save_plot(data: pd.DataFrame, ticker: str, period: str, start_date: str, end_date: str,
-                         std_deviation: float, style: str = None, filename: str = None) -> None:
+                         std_deviation: float, style: str = None, filename: str = None, downsample: str = None,
+                         max_points: int = None) -> None:
     """
     Создает и сохраняет интерактивный график на основе данных о биржевой акции.
 
@@ -20,52 +144,22 @@ def create_and_save_plot(data: pd.DataFrame, ticker: str, period: str, start_dat
         std_deviation (float): Стандартное отклонение цены закрытия.
         style (str, optional): Стиль графика. По умолчанию None.
         filename (str, optional): Имя файла для сохранения графика. По умолчанию None.
+        downsample (str, optional): Метод прореживания длинных рядов 'lttb' или 'minmax'. По умолчанию None.
+        max_points (int, optional): Число точек на ряд при прореживании. По умолчанию - по ширине графика.
 
     Returns:
         None
     """
     try:
-        if style:
-            plt.style.use(style)
-
-        fig, axs = plt.subplots(3, 1, figsize=(18, 25))
-
-        # График цены закрытия, скользящего среднего и стандартного отклонения
-        axs[0].plot(data.index, data['Close'], label='Цена закрытия', color='blue')
-        axs[0].plot(data.index, data['Moving_Average'], label='Скользящее среднее', color='orange')
-        fill_label = 'Стандартное отклонение'
-        axs[0].fill_between(data.index, data['Close'] - std_deviation, data['Close'] + std_deviation, color='lightblue',
-                            alpha=0.5, label=fill_label)
-        axs[0].set_ylabel('Цена')
-        axs[0].set_title(f"\nЦены акций {ticker}, скользящее среднее и стандартное отклонение\n", fontweight='bold',
-                         fontsize=16)
-        axs[0].legend()
-
-        # График RSI
-        axs[1].plot(data.index, data['RSI'], label='RSI', color='purple')
-        axs[1].axhline(70, color='r', linestyle='--')
-        axs[1].axhline(30, color='g', linestyle='--')
-        axs[1].set_ylabel('RSI')
-        axs[1].set_title(f"\nОтносительный индекс силы {ticker} (RSI)\n", fontweight='bold',
-                         fontsize=16)
-        axs[1].legend()
-
-        # График MACD
-        axs[2].plot(data.index, data['MACD'], label='MACD', color='blue')
-        axs[2].plot(data.index, data['Signal_Line'], label='Сигнальная линия', color='orange')
-        axs[2].set_ylabel('MACD')
-        axs[2].set_title(f"\nСхождение и расхождение скользящих средних {ticker} (MACD)\n", fontweight='bold',
-                         fontsize=16)
-        axs[2].legend()
-
-        fig.suptitle(f"Анализ акций {ticker}", fontsize=20, fontweight='bold')  # Общий заголовок
-
-        plt.xlabel("Дата")
-
-        if filename is None:
-            filename = f"{ticker}_{period}_chart.png" if period else f"{ticker}_{start_date}_to_{end_date}_chart.png"
-
-        plt.savefig(filename)
+        with _style_context(style):
+            template = build_static_figure()
+            update_static_figure(template, data, ticker, std_deviation, downsample=downsample, max_points=max_points)
+
+            if filename is None:
+                filename = (f"{ticker}_{period}_chart.png" if period
+                            else f"{ticker}_{start_date}_to_{end_date}_chart.png")
+
+            template['figure'].savefig(filename)
         print(f"Графики сохранены в {filename}")
 
         # Проверка наличия файла
@@ -77,8 +171,73 @@ def create_and_save_plot(data: pd.DataFrame, ticker: str, period: str, start_dat
         print(f"\nОшибка при создании и сохранении графика: {e}")
 
 
+def build_interactive_figure(data: pd.DataFrame, ticker: str, std_deviation: float, downsample: str = None,
+                             max_points: int = None, webgl_threshold: int = 10000):
+    """
+    Создаёт интерактивный график plotly (цена, скользящее среднее, стандартное отклонение, RSI и MACD) без сохранения
+    и отображения.
 
-def create_and_show_plot(data: pd.DataFrame, ticker: str, std_deviation: float) -> None:
+    Parameters:
+        data (pd.DataFrame): Данные об акциях, включая цены закрытия, скользящее среднее, RSI и MACD.
+        ticker (str): Символ акции для отображения на графике.
+        std_deviation (float): Стандартное отклонение цены закрытия.
+        downsample (str, optional): Метод прореживания длинных рядов 'lttb' или 'minmax'.
+        max_points (int, optional): Число точек на ряд при прореживании.
+        webgl_threshold (int): Число точек в ряду, начиная с которого используются WebGL графики (Scattergl).
+
+    Returns:
+        plotly.graph_objects.Figure: График.
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    # Создание макета с тремя графиками
+    fig = make_subplots(rows=3, cols=1, subplot_titles=(
+        f"Цены акций {ticker}, скользящее среднее и стандартное отклонение",
+        f"Относительный индекс силы {ticker} (RSI)",
+        f"Схождение и расхождение скользящих средних {ticker} (MACD)"
+    ))
+
+    width = 800
+    series = prepare_plot_series(data, downsample, max_points, pixel_width=width)
+    close = series['Close']
+    scatter = go.Scattergl if max(len(values) for values in series.values()) > webgl_threshold else go.Scatter
+
+    # График цены закрытия, скользящего среднего и стандартного отклонения
+    fig.add_trace(scatter(x=close.index, y=close, mode='lines', name='Цена закрытия'), row=1, col=1)
+    fig.add_trace(scatter(x=series['Moving_Average'].index, y=series['Moving_Average'], mode='lines',
+                          name='Скользящее среднее'), row=1, col=1)
+    fig.add_trace(
+        scatter(x=close.index, y=close + std_deviation, mode='lines', name='Верхнее станд. откл.',
+                fill=None), row=1, col=1)
+    fig.add_trace(
+        scatter(x=close.index, y=close - std_deviation, mode='lines', name='Нижнее станд. откл.',
+                fill='tonexty'), row=1, col=1)
+
+    # График RSI
+    fig.add_trace(scatter(x=series['RSI'].index, y=series['RSI'], mode='lines', name='RSI'), row=2, col=1)
+    fig.add_hline(y=70, line_dash="dot", line_color="red", row=2, col=1)
+    fig.add_hline(y=30, line_dash="dot", line_color="green", row=2, col=1)
+
+    # График MACD
+    fig.add_trace(scatter(x=series['MACD'].index, y=series['MACD'], mode='lines', name='MACD'), row=3, col=1)
+    fig.add_trace(scatter(x=series['Signal_Line'].index, y=series['Signal_Line'], mode='lines',
+                          name='Сигнальная линия'), row=3, col=1)
+
+    # Общие настройки графика
+    fig.update_layout(
+        height=1200,
+        width=width,
+        title_text=f"Анализ акций {ticker}",
+        title_font_size=30,  # Размер шрифта заголовка
+        title_x=0.5  # Положение заголовка по горизонтали (0.5 - по центру)
+    )
+    fig.update_xaxes(title_text="Дата", row=3, col=1)
+    return fig
+
+
+def create_and_show_plot(data: pd.DataFrame, ticker: str, std_deviation: float, downsample: str = None,
+                         max_points: int = None, webgl_threshold: int = 10000, show: bool = True) -> None:
     """
     Создает и отображает в браузере интерактивные графики цен акций, скользящего среднего, стандартного отклонения,
     RSI и MACD для указанного тикера.
@@ -87,6 +246,10 @@ def create_and_show_plot(data: pd.DataFrame, ticker: str, std_deviation: float)
         data (pd.DataFrame): Данные об акциях, включая цены закрытия, скользящее среднее, RSI и MACD.
         ticker (str): Символ акции для отображения на графике.
         std_deviation (float): Стандартное отклонение для построения верхней и нижней границы стандартного отклонения.
+        downsample (str, optional): Метод прореживания длинных рядов 'lttb' или 'minmax'. По умолчанию None.
+        max_points (int, optional): Число точек на ряд при прореживании. По умолчанию - по ширине графика.
+        webgl_threshold (int): Число точек в ряду, начиная с которого используются WebGL графики (Scattergl).
+        show (bool): Открывать график в браузере. При False график только сохраняется в HTML файл.
 
     Returns:
         None
@@ -94,43 +257,8 @@ def create_and_show_plot(data: pd.DataFrame, ticker: str, std_deviation: float)
     В случае возникновения ошибки при создании графика, выводит сообщение об ошибке.
     """
     try:
-        # Создание макета с тремя графиками
-        fig = make_subplots(rows=3, cols=1, subplot_titles=(
-            f"Цены акций {ticker}, скользящее среднее и стандартное отклонение",
-            f"Относительный индекс силы {ticker} (RSI)",
-            f"Схождение и расхождение скользящих средних {ticker} (MACD)"
-        ))
-
-        # График цены закрытия, скользящего среднего и стандартного отклонения
-        fig.add_trace(go.Scatter(x=data.index, y=data['Close'], mode='lines', name='Цена закрытия'), row=1, col=1)
-        fig.add_trace(go.Scatter(x=data.index, y=data['Moving_Average'], mode='lines', name='Скользящее среднее'),
-                      row=1, col=1)
-        fig.add_trace(
-            go.Scatter(x=data.index, y=data['Close'] + std_deviation, mode='lines', name='Верхнее станд. откл.',
-                       fill=None), row=1, col=1)
-        fig.add_trace(
-            go.Scatter(x=data.index, y=data['Close'] - std_deviation, mode='lines', name='Нижнее станд. откл.',
-                       fill='tonexty'), row=1, col=1)
-
-        # График RSI
-        fig.add_trace(go.Scatter(x=data.index, y=data['RSI'], mode='lines', name='RSI'), row=2, col=1)
-        fig.add_hline(y=70, line_dash="dot", line_color="red", row=2, col=1)
-        fig.add_hline(y=30, line_dash="dot", line_color="green", row=2, col=1)
-
-        # График MACD
-        fig.add_trace(go.Scatter(x=data.index, y=data['MACD'], mode='lines', name='MACD'), row=3, col=1)
-        fig.add_trace(go.Scatter(x=data.index, y=data['Signal_Line'], mode='lines', name='Сигнальная линия'), row=3,
-                      col=1)
-
-        # Общие настройки графика
-        fig.update_layout(
-            height=1200,
-            width=800,
-            title_text=f"Анализ акций {ticker}",
-            title_font_size=30,  # Размер шрифта заголовка
-            title_x=0.5  # Положение заголовка по горизонтали (0.5 - по центру)
-        )
-        fig.update_xaxes(title_text="Дата", row=3, col=1)
+        fig = build_interactive_figure(data, ticker, std_deviation, downsample=downsample, max_points=max_points,
+                                       webgl_threshold=webgl_threshold)
 
         filename = f"{ticker}_interactive_chart.html"
 
@@ -138,7 +266,55 @@ def create_and_show_plot(data: pd.DataFrame, ticker: str, std_deviation: float)
         fig.write_html(filename)
 
         # Открытие графика в браузере
-        fig.show()
+        if show:
+            fig.show()
 
     except Exception as e:
         print(f"\nОшибка при создании графика: {e}")
+
+
+def render_static_png(data: pd.DataFrame, ticker: str, std_deviation: float, style: str = None,
+                      downsample: str = None, max_points: int = None, template: dict = None) -> bytes:
+    """
+    Строит статический график, как create_and_save_plot, и возвращает PNG без записи в файл.
+
+    Parameters:
+        data (pd.DataFrame): Данные о биржевой акции с рассчитанными индикаторами.
+        ticker (str): Тикер акции.
+        std_deviation (float): Стандартное отклонение цены закрытия.
+        style (str, optional): Стиль графика.
+        downsample (str, optional): Метод прореживания длинных рядов 'lttb' или 'minmax'.
+        max_points (int, optional): Число точек на ряд при прореживании.
+        template (dict, optional): Шаблон build_static_figure для повторного использования (созданный в том же стиле).
+
+    Returns:
+        bytes: Изображение PNG.
+    """
+    buffer = io.BytesIO()
+    with _style_context(style):
+        if template is None:
+            template = build_static_figure()
+        update_static_figure(template, data, ticker, std_deviation, downsample=downsample, max_points=max_points)
+        template['figure'].savefig(buffer, format='png')
+    return buffer.getvalue()
+
+
+def render_interactive_html(data: pd.DataFrame, ticker: str, std_deviation: float, downsample: str = None,
+                            max_points: int = None, include_plotlyjs='cdn') -> str:
+    """
+    Строит интерактивный график, как create_and_show_plot, и возвращает HTML страницу без записи в файл.
+
+    Parameters:
+        data (pd.DataFrame): Данные об акциях, включая цены закрытия, скользящее среднее, RSI и MACD.
+        ticker (str): Тикер акции.
+        std_deviation (float): Стандартное отклонение цены закрытия.
+        downsample (str, optional): Метод прореживания длинных рядов 'lttb' или 'minmax'.
+        max_points (int, optional): Число точек на ряд при прореживании.
+        include_plotlyjs (bool | str): Способ подключения plotly.js (см. plotly.io.to_html): 'cdn', True - встроить
+            в страницу, 'directory' - ссылка на plotly.min.js рядом со страницей.
+
+    Returns:
+        str: HTML страница.
+    """
+    fig = build_interactive_figure(data, ticker, std_deviation, downsample=downsample, max_points=max_points)
+    return fig.to_html(include_plotlyjs=include_plotlyjs)
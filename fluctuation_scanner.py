@@ -0,0 +1,214 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Iterable, Iterator, List, Mapping, Union
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class FluctuationAlert:
+    """
+    Сильное колебание цены закрытия: подряд идущие окна, в которых разница между максимумом и минимумом превышает
+    порог. Одно уведомление на серию окон, с окном наибольшего колебания.
+
+    Attributes:
+        ticker (str): Тикер акции.
+        start (pd.Timestamp): Начало первого окна серии.
+        end (pd.Timestamp): Конец последнего окна серии.
+        peak_end (pd.Timestamp): Конец окна с наибольшим колебанием.
+        fluctuation (float): Наибольшее колебание в процентах, (max - min) / min * 100.
+        max_price (float): Максимальная цена закрытия в этом окне.
+        min_price (float): Минимальная цена закрытия в этом окне.
+        window (int): Размер окна в барах.
+    """
+    ticker: str
+    start: pd.Timestamp
+    end: pd.Timestamp
+    peak_end: pd.Timestamp
+    fluctuation: float
+    max_price: float
+    min_price: float
+    window: int
+
+
+def _sliding_extreme(values: np.ndarray, window: int, ufunc) -> np.ndarray:
+    """
+    Скользящий максимум или минимум по оси 0 алгоритмом van Herk/Gil-Werman: массив делится на блоки длины window,
+    в каждом блоке считаются накопленные экстремумы слева направо и справа налево, и экстремум любого окна - это
+    экстремум двух значений. Время O(n) независимо от размера окна. NaN пропускаются (fmax/fmin).
+    """
+    n = values.shape[0]
+    out = np.full(values.shape, np.nan)
+    if window < 1 or n < window:
+        return out
+    blocks = -(-n // window)
+    padded = np.full((blocks * window,) + values.shape[1:], np.nan)
+    padded[:n] = values
+    padded = padded.reshape((blocks, window) + values.shape[1:])
+    prefix = ufunc.accumulate(padded, axis=1).reshape((blocks * window,) + values.shape[1:])
+    suffix = ufunc.accumulate(padded[:, ::-1], axis=1)[:, ::-1].reshape((blocks * window,) + values.shape[1:])
+    ufunc(suffix[:n - window + 1], prefix[window - 1:n], out=out[window - 1:])
+    return out
+
+
+def sliding_max(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Скользящий максимум, значение записывается в позицию конца окна (как Series.rolling(window).max()).
+
+    Parameters:
+        values (np.ndarray): Одномерный массив или массив (даты x тикеры).
+        window (int): Размер окна.
+
+    Returns:
+        np.ndarray: Массив той же формы; первые window-1 значений - NaN.
+    """
+    return _sliding_extreme(np.asarray(values, dtype=np.float64), window, np.fmax)
+
+
+def sliding_min(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Скользящий минимум, значение записывается в позицию конца окна (как Series.rolling(window).min()).
+
+    Parameters:
+        values (np.ndarray): Одномерный массив или массив (даты x тикеры).
+        window (int): Размер окна.
+
+    Returns:
+        np.ndarray: Массив той же формы; первые window-1 значений - NaN.
+    """
+    return _sliding_extreme(np.asarray(values, dtype=np.float64), window, np.fmin)
+
+
+def rolling_fluctuation(values: np.ndarray, window: int, min_periods: int = None) -> tuple:
+    """
+    Колебание цены в каждом скользящем окне в процентах, как в notify_if_strong_fluctuations: (max - min) / min * 100.
+
+    Parameters:
+        values (np.ndarray): Цены закрытия, одномерный массив или массив (даты x тикеры).
+        window (int): Размер окна в барах.
+        min_periods (int, optional): Минимальное число цен в окне (без пропусков). По умолчанию - window.
+
+    Returns:
+        tuple: Колебание, скользящий максимум и минимум (массивы формы values).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    high, low = sliding_max(values, window), sliding_min(values, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fluctuation = (high - low) / low * 100
+    valid = np.cumsum(~np.isnan(values), axis=0)
+    counts = valid.copy()
+    counts[window:] -= valid[:-window]
+    fluctuation[counts < (min_periods or window)] = np.nan
+    return fluctuation, high, low
+
+
+def _column_alerts(ticker: str, index: pd.Index, fluctuation: np.ndarray, high: np.ndarray, low: np.ndarray,
+                   window: int, threshold: float) -> List[FluctuationAlert]:
+    """
+    Объединяет подряд идущие окна с колебанием выше порога в уведомления. Как и в notify_if_strong_fluctuations, с
+    порогом сравнивается колебание, округлённое до одного знака.
+    """
+    rounded = np.round(np.nan_to_num(fluctuation, nan=-np.inf), 1)
+    exceeded = np.concatenate(([False], rounded > threshold, [False]))
+    edges = np.flatnonzero(exceeded[1:] != exceeded[:-1])
+    alerts = []
+    for first, stop in zip(edges[::2], edges[1::2]):
+        peak = first + int(np.argmax(fluctuation[first:stop]))
+        alerts.append(FluctuationAlert(ticker, index[max(first - window + 1, 0)], index[stop - 1], index[peak],
+                                       float(fluctuation[peak]), float(high[peak]), float(low[peak]), window))
+    return alerts
+
+
+def scan_panel(panel: pd.DataFrame, window: int = 20, threshold: float = 5.0,
+               min_periods: int = None) -> List[FluctuationAlert]:
+    """
+    Ищет сильные колебания сразу для всех тикеров панели цен закрытия (даты x тикеры) векторными операциями.
+
+    Parameters:
+        panel (pd.DataFrame): Панель цен закрытия, колонки - тикеры.
+        window (int): Размер окна в барах.
+        threshold (float): Порог колебания в процентах.
+        min_periods (int, optional): Минимальное число цен в окне. По умолчанию - window.
+
+    Returns:
+        list: Уведомления FluctuationAlert по тикерам в порядке колонок.
+    """
+    fluctuation, high, low = rolling_fluctuation(panel.to_numpy(dtype=np.float64), window, min_periods)
+    alerts = []
+    for j, ticker in enumerate(panel.columns):
+        alerts.extend(_column_alerts(ticker, panel.index, fluctuation[:, j], high[:, j], low[:, j], window,
+                                     threshold))
+    return alerts
+
+
+def scan_ticker(ticker: str, data: Union[pd.DataFrame, pd.Series], window: int = 20, threshold: float = 5.0,
+                min_periods: int = None) -> List[FluctuationAlert]:
+    """
+    Ищет сильные колебания цены закрытия одного тикера.
+
+    Parameters:
+        ticker (str): Тикер акции.
+        data (pd.DataFrame | pd.Series): Данные с колонкой Close или ряд цен закрытия.
+        window (int): Размер окна в барах.
+        threshold (float): Порог колебания в процентах.
+        min_periods (int, optional): Минимальное число цен в окне. По умолчанию - window.
+
+    Returns:
+        list: Уведомления FluctuationAlert.
+    """
+    close = data['Close'] if isinstance(data, pd.DataFrame) else data
+    fluctuation, high, low = rolling_fluctuation(close.to_numpy(dtype=np.float64), window, min_periods)
+    return _column_alerts(ticker, close.index, fluctuation, high, low, window, threshold)
+
+
+def scan_universe(universe: Union[pd.DataFrame, Mapping[str, pd.DataFrame]], window: int = 20,
+                  threshold: float = 5.0, workers: int = 4, chunk_size: int = 100,
+                  min_periods: int = None) -> Iterator[FluctuationAlert]:
+    """
+    Параллельно ищет сильные колебания по всему набору тикеров и выдаёт уведомления по мере готовности частей набора.
+
+    Parameters:
+        universe (pd.DataFrame | dict): Панель цен закрытия (даты x тикеры) или словарь тикер -> данные с колонкой
+            Close.
+        window (int): Размер окна в барах.
+        threshold (float): Порог колебания в процентах.
+        workers (int): Число потоков.
+        chunk_size (int): Число тикеров в одной части.
+        min_periods (int, optional): Минимальное число цен в окне. По умолчанию - window.
+
+    Yields:
+        FluctuationAlert: Уведомления о сильных колебаниях.
+    """
+    if isinstance(universe, pd.DataFrame):
+        columns = list(universe.columns)
+        chunks = [columns[i:i + chunk_size] for i in range(0, len(columns), chunk_size)]
+
+        def scan_chunk(chunk):
+            return scan_panel(universe[chunk], window, threshold, min_periods)
+    else:
+        tickers = list(universe)
+        chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+
+        def scan_chunk(chunk):
+            return [alert for ticker in chunk
+                    for alert in scan_ticker(ticker, universe[ticker], window, threshold, min_periods)]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(scan_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def alerts_to_frame(alerts: Iterable[FluctuationAlert]) -> pd.DataFrame:
+    """
+    Собирает уведомления в DataFrame (по одной строке на уведомление).
+
+    Parameters:
+        alerts (iterable): Уведомления FluctuationAlert.
+
+    Returns:
+        pd.DataFrame: Уведомления.
+    """
+    return pd.DataFrame([asdict(alert) for alert in alerts],
+                        columns=list(FluctuationAlert.__dataclass_fields__))
@@ -0,0 +1,200 @@
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Колонки OHLCV и их типы в файлах хранилища
+COLUMN_DTYPES = {
+    'Open': np.float64,
+    'High': np.float64,
+    'Low': np.float64,
+    'Close': np.float64,
+    'Volume': np.int64,
+}
+_TIMESTAMPS = '_timestamps'
+
+
+class HistoryView:
+    """
+    Срез истории тикера за диапазон дат. Колонки - представления (view) отображённых в память файлов без копирования.
+
+    Поддерживает обращения, которые используют функции data_download: data['Close'] возвращает pd.Series поверх
+    отображённого файла, data['RSI'] = ... сохраняет рассчитанную колонку в самом срезе, data.index - индекс дат.
+    Поэтому add_moving_average, calculate_rsi, calculate_macd и другие функции принимают срез напрямую.
+
+    Parameters:
+        timestamps (np.ndarray): Время баров в наносекундах UTC.
+        columns (dict): Колонки OHLCV.
+        tz (str, optional): Часовой пояс исходных данных.
+    """
+
+    def __init__(self, timestamps: np.ndarray, columns: Dict[str, np.ndarray], tz: Optional[str] = None):
+        self.timestamps = timestamps
+        self.arrays = dict(columns)
+        self.tz = tz
+        self._index = None
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        if self._index is None:
+            index = pd.DatetimeIndex(self.timestamps.view('datetime64[ns]'), name='Date').tz_localize('UTC')
+            self._index = index.tz_convert(self.tz) if self.tz else index
+        return self._index
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.arrays)
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.arrays
+
+    def __getitem__(self, name: str) -> pd.Series:
+        return pd.Series(self.arrays[name], index=self.index, name=name, copy=False)
+
+    def __setitem__(self, name: str, values) -> None:
+        self.arrays[name] = np.asarray(values)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Возвращает срез как pd.DataFrame (для функций, которым нужен именно DataFrame)."""
+        return pd.DataFrame({name: self.arrays[name] for name in self.arrays}, index=self.index)
+
+
+class HistoryStore:
+    """
+    Локальное хранилище истории OHLCV: для каждого тикера отдельные файлы фиксированного типа по колонкам и
+    отсортированный массив времени баров. Файлы отображаются в память (memory-mapped), поэтому открытие хранилища и
+    выборка диапазона дат (двоичный поиск по времени и срез без копирования) не зависят от объёма истории.
+
+    Parameters:
+        root (str): Каталог хранилища.
+    """
+
+    def __init__(self, root: str = '.history_store'):
+        self.root = root
+        self._maps: Dict[str, tuple] = {}
+        os.makedirs(root, exist_ok=True)
+
+    def _ticker_dir(self, ticker: str) -> str:
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9_.-]', '_', ticker.upper()))
+
+    def _read_meta(self, ticker: str) -> Optional[dict]:
+        path = os.path.join(self._ticker_dir(ticker), 'meta.json')
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def tickers(self) -> List[str]:
+        """Возвращает список тикеров в хранилище."""
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.exists(os.path.join(self.root, name, 'meta.json')))
+
+    def append(self, ticker: str, data: pd.DataFrame) -> int:
+        """
+        Дописывает в хранилище бары новее последнего сохранённого.
+
+        Parameters:
+            ticker (str): Тикер акции.
+            data (pd.DataFrame): Данные OHLCV с индексом по времени (как возвращает fetch_stock_data).
+
+        Returns:
+            int: Число дописанных баров.
+        """
+        index = pd.DatetimeIndex(data.index)
+        tz = str(index.tz) if index.tz is not None else None
+        timestamps = (index.tz_convert('UTC') if tz else index).as_unit('ns').asi8
+        order = np.argsort(timestamps, kind='stable')
+        timestamps = timestamps[order]
+
+        ticker_dir = self._ticker_dir(ticker)
+        meta = self._read_meta(ticker)
+        if meta is None:
+            meta = {'ticker': ticker.upper(), 'tz': tz, 'length': 0,
+                    'columns': [name for name in COLUMN_DTYPES if name in data.columns]}
+            os.makedirs(ticker_dir, exist_ok=True)
+        elif meta['length']:
+            last = self._arrays(ticker, meta)[0][-1]
+            keep = timestamps > last
+            order, timestamps = order[keep], timestamps[keep]
+        # Повторы времени внутри новой порции: остаётся первое значение
+        unique = np.concatenate(([True], timestamps[1:] != timestamps[:-1])) if len(timestamps) else []
+        order, timestamps = order[unique], timestamps[unique]
+        if not len(timestamps):
+            return 0
+
+        columns = {_TIMESTAMPS: timestamps}
+        for name in meta['columns']:
+            columns[name] = data[name].to_numpy()[order].astype(COLUMN_DTYPES[name])
+        for name, values in columns.items():
+            path = os.path.join(ticker_dir, f'{name}.bin')
+            with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+                # Данные после сохранённой длины (например, от прерванной записи) перезаписываются
+                f.seek(meta['length'] * values.dtype.itemsize)
+                f.write(np.ascontiguousarray(values).tobytes())
+                f.truncate()
+
+        meta['length'] += len(timestamps)
+        with open(os.path.join(ticker_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        self._maps.pop(ticker.upper(), None)
+        return len(timestamps)
+
+    def _arrays(self, ticker: str, meta: dict) -> tuple:
+        """Возвращает отображённые в память массивы тикера (время и колонки)."""
+        key = ticker.upper()
+        cached = self._maps.get(key)
+        if cached is not None and cached[2] == meta['length']:
+            return cached[0], cached[1]
+        ticker_dir = self._ticker_dir(ticker)
+        length = meta['length']
+
+        def open_map(name, dtype):
+            if length == 0:
+                return np.empty(0, dtype=dtype)
+            return np.memmap(os.path.join(ticker_dir, f'{name}.bin'), dtype=dtype, mode='r', shape=(length,))
+
+        timestamps = open_map(_TIMESTAMPS, np.int64)
+        columns = {name: open_map(name, COLUMN_DTYPES[name]) for name in meta['columns']}
+        self._maps[key] = (timestamps, columns, length)
+        return timestamps, columns
+
+    def query(self, ticker: str, start=None, end=None, columns: Optional[List[str]] = None) -> HistoryView:
+        """
+        Возвращает срез истории за диапазон [start, end) без копирования данных.
+
+        Parameters:
+            ticker (str): Тикер акции.
+            start (str | pd.Timestamp, optional): Начало диапазона. Дата без часового пояса трактуется в часовом
+                поясе исходных данных.
+            end (str | pd.Timestamp, optional): Конец диапазона (не включается).
+            columns (list, optional): Колонки среза. По умолчанию - все.
+
+        Returns:
+            HistoryView: Срез истории.
+        """
+        meta = self._read_meta(ticker)
+        if meta is None:
+            raise KeyError(f"Тикер {ticker} отсутствует в хранилище")
+        timestamps, arrays = self._arrays(ticker, meta)
+
+        def position(value, default):
+            if value is None:
+                return default
+            value = pd.Timestamp(value)
+            if value.tz is None:
+                value = value.tz_localize(meta['tz'] or 'UTC')
+            return int(np.searchsorted(timestamps, value.tz_convert('UTC').as_unit('ns').value, side='left'))
+
+        lo, hi = position(start, 0), position(end, len(timestamps))
+        names = columns or meta['columns']
+        return HistoryView(timestamps[lo:hi], {name: arrays[name][lo:hi] for name in names}, tz=meta['tz'])
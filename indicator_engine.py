@@ -0,0 +1,143 @@
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Порядок строк в общем выходном буфере
+_ROWS = ('Moving_Average', 'RSI', 'MACD', 'Signal_Line')
+
+
+def _close_array(data: Union[pd.DataFrame, pd.Series, np.ndarray]) -> np.ndarray:
+    """Возвращает цены закрытия как непрерывный массив float64 (без копирования, если это возможно)."""
+    if isinstance(data, pd.DataFrame):
+        data = data['Close']
+    if isinstance(data, pd.Series):
+        data = data.to_numpy(dtype=np.float64, copy=False)
+    return np.ascontiguousarray(data, dtype=np.float64)
+
+
+def _rolling_mean(values: np.ndarray, window: int, out: np.ndarray) -> np.ndarray:
+    """
+    Скользящее среднее с тем же поведением, что и Series.rolling(window).mean(): первые window-1 значений и окна,
+    содержащие NaN, дают NaN. Суммы окон считаются разностью накопленных сумм, число NaN в окне - разностью
+    накопленных счётчиков, поэтому время расчёта O(n) и не зависит от размера окна.
+    """
+    n = len(values)
+    out[:window - 1] = np.nan
+    if n < window:
+        return out
+    valid = ~np.isnan(values)
+    # Сдвиг на среднее уменьшает накопленные суммы и ошибку округления
+    offset = values[valid].mean() if valid.any() else 0.0
+    sums = np.zeros(n + 1)
+    np.cumsum(np.where(valid, values - offset, 0.0), out=sums[1:])
+    nan_counts = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(~valid, out=nan_counts[1:])
+    negative_counts = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(values < 0, out=negative_counts[1:])
+
+    result = out[window - 1:]
+    np.subtract(sums[window:], sums[:-window], out=result)
+    result /= window
+    result += offset
+    # Как и в pandas, отрицательное среднее окна без отрицательных значений (ошибка округления) обнуляется
+    np.maximum(result, 0, out=result, where=negative_counts[window:] == negative_counts[:-window])
+    result[nan_counts[window:] - nan_counts[:-window] > 0] = np.nan
+    return out
+
+
+def _ewm_mean(values: np.ndarray, span: int, out: np.ndarray) -> np.ndarray:
+    """Экспоненциальное среднее ewm(span, adjust=False), записанное в предвыделенный буфер."""
+    out[:] = pd.Series(values, copy=False).ewm(span=span, adjust=False).mean().to_numpy()
+    return out
+
+
+def compute_indicators(data: Union[pd.DataFrame, pd.Series, np.ndarray], ma_window: Optional[int] = 5,
+                       rsi_window: Optional[int] = 14, macd_windows: Optional[tuple] = (12, 26, 9),
+                       std: bool = True, average: bool = True) -> dict:
+    """
+    Рассчитывает набор индикаторов за один проход по ценам закрытия.
+
+    Колонка Close извлекается один раз как массив NumPy, все ряды индикаторов записываются в один заранее выделенный
+    буфер, промежуточные значения RSI - в общий рабочий буфер. Исходный DataFrame не изменяется и не копируется.
+    Результаты совпадают с add_moving_average, calculate_rsi, calculate_macd, calculate_standard_deviation и
+    calculate_and_display_average_price из data_download в пределах погрешности вычислений с плавающей точкой.
+
+    Parameters:
+        data (pd.DataFrame | pd.Series | np.ndarray): Данные о цене закрытия акций.
+        ma_window (int, optional): Окно скользящего среднего. None - не рассчитывать.
+        rsi_window (int, optional): Окно RSI. None - не рассчитывать.
+        macd_windows (tuple, optional): Короткое, длинное и сигнальное окна MACD. None - не рассчитывать.
+        std (bool): Рассчитывать ли стандартное отклонение цены закрытия.
+        average (bool): Рассчитывать ли среднюю цену закрытия.
+
+    Returns:
+        dict: Массивы 'Moving_Average', 'RSI', 'MACD', 'Signal_Line' и числа 'std', 'average' (только запрошенные).
+    """
+    close = _close_array(data)
+    n = len(close)
+    requested = [ma_window is not None, rsi_window is not None, macd_windows is not None, macd_windows is not None]
+    names = [name for name, needed in zip(_ROWS, requested) if needed]
+    rows = dict(zip(names, np.empty((len(names), n))))
+    scratch = np.empty((2, n)) if rsi_window is not None or std else None
+    result = {}
+
+    if average or std:
+        has_nan = bool(np.isnan(close).any())
+        mean = float(np.nanmean(close) if has_nan else close.mean()) if n else np.nan
+        if average:
+            result['average'] = mean
+        if std:
+            if has_nan:
+                result['std'] = float(np.nanstd(close, ddof=1)) if n - np.isnan(close).sum() > 1 else np.nan
+            elif n > 1:
+                # Та же двухпроходная формула, что и у Series.std(ddof=1), но во временном рабочем буфере
+                np.subtract(close, mean, out=scratch[0])
+                np.square(scratch[0], out=scratch[0])
+                result['std'] = float(np.sqrt(scratch[0].sum() / (n - 1)))
+            else:
+                result['std'] = np.nan
+
+    if ma_window is not None:
+        result['Moving_Average'] = _rolling_mean(close, ma_window, rows['Moving_Average'])
+
+    if rsi_window is not None:
+        # scratch[0] - рост цены, scratch[1] - падение; NaN в разности, как и в calculate_rsi, заменяется нулём
+        if n:
+            scratch[0, 0] = np.nan
+            np.subtract(close[1:], close[:-1], out=scratch[0, 1:])
+        np.negative(scratch[0], out=scratch[1])
+        np.fmax(scratch[0], 0, out=scratch[0])
+        np.fmax(scratch[1], 0, out=scratch[1])
+
+        rsi = _rolling_mean(scratch[0], rsi_window, rows['RSI'])
+        loss = _rolling_mean(scratch[1], rsi_window, scratch[0])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(rsi, loss, out=rsi)
+            np.add(rsi, 1, out=rsi)
+            np.divide(100, rsi, out=rsi)
+            np.subtract(100, rsi, out=rsi)
+        result['RSI'] = rsi
+
+    if macd_windows is not None:
+        short_window, long_window, signal_window = macd_windows
+        macd = _ewm_mean(close, short_window, rows['MACD'])
+        macd -= _ewm_mean(close, long_window, rows['Signal_Line'])
+        result['MACD'] = macd
+        result['Signal_Line'] = _ewm_mean(macd, signal_window, rows['Signal_Line'])
+    return result
+
+
+def indicators_to_frame(result: dict, index: pd.Index) -> pd.DataFrame:
+    """
+    Собирает ряды индикаторов из результата compute_indicators в DataFrame без копирования массивов.
+
+    Parameters:
+        result (dict): Результат compute_indicators.
+        index (pd.Index): Индекс исходных данных.
+
+    Returns:
+        pd.DataFrame: Колонки индикаторов с исходным индексом.
+    """
+    columns = {name: values for name, values in result.items() if isinstance(values, np.ndarray)}
+    return pd.DataFrame(columns, index=index, copy=False)
@@ -0,0 +1,279 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Ключ узла: (название, отсортированные параметры)
+NodeKey = Tuple[str, tuple]
+
+
+def node_key(name: str, **params) -> NodeKey:
+    """Ключ узла графа: название и параметры в порядке имён (для использования как ключа словаря)."""
+    return name, tuple(sorted(params.items()))
+
+
+@dataclass(frozen=True)
+class NodeSpec:
+    """
+    Описание узла графа индикаторов.
+
+    Attributes:
+        inputs (callable): По параметрам узла возвращает ключи входных узлов.
+        func (callable): По значениям входных узлов и параметрам рассчитывает значение узла.
+    """
+    inputs: Callable[..., list]
+    func: Callable
+
+
+NODES: Dict[str, NodeSpec] = {}
+
+
+def register_node(name: str, inputs: Callable[..., list] = lambda **params: []):
+    """
+    Декоратор, регистрирующий функцию расчёта узла графа.
+
+    Parameters:
+        name (str): Название узла.
+        inputs (callable): Функция параметров узла, возвращающая ключи входных узлов.
+    """
+    def decorator(func):
+        NODES[name] = NodeSpec(inputs, func)
+        return func
+    return decorator
+
+
+# Промежуточные узлы, общие для нескольких индикаторов
+
+@register_node('close')
+def _close(data):
+    # Копия, а не представление: значение в кэше не удерживает в памяти весь DataFrame вызывающего кода
+    return data['Close'].copy()
+
+
+@register_node('diff', inputs=lambda: [node_key('close')])
+def _diff(close):
+    return close.diff()
+
+
+@register_node('gain', inputs=lambda: [node_key('diff')])
+def _gain(delta):
+    return delta.where(delta > 0, 0)
+
+
+@register_node('loss', inputs=lambda: [node_key('diff')])
+def _loss(delta):
+    return -delta.where(delta < 0, 0)
+
+
+@register_node('rolling_mean', inputs=lambda source, window: [source])
+def _rolling_mean(values, source, window):
+    return values.rolling(window=window).mean()
+
+
+@register_node('ema', inputs=lambda source, span: [source])
+def _ema(values, source, span):
+    return values.ewm(span=span, adjust=False).mean()
+
+
+@register_node('mean', inputs=lambda: [node_key('close')])
+def _mean(close):
+    return close.mean()
+
+
+@register_node('max', inputs=lambda: [node_key('close')])
+def _max(close):
+    return close.max()
+
+
+@register_node('min', inputs=lambda: [node_key('close')])
+def _min(close):
+    return close.min()
+
+
+# Индикаторы data_download: названия совпадают с колонками, которые добавляют функции data_download
+
+@register_node('Moving_Average', inputs=lambda window: [node_key('rolling_mean', source=node_key('close'),
+                                                                 window=window)])
+def _moving_average(rolling_mean, window):
+    return rolling_mean
+
+
+@register_node('RSI', inputs=lambda window: [node_key('rolling_mean', source=node_key('gain'), window=window),
+                                             node_key('rolling_mean', source=node_key('loss'), window=window)])
+def _rsi(gain, loss, window):
+    return 100 - (100 / (1 + gain / loss))
+
+
+@register_node('MACD', inputs=lambda short, long: [node_key('ema', source=node_key('close'), span=short),
+                                                   node_key('ema', source=node_key('close'), span=long)])
+def _macd(short_ema, long_ema, short, long):
+    return short_ema - long_ema
+
+
+@register_node('Signal_Line', inputs=lambda short, long, signal: [
+    node_key('ema', source=node_key('MACD', short=short, long=long), span=signal)])
+def _signal_line(signal_ema, short, long, signal):
+    return signal_ema
+
+
+@register_node('average', inputs=lambda: [node_key('mean')])
+def _average(mean):
+    return mean
+
+
+@register_node('std', inputs=lambda: [node_key('close'), node_key('mean')])
+def _std(close, mean):
+    # Та же двухпроходная формула, что и у Series.std(ddof=1), но со средним из общего узла
+    count = close.count()
+    return float(np.sqrt(((close - mean) ** 2).sum() / (count - 1))) if count > 1 else np.nan
+
+
+@register_node('fluctuation', inputs=lambda: [node_key('max'), node_key('min')])
+def _fluctuation(max_price, min_price):
+    return (max_price - min_price) / min_price * 100
+
+
+def _nbytes(value) -> int:
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=False))
+    return 8
+
+
+class IndicatorGraph:
+    """
+    Граф индикаторов с общими промежуточными результатами и ограниченным LRU кэшем.
+
+    Каждый индикатор объявляет входные узлы и параметры (см. NODES), поэтому общие промежуточные ряды - разность цен,
+    экспоненциальные и скользящие средние - рассчитываются один раз для тикера, диапазона дат и параметров. Значения
+    всех узлов хранятся в кэше, поэтому при повторном расчёте с изменёнными параметрами пересчитываются только
+    затронутые узлы. При превышении лимита удаляются давно не использовавшиеся значения.
+
+    Данные тикера определяются по первой и последней дате, числу строк и хэшу всех цен закрытия: как обновлённый
+    последний бар, так и исправленные задним числом цены дают новый ключ, и значения для старой истории больше не
+    используются.
+
+    Parameters:
+        max_entries (int): Максимальное число значений в кэше.
+        max_bytes (int, optional): Максимальный объём рядов в кэше в байтах.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._cache: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _data_key(data: pd.DataFrame, ticker: str) -> tuple:
+        if data.empty:
+            return ticker.upper(), None, None, 0, None
+        # Хэш содержимого Close (вместе с датами): исправленные задним числом цены дают другой ключ
+        close_hash = int(pd.util.hash_pandas_object(data['Close']).to_numpy().sum())
+        return ticker.upper(), data.index[0], data.index[-1], len(data), close_hash
+
+    def _store(self, key: tuple, value) -> None:
+        self._cache[key] = value
+        self._bytes += _nbytes(value)
+        while len(self._cache) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes
+                                                      and len(self._cache) > 1):
+            _, evicted = self._cache.popitem(last=False)
+            self._bytes -= _nbytes(evicted)
+            self.evictions += 1
+
+    def _evaluate(self, data: pd.DataFrame, data_key: tuple, key: NodeKey, computed: dict):
+        if key in computed:
+            return computed[key]
+        cache_key = data_key + (key,)
+        if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+            self.hits += 1
+            value = self._cache[cache_key]
+        else:
+            self.misses += 1
+            name, params = key
+            spec = NODES[name]
+            params = dict(params)
+            inputs = spec.inputs(**params)
+            if inputs:
+                value = spec.func(*(self._evaluate(data, data_key, k, computed) for k in inputs), **params)
+            else:
+                value = spec.func(data, **params)
+            self._store(cache_key, value)
+        computed[key] = value
+        return value
+
+    def evaluate(self, data: pd.DataFrame, ticker: str, requests: Iterable[NodeKey]) -> dict:
+        """
+        Рассчитывает значения узлов графа, используя кэш и общие промежуточные результаты.
+
+        Parameters:
+            data (pd.DataFrame): Данные о цене закрытия акций.
+            ticker (str): Тикер акции (часть ключа кэша).
+            requests (iterable): Ключи узлов node_key(название, **параметры).
+
+        Returns:
+            dict: Ключ узла -> значение (pd.Series для рядов, число для статистик).
+        """
+        data_key = self._data_key(data, ticker)
+        computed = {}
+        return {key: self._evaluate(data, data_key, key, computed) for key in requests}
+
+    def apply(self, data: pd.DataFrame, ticker: str, ma_window: Optional[int] = 5, rsi_window: Optional[int] = 5,
+              macd_windows: Optional[tuple] = (12, 26, 9)) -> pd.DataFrame:
+        """
+        Добавляет в DataFrame колонки Moving_Average, RSI, MACD и Signal_Line, как add_moving_average, calculate_rsi и
+        calculate_macd из data_download.
+
+        Parameters:
+            data (pd.DataFrame): Данные о цене закрытия акций.
+            ticker (str): Тикер акции.
+            ma_window (int, optional): Окно скользящего среднего. None - не рассчитывать.
+            rsi_window (int, optional): Окно RSI. None - не рассчитывать.
+            macd_windows (tuple, optional): Короткое, длинное и сигнальное окна MACD. None - не рассчитывать.
+
+        Returns:
+            pd.DataFrame: Данные с добавленными колонками.
+        """
+        requests = {}
+        if ma_window is not None:
+            requests['Moving_Average'] = node_key('Moving_Average', window=ma_window)
+        if rsi_window is not None:
+            requests['RSI'] = node_key('RSI', window=rsi_window)
+        if macd_windows is not None:
+            short, long, signal = macd_windows
+            requests['MACD'] = node_key('MACD', short=short, long=long)
+            requests['Signal_Line'] = node_key('Signal_Line', short=short, long=long, signal=signal)
+        values = self.evaluate(data, ticker, requests.values())
+        for column, key in requests.items():
+            data[column] = values[key]
+        return data
+
+    def statistics(self, data: pd.DataFrame, ticker: str) -> dict:
+        """
+        Рассчитывает среднюю цену закрытия, стандартное отклонение и колебание цены в процентах за один проход по общим
+        узлам (как calculate_and_display_average_price, calculate_standard_deviation и
+        notify_if_strong_fluctuations).
+
+        Returns:
+            dict: 'average', 'std', 'fluctuation'.
+        """
+        names = ('average', 'std', 'fluctuation')
+        values = self.evaluate(data, ticker, [node_key(name) for name in names])
+        return {name: values[node_key(name)] for name in names}
+
+    def stats(self) -> dict:
+        """Возвращает статистику кэша: попадания, промахи, вытеснения, долю попаданий и объём рядов."""
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0, 'entries': len(self._cache),
+                'size_bytes': self._bytes}
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        self._cache.clear()
+        self._bytes = 0
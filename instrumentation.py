@@ -0,0 +1,169 @@
+import contextlib
+import cProfile
+import json
+import pstats
+import resource
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+
+@dataclass
+class StageMetrics:
+    """
+    Метрики одного этапа конвейера.
+
+    Attributes:
+        name (str): Название этапа.
+        wall_seconds (float): Время выполнения.
+        cpu_seconds (float): Процессорное время процесса за время этапа.
+        rows (int): Число обработанных строк или None.
+        peak_rss_mb (float): Пиковый объём памяти процесса после этапа, МБ.
+        peak_alloc_mb (float): Пиковый объём памяти, выделенной за время этапа (tracemalloc), МБ, или None.
+        error (str): Текст ошибки, если этап завершился исключением.
+    """
+    name: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rows: Optional[int] = None
+    peak_rss_mb: Optional[float] = None
+    peak_alloc_mb: Optional[float] = None
+    error: Optional[str] = None
+
+
+class _NullStage:
+    """Этап при выключенных метриках: ничего не измеряет, атрибуты (rows) принимаются и игнорируются."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+def _peak_rss_mb() -> float:
+    # В Linux ru_maxrss измеряется в килобайтах
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@dataclass
+class PipelineMetrics:
+    """
+    Сбор метрик по этапам конвейера: время, процессорное время, число строк и пиковая память.
+
+    Выключенный сборщик (enabled=False) возвращает из stage общий пустой контекст, поэтому обёртки этапов в коде
+    почти ничего не стоят. Замер выделенной памяти через tracemalloc (trace_memory=True) замедляет выполнение и
+    включается отдельно.
+
+    Attributes:
+        enabled (bool): Собирать метрики.
+        trace_memory (bool): Измерять пиковую выделенную память этапа через tracemalloc.
+        stages (list): Метрики завершённых этапов StageMetrics.
+        started_at (str): Время создания сборщика (начала запуска).
+    """
+    enabled: bool = True
+    trace_memory: bool = False
+    stages: List[StageMetrics] = field(default_factory=list)
+    started_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def stage(self, name: str, rows: Optional[int] = None):
+        """
+        Контекст замера этапа. Число строк можно передать сразу или задать внутри контекста:
+
+            with metrics.stage('fetch') as stage:
+                data = dd.fetch_stock_data(ticker, period)
+                stage.rows = len(data)
+
+        Parameters:
+            name (str): Название этапа.
+            rows (int, optional): Число обрабатываемых строк.
+
+        Returns:
+            Контекстный менеджер, возвращающий StageMetrics этапа.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._measure(name, rows)
+
+    @contextlib.contextmanager
+    def _measure(self, name: str, rows: Optional[int]):
+        record = StageMetrics(name, rows=rows)
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        except Exception as e:
+            record.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record.wall_seconds = time.perf_counter() - wall
+            record.cpu_seconds = time.process_time() - cpu
+            record.peak_rss_mb = _peak_rss_mb()
+            if self.trace_memory:
+                record.peak_alloc_mb = (tracemalloc.get_traced_memory()[1] - base) / 2 ** 20
+                if tracing:
+                    tracemalloc.stop()
+            self.stages.append(record)
+
+    def to_dict(self) -> dict:
+        """Возвращает метрики в виде словаря для JSON."""
+        return {'started_at': self.started_at,
+                'total_wall_seconds': sum(s.wall_seconds for s in self.stages),
+                'stages': [asdict(s) for s in self.stages]}
+
+    def write_json(self, path: str) -> None:
+        """
+        Сохраняет метрики в JSON файл.
+
+        Parameters:
+            path (str): Путь к файлу.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def summary(self) -> str:
+        """Возвращает таблицу метрик этапов для вывода в консоль."""
+        lines = [f"{'этап':<16}{'время, с':>10}{'CPU, с':>10}{'строк':>10}{'RSS, МБ':>10}"]
+        for s in self.stages:
+            rows = s.rows if s.rows is not None else '-'
+            lines.append(f"{s.name:<16}{s.wall_seconds:>10.3f}{s.cpu_seconds:>10.3f}{rows:>10}"
+                         f"{s.peak_rss_mb:>10.1f}")
+        return '\n'.join(lines)
+
+
+@contextlib.contextmanager
+def profiled(path: Optional[str] = None, sort: str = 'cumulative', limit: int = 20):
+    """
+    Профилирует блок кода через cProfile и сохраняет результат в файл (для просмотра через pstats или snakeviz).
+    Без пути к файлу ничего не делает.
+
+    Parameters:
+        path (str, optional): Файл для результатов профилирования.
+        sort (str): Порядок сортировки для краткой сводки.
+        limit (int): Число функций в краткой сводке.
+    """
+    if not path:
+        yield None
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"Профиль сохранён в {path}")
+        pstats.Stats(profiler).sort_stats(sort).print_stats(limit)
@@ -1,13 +1,27 @@
+import argparse
+import os
+import time
+
+import pandas as pd
+
+import batch_analysis as ba
+import chunked_ingest as ci
 import data_download as dd
+import data_export as de
 import data_plotting as dplt
 import logging
+from compact_frames import CompactFrame, expand_frame
+from dashboard_export import export_dashboard
+from data_cache import StockDataCache
+from instrumentation import PipelineMetrics, profiled
 
 # Настройка логирования
 logging.basicConfig(filename='stock_analysis.log', level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
 
-def main():
+def main(metrics: PipelineMetrics = None):
+    metrics = metrics or PipelineMetrics(enabled=False)
     print("Добро пожаловать в инструмент получения и построения графиков биржевых данных.")
     print(
         "Вот несколько примеров биржевых тикеров, которые вы можете рассмотреть: AAPL (Apple Inc), GOOGL (Alphabet "
@@ -40,51 +54,262 @@ def main():
         end_date = input("Введите дату окончания анализа в формате 'ГГГГ-ММ-ДД' (например, '2022-12-31'): ")
         logging.info(f"Выбраны конкретные даты для анализа: {start_date} - {end_date}")
 
+    run_analysis(ticker, period, start_date, end_date, metrics=metrics, ask_style=True)
+
+
+def run_analysis(ticker: str, period: str, start_date: str = None, end_date: str = None, style: str = None,
+                 metrics: PipelineMetrics = None, headless: bool = False, show: bool = True,
+                 cache: StockDataCache = None, ask_style: bool = False) -> None:
+    """
+    Загружает данные тикера, рассчитывает индикаторы, экспортирует данные в CSV и строит графики.
+
+    Parameters:
+        ticker (str): Тикер акции.
+        period (str): Период данных.
+        start_date (str, optional): Дата начала анализа (если период не указан).
+        end_date (str, optional): Дата окончания анализа.
+        style (str, optional): Стиль графика.
+        metrics (PipelineMetrics, optional): Сборщик метрик этапов.
+        headless (bool): Не строить графики (matplotlib и plotly не загружаются).
+        show (bool): Открывать интерактивный график в браузере.
+        cache (StockDataCache, optional): Локальный кэш данных (--cache-dir).
+        ask_style (bool): Запросить стиль графика у пользователя перед построением графиков (интерактивный режим).
+    """
+    metrics = metrics or PipelineMetrics(enabled=False)
+
     # Получение данных о биржевой акции
-    stock_data = dd.fetch_stock_data(ticker, period, start=start_date, end=end_date)
+    with metrics.stage('fetch') as stage:
+        stock_data = dd.fetch_stock_data(ticker, period, start=start_date, end=end_date, cache=cache)
+        stage.rows = len(stock_data) if stock_data is not None else 0
+    if cache is not None:
+        logging.info(f"Кэш данных: {cache.stats()}")
 
     if stock_data is not None:
+        rows = len(stock_data)
+
         # Добавление скользящего среднего к данным
-        stock_data = dd.add_moving_average(stock_data)
+        with metrics.stage('moving_average', rows):
+            stock_data = dd.add_moving_average(stock_data)
         logging.info("Данные об акции успешно получены.")
 
         # Отображение средней цены закрытия акции за указанный период
-        dd.calculate_and_display_average_price(stock_data, ticker)
+        with metrics.stage('average_price', rows):
+            dd.calculate_and_display_average_price(stock_data, ticker)
         logging.info(f"Отображена средняя цена закрытия акции за указанный период период.")
 
         # Вызов функции для расчета стандартного отклонения
-        std_deviation = dd.calculate_standard_deviation(stock_data)
+        with metrics.stage('std_deviation', rows):
+            std_deviation = dd.calculate_standard_deviation(stock_data)
         logging.info("Рассчитано стандартное отклонение.")
 
         # Отображение уведомления, если колебания превышают заданный порог
-        dd.notify_if_strong_fluctuations(stock_data, ticker)
+        with metrics.stage('fluctuations', rows):
+            dd.notify_if_strong_fluctuations(stock_data, ticker)
         logging.info("Проверка на колебания завершена.")
 
         # Экспорт данных в файл CSV
         filename = f'{ticker}_{period if period else f"{start_date}_to_{end_date}"}_stock_data.csv'
-        dd.export_data_to_csv(stock_data, filename)
+        with metrics.stage('export_csv', rows):
+            dd.export_data_to_csv(stock_data, filename)
         logging.info(f"Данные экспортированы в файл: {filename}")
 
         # Расчет и построение графиков данных, скользящего среднего, RSI, MACD
-        stock_data_with_indicators = dd.calculate_rsi(stock_data, window_size=5)
-        stock_data_with_indicators = dd.calculate_macd(stock_data_with_indicators, short_window=12, long_window=26,
-                                                       signal_window=9)
+        with metrics.stage('rsi_macd', rows):
+            stock_data_with_indicators = dd.calculate_rsi(stock_data, window_size=5)
+            stock_data_with_indicators = dd.calculate_macd(stock_data_with_indicators, short_window=12,
+                                                           long_window=26, signal_window=9)
         logging.info("Рассчитаны RSI и MACD.")
 
-        # Запрос выбора стиля графика
-        style = input("По желанию введите стиль графика (например, 'classic', 'ggplot', 'bmh', 'fivethirtyeight'): ")
+        if headless:
+            logging.info("Режим без графиков: построение графиков пропущено.")
+            return
 
-        dplt.create_and_save_plot(stock_data_with_indicators, ticker, period, start_date, end_date, std_deviation,
-                                  style=style)
+        if ask_style:
+            # Запрос выбора стиля графика
+            style = input(
+                "По желанию введите стиль графика (например, 'classic', 'ggplot', 'bmh', 'fivethirtyeight'): ")
+
+        with metrics.stage('plot_png', rows):
+            dplt.create_and_save_plot(stock_data_with_indicators, ticker, period, start_date, end_date,
+                                      std_deviation, style=style)
         logging.info("Создан и сохранен график с индикаторами.")
 
-        dplt.create_and_show_plot(stock_data_with_indicators, ticker, std_deviation)
-        logging.info("В браузере выведен интерактивный график с индикаторами.")
+        with metrics.stage('plot_html', rows):
+            dplt.create_and_show_plot(stock_data_with_indicators, ticker, std_deviation, show=show)
+        logging.info("В браузере выведен интерактивный график с индикаторами." if show
+                     else "Интерактивный график с индикаторами сохранён в HTML файл.")
 
     else:
         logging.error("Данные об акциях не были получены. Проверьте введенные данные и повторите попытку.")
         print("Данные об акциях не были получены. Пожалуйста, проверьте введенные данные и повторите попытку.")
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Анализ и визуализация биржевых данных. Без аргументов запускается "
+                                                 "интерактивный режим.")
+    parser.add_argument('--ticker', help="Тикер для анализа без запросов ввода (загрузка, индикаторы, CSV, графики).")
+    parser.add_argument('--style', help="Стиль графика для --ticker.")
+    parser.add_argument('--headless', action='store_true',
+                        help="Не строить графики (для запуска по расписанию): только данные и CSV.")
+    parser.add_argument('--no-show', action='store_true', help="Сохранять HTML график без открытия браузера.")
+    parser.add_argument('--tickers', nargs='+', help="Список тикеров для пакетной обработки.")
+    parser.add_argument('--tickers-file', help="Файл со списком тикеров для пакетной обработки.")
+    parser.add_argument('--period', default='1mo', help="Период данных (по умолчанию '1mo').")
+    parser.add_argument('--start', help="Дата начала анализа в формате 'ГГГГ-ММ-ДД'.")
+    parser.add_argument('--end', help="Дата окончания анализа в формате 'ГГГГ-ММ-ДД'.")
+    parser.add_argument('--workers', type=int, default=8, help="Число одновременных загрузок.")
+    parser.add_argument('--cache-dir', help="Каталог локального кэша данных.")
+    parser.add_argument('--output-dir', help="Каталог для экспорта данных по каждому тикеру.")
+    parser.add_argument('--format', choices=de.FORMATS, default='csv', help="Формат экспорта (по умолчанию csv).")
+    parser.add_argument('--append', action='store_true', help="Дописывать только новые строки к уже сохранённым.")
+    parser.add_argument('--compact', action='store_true',
+                        help="Хранить данные тикеров в узких типах (float32, дивиденды и сплиты отдельно) для "
+                             "экономии памяти в пакетном режиме.")
+    parser.add_argument('--dashboard', help="Каталог панели интерактивных графиков для пакетного режима (index.html, "
+                                            "общий plotly.min.js и данные тикеров, загружаемые по выбору).")
+    parser.add_argument('--metrics', help="JSON файл для метрик этапов (время, CPU, строки, память).")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Измерять пиковую выделенную память этапов через tracemalloc (замедляет выполнение).")
+    parser.add_argument('--profile', help="Файл для результатов профилирования cProfile.")
+    parser.add_argument('--ingest', help="Файл внутридневных баров (CSV, Parquet, Feather) для потоковой загрузки со "
+                                         "сменой разрешения; имя тикера - --ticker или имя файла.")
+    parser.add_argument('--resample', default='1D', help="Разрешение баров для --ingest (1D, 1h, ...).")
+    parser.add_argument('--chunk-size', type=int, default=500_000, help="Число строк в части файла для --ingest.")
+    parser.add_argument('--serve', action='store_true',
+                        help="Запустить локальный HTTP сервис (данные, индикаторы и графики по запросу).")
+    parser.add_argument('--host', default='127.0.0.1', help="Адрес сервиса (по умолчанию 127.0.0.1).")
+    parser.add_argument('--port', type=int, default=8000, help="Порт сервиса (по умолчанию 8000).")
+    parser.add_argument('--cache-ttl', type=float, default=300.0,
+                        help="Время жизни ответов сервиса в кэше в секундах (по умолчанию 300).")
+    return parser.parse_args(argv)
+
+
+def run_ingest(args: argparse.Namespace, metrics: PipelineMetrics = None) -> pd.DataFrame:
+    """
+    Анализ файла внутридневных баров, который не помещается в память: файл читается частями и переводится в бары
+    разрешения --resample с индикаторами, далее - те же средняя цена, стандартное отклонение, проверка колебаний,
+    экспорт и графики, что и в run_analysis.
+    """
+    metrics = metrics or PipelineMetrics(enabled=False)
+    ticker = (args.ticker or os.path.splitext(os.path.basename(args.ingest.rstrip(os.sep)))[0]).upper()
+    with metrics.stage('ingest') as stage:
+        data, stats = ci.ingest_file(args.ingest, rule=args.resample, chunk_size=args.chunk_size)
+        stage.rows = stats.rows
+    print(f"Прочитано строк: {stats.rows} ({stats.chunks} частей) за {stats.seconds:.2f} с, "
+          f"{stats.rows_per_second:,.0f} строк/с; баров {args.resample}: {stats.bars}")
+    logging.info(f"{args.ingest}: {stats}")
+    if data.empty:
+        print("Файл не содержит данных.")
+        return data
+
+    rows = len(data)
+    with metrics.stage('average_price', rows):
+        dd.calculate_and_display_average_price(data, ticker)
+    with metrics.stage('std_deviation', rows):
+        std_deviation = dd.calculate_standard_deviation(data)
+    with metrics.stage('fluctuations', rows):
+        dd.notify_if_strong_fluctuations(data, ticker)
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        extension = {'csv': '.csv', 'feather': '.feather', 'parquet': ''}[args.format]
+        path = os.path.join(args.output_dir, f'{ticker}_{args.resample}_bars{extension}')
+        with metrics.stage('export', rows):
+            de.export_data(data, path, fmt=args.format, append=args.append)
+    else:
+        with metrics.stage('export_csv', rows):
+            dd.export_data_to_csv(data, f'{ticker}_{args.resample}_bars.csv')
+
+    if not args.headless:
+        with metrics.stage('plot_png', rows):
+            dplt.create_and_save_plot(data, ticker, args.resample, None, None, std_deviation, style=args.style,
+                                      downsample='lttb')
+        with metrics.stage('plot_html', rows):
+            dplt.create_and_show_plot(data, ticker, std_deviation, downsample='lttb', show=not args.no_show)
+    return data
+
+
+def export_result(result: ba.TickerResult, args: argparse.Namespace, period: str) -> None:
+    """Экспортирует данные тикера в каталог --output-dir в выбранном формате."""
+    os.makedirs(args.output_dir, exist_ok=True)
+    if result.actions is not None:
+        # Файлы совпадают с экспортом без --compact: типы колонок восстанавливаются до float64 и int64
+        data = expand_frame(CompactFrame(result.data, result.actions), float_dtype='float64', int_dtype='int64')
+        result = ba.TickerResult(result.ticker, data=data, elapsed=result.elapsed)
+    if args.format == 'csv' and not args.append:
+        suffix = period if period else f"{args.start}_to_{args.end}"
+        dd.export_data_to_csv(result.data, os.path.join(args.output_dir, f'{result.ticker}_{suffix}_stock_data.csv'))
+        return
+    extension = {'csv': '.csv', 'feather': '.feather', 'parquet': ''}[args.format]
+    path = os.path.join(args.output_dir, f'{result.ticker}_stock_data{extension}')
+    rows = de.export_data(result.data, path, fmt=args.format, append=args.append)
+    logging.info(f"{result.ticker}: записано строк в {path}: {rows}")
+
+
+def run_batch(args: argparse.Namespace, metrics: PipelineMetrics = None) -> list:
+    """
+    Пакетный (неинтерактивный) режим: параллельно обрабатывает список тикеров и выводит время обработки каждого
+    тикера и общую пропускную способность.
+    """
+    metrics = metrics or PipelineMetrics(enabled=False)
+    tickers = list(args.tickers or [])
+    if args.tickers_file:
+        tickers.extend(ba.read_tickers_file(args.tickers_file))
+    period = '' if args.start else args.period
+    cache = StockDataCache(args.cache_dir) if args.cache_dir else None
+    logging.info(f"Пакетная обработка {len(tickers)} тикеров, период: {period or f'{args.start} - {args.end}'}")
+
+    started = time.perf_counter()
+    with metrics.stage('batch_analysis') as stage:
+        results = ba.analyze_batch(tickers, period, start=args.start, end=args.end, max_workers=args.workers,
+                                   cache=cache, compact=args.compact)
+        stage.rows = sum(len(result.data) for result in results if result.ok)
+    summary = ba.summarize_batch(results, time.perf_counter() - started)
+
+    for result in results:
+        if result.ok:
+            print(f"{result.ticker}: {len(result.data)} строк, {result.elapsed:.3f} с")
+            logging.info(f"{result.ticker}: обработано {len(result.data)} строк за {result.elapsed:.3f} с")
+            if args.output_dir:
+                with metrics.stage(f'export_{result.ticker}', len(result.data)):
+                    export_result(result, args, period)
+        else:
+            print(f"{result.ticker}: ошибка ({result.error}), {result.elapsed:.3f} с")
+            logging.error(f"{result.ticker}: {result.error}")
+
+    if args.dashboard:
+        frames = {result.ticker: result.data for result in results if result.ok}
+        with metrics.stage('dashboard', sum(len(data) for data in frames.values())):
+            dashboard = export_dashboard(frames, args.dashboard, downsample='lttb')
+        print(f"Панель графиков: {dashboard.path} ({dashboard.files} файлов, "
+              f"{dashboard.bytes_written / 2 ** 20:.1f} МБ, {dashboard.seconds:.2f} с)")
+        logging.info(f"Панель графиков сохранена в {dashboard.path}")
+
+    print(f"\nОбработано тикеров: {summary['succeeded']} из {summary['tickers']} за {summary['wall_time']:.2f} с "
+          f"({summary['tickers_per_second']:.1f} тикеров/с)")
+    logging.info(f"Пакетная обработка завершена: {summary}")
+    return results
+
+
 if __name__ == "__main__":
-    main()
+    cli_args = parse_args()
+    pipeline_metrics = PipelineMetrics(enabled=bool(cli_args.metrics), trace_memory=cli_args.trace_memory)
+    with profiled(cli_args.profile):
+        if cli_args.serve:
+            import service
+            service.serve(cli_args.host, cli_args.port, ttl=cli_args.cache_ttl)
+        elif cli_args.ingest:
+            run_ingest(cli_args, pipeline_metrics)
+        elif cli_args.ticker:
+            run_analysis(cli_args.ticker.upper(), '' if cli_args.start else cli_args.period, cli_args.start,
+                         cli_args.end, style=cli_args.style, metrics=pipeline_metrics, headless=cli_args.headless,
+                         show=not cli_args.no_show,
+                         cache=StockDataCache(cli_args.cache_dir) if cli_args.cache_dir else None)
+        elif cli_args.tickers or cli_args.tickers_file:
+            run_batch(cli_args, pipeline_metrics)
+        else:
+            main(pipeline_metrics)
+    if cli_args.metrics:
+        pipeline_metrics.write_json(cli_args.metrics)
+        print(pipeline_metrics.summary())
+        logging.info(f"Метрики этапов сохранены в {cli_args.metrics}")
@@ -0,0 +1,232 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class PanelResult:
+    """
+    Значения индикатора для панели (параметр x дата x тикер).
+
+    Attributes:
+        name (str): Название индикатора.
+        values (np.ndarray): Массив формы (число наборов параметров, число дат, число тикеров).
+        params (list): Наборы параметров в порядке первой оси.
+        dates (pd.Index): Даты (вторая ось).
+        tickers (pd.Index): Тикеры (третья ось).
+    """
+    name: str
+    values: np.ndarray
+    params: list
+    dates: pd.Index
+    tickers: pd.Index
+
+    def sel(self, param) -> pd.DataFrame:
+        """Возвращает значения для одного набора параметров как DataFrame (даты x тикеры)."""
+        return pd.DataFrame(self.values[self.params.index(param)], index=self.dates, columns=self.tickers)
+
+    def to_tidy(self, dropna: bool = True) -> pd.DataFrame:
+        """Возвращает результат в длинном формате: колонки Date, Ticker, Params и значение индикатора."""
+        k, n, m = self.values.shape
+        params = np.empty(k, dtype=object)
+        for i, param in enumerate(self.params):
+            params[i] = param
+        tidy = pd.DataFrame({
+            'Date': np.tile(np.repeat(self.dates.to_numpy(), m), k),
+            'Ticker': np.tile(self.tickers.to_numpy(), k * n),
+            'Params': np.repeat(params, n * m),
+            self.name: self.values.reshape(-1),
+        })
+        return tidy.dropna(subset=[self.name]).reset_index(drop=True) if dropna else tidy
+
+
+def make_panel(frames: Dict[str, pd.DataFrame], column: str = 'Close') -> pd.DataFrame:
+    """
+    Собирает панель цен (даты x тикеры) из словаря DataFrame отдельных тикеров. Даты объединяются, поэтому тикеры
+    с более поздним началом истории или пропусками получают NaN.
+
+    Parameters:
+        frames (dict): Словарь тикер -> DataFrame, как возвращает fetch_stock_data.
+        column (str): Колонка с ценой.
+
+    Returns:
+        pd.DataFrame: Панель цен.
+    """
+    return pd.DataFrame({ticker: frame[column] for ticker, frame in frames.items()}).sort_index()
+
+
+def _as_array(panel: pd.DataFrame) -> np.ndarray:
+    return np.ascontiguousarray(panel.to_numpy(dtype=np.float64))
+
+
+def _rolling_mean(values: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """
+    Скользящее среднее для всех окон сразу: (n, m) -> (k, n, m). Окна считаются через накопленные суммы,
+    окна с NaN или неполные окна дают NaN, как и rolling(window).mean().
+    """
+    n, m = values.shape
+    windows = np.asarray(windows, dtype=np.int64)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    # Сдвиг на среднее по тикеру уменьшает накопленные суммы и ошибку округления
+    counts = valid.sum(axis=0)
+    offset = filled.sum(axis=0) / np.maximum(counts, 1)
+    sums = np.zeros((n + 1, m))
+    np.cumsum(np.where(valid, filled - offset, 0.0), axis=0, out=sums[1:])
+    nan_counts = np.zeros((n + 1, m), dtype=np.int64)
+    np.cumsum(~valid, axis=0, out=nan_counts[1:])
+
+    ends = np.arange(1, n + 1)
+    starts = ends[None, :] - windows[:, None]
+    complete = starts >= 0
+    starts = np.maximum(starts, 0)
+
+    result = sums[ends][None] - sums[starts]
+    result /= windows[:, None, None]
+    result += offset
+    has_nan = nan_counts[ends][None] - nan_counts[starts] > 0
+    result[has_nan | ~complete[:, :, None]] = np.nan
+    return result
+
+
+def _rolling_mean_nonnegative(values: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """Скользящее среднее неотрицательного ряда без пропусков (рост/падение цены для RSI)."""
+    n, m = values.shape
+    windows = np.asarray(windows, dtype=np.int64)
+    sums = np.zeros((n + 1, m))
+    np.cumsum(values, axis=0, out=sums[1:])
+    ends = np.arange(1, n + 1)
+    starts = ends[None, :] - windows[:, None]
+    complete = starts >= 0
+    result = sums[ends][None] - sums[np.maximum(starts, 0)]
+    # Как и в pandas, отрицательный результат из-за округления для неотрицательных данных обнуляется
+    np.maximum(result, 0, out=result)
+    result /= windows[:, None, None]
+    result[~complete] = np.nan
+    return result
+
+
+def _ewm(values: np.ndarray, spans: Sequence[int]) -> np.ndarray:
+    """
+    Экспоненциальное среднее ewm(span, adjust=False) для каждого span: (n, m) или (k, n, m) -> (k, n, m).
+    Рекурсия идёт по датам, а на каждом шаге векторизована по всем тикерам и параметрам; обработка пропусков
+    повторяет pandas (ignore_na=False).
+    """
+    spans = np.asarray(spans, dtype=np.float64)
+    k = len(spans)
+    values = np.broadcast_to(values if values.ndim == 3 else values[None], (k,) + values.shape[-2:])
+    alpha = (2 / (spans + 1))[:, None]
+    decay = 1 - alpha
+    n = values.shape[1]
+    out = np.empty(values.shape)
+    if n == 0:
+        return out
+
+    weighted = values[:, 0].copy()
+    old_wt = np.ones_like(weighted)
+    out[:, 0] = weighted
+    for i in range(1, n):
+        cur = values[:, i]
+        observed = ~np.isnan(cur)
+        started = ~np.isnan(weighted)
+        old_wt = np.where(started, old_wt * decay, old_wt)
+        update = started & observed & (weighted != cur)
+        blended = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+        weighted = np.where(update, blended, weighted)
+        weighted = np.where(~started & observed, cur, weighted)
+        old_wt = np.where(observed, 1.0, old_wt)
+        out[:, i] = weighted
+    return out
+
+
+def panel_moving_average(panel: pd.DataFrame, windows: Iterable[int] = (5,)) -> PanelResult:
+    """
+    Скользящее среднее для панели цен и набора окон (аналог add_moving_average).
+
+    Parameters:
+        panel (pd.DataFrame): Панель цен (даты x тикеры).
+        windows (iterable): Размеры окон.
+
+    Returns:
+        PanelResult: Значения формы (окна, даты, тикеры).
+    """
+    windows = list(windows)
+    return PanelResult('Moving_Average', _rolling_mean(_as_array(panel), windows), windows, panel.index,
+                       panel.columns)
+
+
+def panel_rsi(panel: pd.DataFrame, windows: Iterable[int] = (14,)) -> PanelResult:
+    """
+    RSI для панели цен и набора окон (аналог calculate_rsi, включая замену NaN в изменении цены нулём). Для тикеров
+    с более поздним началом истории значения совпадают с calculate_rsi по собственной истории тикера.
+
+    Parameters:
+        panel (pd.DataFrame): Панель цен (даты x тикеры).
+        windows (iterable): Размеры окон.
+
+    Returns:
+        PanelResult: Значения формы (окна, даты, тикеры).
+    """
+    windows = list(windows)
+    values = _as_array(panel)
+    delta = np.full_like(values, np.nan)
+    delta[1:] = values[1:] - values[:-1]
+    gain = _rolling_mean_nonnegative(np.fmax(delta, 0), windows)
+    loss = _rolling_mean_nonnegative(np.fmax(-delta, 0), windows)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + gain / loss))
+    # NaN до начала истории тикера - не пропуск, а отсутствие данных: как и calculate_rsi по собственной истории
+    # тикера, первые window-1 значений после первой цены равны NaN
+    valid = ~np.isnan(values)
+    first = np.where(valid.any(axis=0), valid.argmax(axis=0), len(values))
+    rows = np.arange(len(values))[:, None]
+    for i, window in enumerate(windows):
+        rsi[i][rows < first + window - 1] = np.nan
+    return PanelResult('RSI', rsi, windows, panel.index, panel.columns)
+
+
+def panel_macd(panel: pd.DataFrame, params: Iterable[tuple] = ((12, 26, 9),)) -> List[PanelResult]:
+    """
+    MACD и сигнальная линия для панели цен и набора параметров (аналог calculate_macd).
+
+    Parameters:
+        panel (pd.DataFrame): Панель цен (даты x тикеры).
+        params (iterable): Наборы (короткое окно, длинное окно, сигнальное окно).
+
+    Returns:
+        list: PanelResult для MACD и для Signal_Line, значения формы (параметры, даты, тикеры).
+    """
+    params = [tuple(p) for p in params]
+    values = _as_array(panel)
+    spans = sorted({span for short, long, _ in params for span in (short, long)})
+    emas = dict(zip(spans, _ewm(values, spans)))
+    macd = np.stack([emas[short] - emas[long] for short, long, _ in params])
+    signal = _ewm(macd, [signal for _, _, signal in params])
+    return [PanelResult('MACD', macd, params, panel.index, panel.columns),
+            PanelResult('Signal_Line', signal, params, panel.index, panel.columns)]
+
+
+def compute_panel_indicators(panel: pd.DataFrame, ma_windows: Iterable[int] = (5,),
+                             rsi_windows: Iterable[int] = (5,),
+                             macd_params: Iterable[tuple] = ((12, 26, 9),)) -> Dict[str, PanelResult]:
+    """
+    Рассчитывает скользящее среднее, RSI и MACD для всей панели и сетки параметров.
+
+    Parameters:
+        panel (pd.DataFrame): Панель цен (даты x тикеры).
+        ma_windows (iterable): Окна скользящего среднего.
+        rsi_windows (iterable): Окна RSI.
+        macd_params (iterable): Наборы параметров MACD.
+
+    Returns:
+        dict: Название индикатора -> PanelResult.
+    """
+    macd, signal = panel_macd(panel, macd_params)
+    return {
+        'Moving_Average': panel_moving_average(panel, ma_windows),
+        'RSI': panel_rsi(panel, rsi_windows),
+        'MACD': macd,
+        'Signal_Line': signal,
+    }
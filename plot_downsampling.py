@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+METHODS = ('lttb', 'minmax')
+
+
+def _x_values(index: pd.Index) -> np.ndarray:
+    """Числовые координаты по оси X: наносекунды для дат, иначе значения индекса."""
+    if isinstance(index, pd.DatetimeIndex):
+        return index.as_unit('ns').asi8.astype(np.float64)
+    return np.asarray(index, dtype=np.float64)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Выбирает n_out точек ряда алгоритмом Largest-Triangle-Three-Buckets: в каждой корзине остаётся точка,
+    образующая треугольник наибольшей площади с выбранной точкой предыдущей корзины и средним следующей.
+    Первая и последняя точки сохраняются всегда.
+
+    Parameters:
+        x (np.ndarray): Координаты по оси X (возрастающие).
+        y (np.ndarray): Значения ряда без пропусков.
+        n_out (int): Число точек в результате.
+
+    Returns:
+        np.ndarray: Отсортированные индексы выбранных точек.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean()
+        next_y = y[stop:next_stop].mean()
+        areas = np.abs((x[previous] - next_x) * (y[start:stop] - y[previous])
+                       - (x[previous] - x[start:stop]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Делит ряд на n_out / 2 корзин и оставляет в каждой минимум и максимум, сохраняя все экстремумы на графике.
+
+    Parameters:
+        y (np.ndarray): Значения ряда без пропусков.
+        n_out (int): Число точек в результате.
+
+    Returns:
+        np.ndarray: Отсортированные индексы выбранных точек.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(np.int64)
+    selected = np.empty((len(edges) - 1, 2), dtype=np.int64)
+    for i in range(len(edges) - 1):
+        bucket = y[edges[i]:edges[i + 1]]
+        selected[i] = edges[i] + np.argmin(bucket), edges[i] + np.argmax(bucket)
+    return np.unique(selected)
+
+
+def point_budget(pixel_width: int, method: str = 'lttb') -> int:
+    """
+    Число точек, достаточное для отображения ряда на заданной ширине графика: по одной точке на пиксель для LTTB и по
+    две (минимум и максимум) для min/max.
+
+    Parameters:
+        pixel_width (int): Ширина области графика в пикселях.
+        method (str): 'lttb' или 'minmax'.
+
+    Returns:
+        int: Число точек.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный метод прореживания: {method}")
+    return int(pixel_width) * (2 if method == 'minmax' else 1)
+
+
+def downsample_series(series: pd.Series, n_out: int, method: str = 'lttb') -> pd.Series:
+    """
+    Прореживает ряд до n_out точек с сохранением формы графика. Пропуски (NaN) отбрасываются.
+
+    Parameters:
+        series (pd.Series): Ряд с индексом по датам.
+        n_out (int): Число точек в результате.
+        method (str): 'lttb' или 'minmax'.
+
+    Returns:
+        pd.Series: Прореженный ряд.
+    """
+    series = series.dropna()
+    y = series.to_numpy(dtype=np.float64)
+    if method == 'lttb':
+        indices = lttb_indices(_x_values(series.index), y, n_out)
+    elif method == 'minmax':
+        indices = minmax_indices(y, n_out)
+    else:
+        raise ValueError(f"Неизвестный метод прореживания: {method}")
+    return series.iloc[indices]
@@ -0,0 +1,303 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+import data_download as dd
+import data_plotting as dplt
+from indicator_graph import IndicatorGraph
+
+
+class SharedCache:
+    """
+    Потокобезопасный кэш ответов с вытеснением давно не использовавшихся значений (LRU) и временем жизни.
+
+    Одновременные запросы с одинаковым ключом вычисляют значение один раз: остальные потоки ждут результат первого.
+
+    Parameters:
+        max_entries (int): Максимальное число значений. 0 - кэш выключен.
+        ttl (float, optional): Время жизни значения в секундах. None - без ограничения.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute: Callable):
+        """
+        Возвращает значение из кэша или вычисляет его функцией compute. Ошибки compute не кэшируются.
+
+        Parameters:
+            key: Ключ значения.
+            compute (callable): Функция без аргументов, вычисляющая значение.
+
+        Returns:
+            Значение.
+        """
+        if self.max_entries <= 0:
+            with self._lock:
+                self.misses += 1
+            return compute()
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and (self.ttl is None or time.monotonic() - entry[1] < self.ttl):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Значение уже вычисляется в другом потоке
+            pending.wait()
+        try:
+            value = compute()
+            with self._lock:
+                self._entries[key] = (value, time.monotonic())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            return value
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+
+    def stats(self) -> dict:
+        """Возвращает статистику кэша: попадания, промахи, вытеснения, долю попаданий и число значений."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'hit_rate': self.hits / lookups if lookups else 0.0, 'entries': len(self._entries)}
+
+
+class ServiceError(Exception):
+    """Ошибка запроса с HTTP кодом ответа."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def default_provider(ticker: str, period: str, start: Optional[str] = None,
+                     end: Optional[str] = None) -> pd.DataFrame:
+    """Загрузка данных из Yahoo Finance (download_stock_data)."""
+    return dd.download_stock_data(ticker, period, start=start, end=end)
+
+
+class StockService:
+    """
+    Логика сервиса: загрузка данных, расчёт индикаторов и построение графиков с общим кэшем ответов.
+
+    Parameters:
+        provider (callable, optional): Функция (ticker, period, start, end) -> pd.DataFrame. По умолчанию - Yahoo
+            Finance.
+        cache_entries (int): Размер кэша ответов.
+        ttl (float, optional): Время жизни ответов и данных в кэше в секундах.
+    """
+
+    def __init__(self, provider: Optional[Callable] = None, cache_entries: int = 256, ttl: Optional[float] = 300.0):
+        self.provider = provider or default_provider
+        self.data_cache = SharedCache(cache_entries, ttl)
+        self.response_cache = SharedCache(cache_entries, ttl)
+        self.graph = IndicatorGraph()
+        self._graph_lock = threading.Lock()
+        # matplotlib не потокобезопасен: PNG строятся по очереди в переиспользуемых шаблонах (по одному на стиль)
+        self._render_lock = threading.Lock()
+        self._templates = {}
+
+    @staticmethod
+    def _range(params: dict) -> tuple:
+        ticker = params.get('ticker', '').strip().upper()
+        if not ticker:
+            raise ServiceError(400, "Не указан тикер (параметр ticker)")
+        start, end = params.get('start'), params.get('end')
+        period = '' if start else params.get('period', '1mo')
+        return ticker, period, start, end
+
+    def load(self, ticker: str, period: str, start: Optional[str], end: Optional[str]) -> pd.DataFrame:
+        """Данные тикера из кэша или от источника данных."""
+        def fetch():
+            try:
+                data = self.provider(ticker, period, start, end)
+            except Exception as e:
+                raise ServiceError(502, f"Ошибка при получении данных для тикера {ticker}: {e}") from e
+            if data is None or data.empty:
+                raise ServiceError(404, f"Нет данных для тикера {ticker}")
+            return data
+
+        return self.data_cache.get_or_compute((ticker, period, start, end), fetch)
+
+    def indicators(self, params: dict) -> tuple:
+        """Данные с колонками Moving_Average, RSI, MACD, Signal_Line и стандартное отклонение цены закрытия."""
+        ticker, period, start, end = self._range(params)
+        try:
+            ma_window = int(params.get('ma', 5))
+            rsi_window = int(params.get('rsi', 5))
+            macd_windows = tuple(int(value) for value in params.get('macd', '12,26,9').split(','))
+            if len(macd_windows) != 3 or min(ma_window, rsi_window, *macd_windows) < 1:
+                raise ValueError
+        except ValueError:
+            raise ServiceError(400, "Параметры ma, rsi - целые числа, macd - три целых числа через запятую")
+        data = self.load(ticker, period, start, end)
+        with self._graph_lock:
+            frame = self.graph.apply(data[['Close']].copy(), ticker, ma_window, rsi_window, macd_windows)
+            std_deviation = self.graph.statistics(data, ticker)['std']
+        return frame, std_deviation
+
+    def handle(self, path: str, params: dict) -> tuple:
+        """
+        Обрабатывает запрос к сервису.
+
+        Parameters:
+            path (str): Путь запроса.
+            params (dict): Параметры запроса.
+
+        Returns:
+            tuple: Тип содержимого и тело ответа (bytes).
+        """
+        if path == '/health':
+            return 'application/json', b'{"status": "ok"}'
+        if path == '/stats':
+            body = {'data_cache': self.data_cache.stats(), 'response_cache': self.response_cache.stats(),
+                    'indicator_graph': self.graph.stats()}
+            return 'application/json', json.dumps(body).encode()
+        if path == '/plotly.min.js':
+            return self.response_cache.get_or_compute(('/plotly.min.js',), self._plotlyjs)
+        if path not in ('/data', '/indicators', '/chart.png', '/chart.html'):
+            raise ServiceError(404, f"Неизвестный путь {path}")
+        key = (path,) + tuple(sorted((name, value) for name, value in params.items()))
+        return self.response_cache.get_or_compute(key, lambda: self._render(path, params))
+
+    @staticmethod
+    def _plotlyjs() -> tuple:
+        from plotly.offline import get_plotlyjs
+        return 'application/javascript', get_plotlyjs().encode()
+
+    def _render(self, path: str, params: dict) -> tuple:
+        if path == '/data':
+            ticker, period, start, end = self._range(params)
+            data = self.load(ticker, period, start, end)
+            return 'application/json', data.to_json(orient='split', date_format='iso').encode()
+
+        frame, std_deviation = self.indicators(params)
+        if path == '/indicators':
+            body = json.loads(frame.to_json(orient='split', date_format='iso'))
+            body['std'] = std_deviation
+            body['average'] = float(frame['Close'].mean())
+            return 'application/json', json.dumps(body).encode()
+
+        ticker = params['ticker'].strip().upper()
+        downsample = params.get('downsample')
+        if downsample not in (None, 'lttb', 'minmax'):
+            raise ServiceError(400, "Параметр downsample: lttb или minmax")
+        if path == '/chart.png':
+            style = params.get('style') or None
+            with self._render_lock:
+                if style not in self._templates:
+                    with dplt._style_context(style):
+                        self._templates[style] = dplt.build_static_figure()
+                png = dplt.render_static_png(frame, ticker, std_deviation, style=style, downsample=downsample,
+                                             template=self._templates[style])
+            return 'image/png', png
+        # directory - страница ссылается на /plotly.min.js сервиса, и браузер кэширует библиотеку между графиками
+        include_plotlyjs = {'cdn': 'cdn', 'directory': 'directory', 'inline': True}.get(params.get('plotlyjs', 'cdn'))
+        if include_plotlyjs is None:
+            raise ServiceError(400, "Параметр plotlyjs: cdn, directory или inline")
+        html = dplt.render_interactive_html(frame, ticker, std_deviation, downsample=downsample,
+                                            include_plotlyjs=include_plotlyjs)
+        return 'text/html; charset=utf-8', html.encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: StockService = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            content_type, body = self.service.handle(url.path, params)
+            status = 200
+        except ServiceError as e:
+            status, content_type = e.status, 'application/json'
+            body = json.dumps({'error': str(e)}, ensure_ascii=False).encode()
+        except Exception as e:
+            logging.exception(f"Ошибка при обработке запроса {self.path}")
+            status, content_type = 500, 'application/json'
+            body = json.dumps({'error': f"{type(e).__name__}: {e}"}, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.info(f"{self.address_string()} {format % args}")
+
+
+def make_server(host: str = '127.0.0.1', port: int = 8000, service: Optional[StockService] = None,
+                **service_params) -> ThreadingHTTPServer:
+    """
+    Создаёт HTTP сервер (по потоку на запрос). Эндпоинты:
+        /data?ticker=AAPL&period=1mo - данные (или start=...&end=... вместо period);
+        /indicators?ticker=AAPL&ma=5&rsi=5&macd=12,26,9 - индикаторы, стандартное отклонение и средняя цена;
+        /chart.png?ticker=AAPL&style=ggplot&downsample=lttb - статический график;
+        /chart.html?ticker=AAPL&plotlyjs=directory - интерактивный график (plotly.js: cdn, directory или inline);
+        /plotly.min.js - библиотека plotly.js для графиков с plotlyjs=directory;
+        /stats - статистика кэшей; /health - проверка работы.
+
+    Вся работа обработчиков блокирующая: синхронная загрузка yfinance (requests), расчёты pandas и отрисовка
+    matplotlib. Асинхронный фреймворк из requirements.txt (FastAPI/Starlette под uvicorn) выполнял бы такие
+    обработчики в пуле потоков, то есть по той же модели "поток на запрос", но с отдельным ASGI сервером и
+    переходами между циклом событий и потоками. ThreadingHTTPServer даёт эту модель напрямую, а общий кэш ответов
+    и блокировки StockService работают одинаково в обоих случаях.
+
+    Parameters:
+        host (str): Адрес.
+        port (int): Порт (0 - выбрать свободный).
+        service (StockService, optional): Логика сервиса. По умолчанию создаётся с параметрами service_params.
+        **service_params: Параметры StockService.
+
+    Returns:
+        ThreadingHTTPServer: Сервер; запуск - serve_forever().
+    """
+    handler = type('StockServiceHandler', (_Handler,), {'service': service or StockService(**service_params)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(host: str = '127.0.0.1', port: int = 8000, **service_params) -> None:
+    """
+    Запускает сервис и обрабатывает запросы до прерывания (Ctrl+C).
+
+    Parameters:
+        host (str): Адрес.
+        port (int): Порт.
+        **service_params: Параметры StockService.
+    """
+    server = make_server(host, port, **service_params)
+    print(f"Сервис запущен: http://{host}:{server.server_address[1]}/ (Ctrl+C - остановка)")
+    logging.info(f"Сервис запущен на {host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("Сервис остановлен.")
@@ -0,0 +1,389 @@
+import json
+import math
+from collections import deque
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _close_values(data) -> np.ndarray:
+    if isinstance(data, pd.DataFrame):
+        data = data['Close']
+    return np.asarray(data, dtype=np.float64)
+
+
+class _WindowSum:
+    """
+    Окно последних значений с суммой, которая обновляется за O(1) при добавлении и вытеснении значения.
+    Сумма ведётся с компенсацией ошибки округления (алгоритм Ноймайера), NaN в окне учитываются счётчиком. Как и в
+    pandas, окно из одинаковых значений даёт точную сумму (например, нулевую для окна без изменений цены).
+
+    Parameters:
+        size (int): Размер окна.
+    """
+
+    def __init__(self, size: int, values: Iterable[float] = ()):
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+        self.compensation = 0.0
+        self.nan_count = 0
+        self.last = math.nan
+        self.same_count = 0
+        for value in values:
+            self.push(value)
+
+    def _add(self, x: float) -> None:
+        total = self.total + x
+        if abs(self.total) >= abs(x):
+            self.compensation += (self.total - total) + x
+        else:
+            self.compensation += (x - total) + self.total
+        self.total = total
+
+    def push(self, x: float) -> None:
+        """Добавляет значение; при заполненном окне самое старое значение вытесняется."""
+        if len(self.values) == self.values.maxlen:
+            old = self.values[0]
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                self._add(-old)
+        self.values.append(x)
+        self.same_count = self.same_count + 1 if x == self.last else 1
+        self.last = x
+        if math.isnan(x):
+            self.nan_count += 1
+        else:
+            self._add(x)
+
+    def full(self) -> bool:
+        return len(self.values) == self.values.maxlen
+
+    def sum(self) -> float:
+        if self.same_count >= len(self.values):
+            return self.last * len(self.values)
+        return self.total + self.compensation
+
+
+class MovingAverageStream:
+    """
+    Скользящее среднее с обновлением за O(1) на каждый новый бар: сумма окна и число NaN в нём обновляются при
+    добавлении и вытеснении значения. Совпадает с add_moving_average: пока окно не заполнено или содержит NaN,
+    значение равно NaN.
+
+    Parameters:
+        window_size (int): Размер окна для вычисления скользящего среднего.
+    """
+
+    def __init__(self, window_size: int = 5):
+        self.window_size = window_size
+        self.window = _WindowSum(window_size)
+        self.value = math.nan
+
+    def update(self, close: float) -> float:
+        """Добавляет цену закрытия нового бара и возвращает текущее значение скользящего среднего."""
+        self.window.push(float(close))
+        if not self.window.full() or self.window.nan_count:
+            self.value = math.nan
+        else:
+            self.value = self.window.sum() / self.window_size
+        return self.value
+
+    def update_many(self, closes: Iterable[float]) -> np.ndarray:
+        """Добавляет несколько баров и возвращает значения индикатора для каждого из них."""
+        return np.array([self.update(close) for close in closes], dtype=np.float64)
+
+    @classmethod
+    def from_history(cls, data, window_size: int = 5) -> 'MovingAverageStream':
+        """Инициализирует индикатор по истории цен: состояние определяется последними window_size барами."""
+        stream = cls(window_size)
+        stream.update_many(_close_values(data)[-window_size:])
+        return stream
+
+    def state(self) -> dict:
+        return {'window_size': self.window_size, 'window': list(self.window.values), 'value': self.value}
+
+    @classmethod
+    def from_state(cls, state: dict) -> 'MovingAverageStream':
+        stream = cls(state['window_size'])
+        stream.window = _WindowSum(stream.window_size, state['window'])
+        stream.value = state['value']
+        return stream
+
+
+class RSIStream:
+    """
+    RSI (Relative Strength Index) с обновлением за O(1) на каждый новый бар: суммы роста и падения цены в окне
+    обновляются при добавлении и вытеснении значения.
+    Совпадает с calculate_rsi: изменение цены с пропуском (NaN) считается нулевым.
+
+    Parameters:
+        window_size (int): Размер окна для вычисления RSI.
+    """
+
+    def __init__(self, window_size: int = 14):
+        self.window_size = window_size
+        self.gains = _WindowSum(window_size)
+        self.losses = _WindowSum(window_size)
+        self.prev_close = None
+        self.value = math.nan
+
+    def update(self, close: float) -> float:
+        """Добавляет цену закрытия нового бара и возвращает текущее значение RSI."""
+        close = float(close)
+        delta = math.nan if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        self.gains.push(delta if delta > 0 else 0.0)
+        self.losses.push(-delta if delta < 0 else 0.0)
+
+        if not self.gains.full():
+            self.value = math.nan
+            return self.value
+        # Как и в pandas, отрицательная сумма неотрицательных значений (ошибка округления) считается нулевой
+        gain = max(self.gains.sum(), 0.0) / self.window_size
+        loss = max(self.losses.sum(), 0.0) / self.window_size
+        if loss == 0:
+            self.value = math.nan if gain == 0 else 100.0
+        else:
+            self.value = 100 - (100 / (1 + gain / loss))
+        return self.value
+
+    def update_many(self, closes: Iterable[float]) -> np.ndarray:
+        """Добавляет несколько баров и возвращает значения индикатора для каждого из них."""
+        return np.array([self.update(close) for close in closes], dtype=np.float64)
+
+    @classmethod
+    def from_history(cls, data, window_size: int = 14) -> 'RSIStream':
+        """Инициализирует индикатор по истории цен: состояние определяется последними window_size + 1 барами."""
+        stream = cls(window_size)
+        closes = _close_values(data)
+        if len(closes) > window_size:
+            # Первый бар хвоста задаёт только предыдущую цену, его нулевое изменение вытесняется из окна
+            stream.prev_close = float(closes[-window_size - 1])
+            closes = closes[-window_size:]
+        stream.update_many(closes)
+        return stream
+
+    def state(self) -> dict:
+        return {'window_size': self.window_size, 'gains': list(self.gains.values),
+                'losses': list(self.losses.values), 'prev_close': self.prev_close, 'value': self.value}
+
+    @classmethod
+    def from_state(cls, state: dict) -> 'RSIStream':
+        stream = cls(state['window_size'])
+        stream.gains = _WindowSum(stream.window_size, state['gains'])
+        stream.losses = _WindowSum(stream.window_size, state['losses'])
+        stream.prev_close = state['prev_close']
+        stream.value = state['value']
+        return stream
+
+
+class EWMStream:
+    """
+    Экспоненциальное среднее ewm(span, adjust=False) с обновлением за O(1), повторяющее рекурсию pandas, включая
+    обработку пропусков (NaN).
+
+    Parameters:
+        span (int): Период экспоненциального среднего.
+    """
+
+    def __init__(self, span: int):
+        self.span = span
+        self.alpha = 2 / (span + 1)
+        self.value = math.nan
+        self.old_wt = 1.0
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        if math.isnan(self.value):
+            if not math.isnan(x):
+                self.value = x
+                self.old_wt = 1.0
+            return self.value
+        self.old_wt *= 1 - self.alpha
+        if not math.isnan(x):
+            if self.value != x:
+                self.value = (self.old_wt * self.value + self.alpha * x) / (self.old_wt + self.alpha)
+            self.old_wt = 1.0
+        return self.value
+
+    @classmethod
+    def from_history(cls, values, span: int) -> 'EWMStream':
+        """Инициализирует среднее по истории векторизованным расчётом pandas."""
+        stream = cls(span)
+        values = np.asarray(values, dtype=np.float64)
+        observed = np.flatnonzero(~np.isnan(values))
+        if len(observed):
+            stream.value = float(pd.Series(values).ewm(span=span, adjust=False).mean().iloc[-1])
+            # Каждый пропуск после последнего наблюдения уменьшает вес накопленного значения
+            stream.old_wt = (1 - stream.alpha) ** (len(values) - 1 - observed[-1])
+        return stream
+
+    def state(self) -> dict:
+        return {'span': self.span, 'value': self.value, 'old_wt': self.old_wt}
+
+    @classmethod
+    def from_state(cls, state: dict) -> 'EWMStream':
+        stream = cls(state['span'])
+        stream.value = state['value']
+        stream.old_wt = state['old_wt']
+        return stream
+
+
+class MACDStream:
+    """
+    MACD и сигнальная линия с обновлением за O(1) на каждый новый бар. Совпадает с calculate_macd.
+
+    Parameters:
+        short_window (int): Короткое окно для вычисления EMA.
+        long_window (int): Длинное окно для вычисления EMA.
+        signal_window (int): Окно для вычисления линии сигнала.
+    """
+
+    def __init__(self, short_window: int = 12, long_window: int = 26, signal_window: int = 9):
+        self.short_ema = EWMStream(short_window)
+        self.long_ema = EWMStream(long_window)
+        self.signal_ema = EWMStream(signal_window)
+        self.macd = math.nan
+        self.signal = math.nan
+
+    def update(self, close: float) -> tuple:
+        """Добавляет цену закрытия нового бара и возвращает текущие значения (MACD, сигнальная линия)."""
+        self.macd = self.short_ema.update(close) - self.long_ema.update(close)
+        self.signal = self.signal_ema.update(self.macd)
+        return self.macd, self.signal
+
+    def update_many(self, closes: Iterable[float]) -> np.ndarray:
+        """Добавляет несколько баров и возвращает массив формы (n, 2) со значениями MACD и сигнальной линии."""
+        return np.array([self.update(close) for close in closes], dtype=np.float64).reshape(-1, 2)
+
+    @classmethod
+    def from_history(cls, data, short_window: int = 12, long_window: int = 26,
+                     signal_window: int = 9) -> 'MACDStream':
+        """Инициализирует индикатор по истории цен векторизованным расчётом."""
+        closes = _close_values(data)
+        stream = cls(short_window, long_window, signal_window)
+        stream.short_ema = EWMStream.from_history(closes, short_window)
+        stream.long_ema = EWMStream.from_history(closes, long_window)
+        closes = pd.Series(closes)
+        macd = (closes.ewm(span=short_window, adjust=False).mean()
+                - closes.ewm(span=long_window, adjust=False).mean()).to_numpy()
+        stream.signal_ema = EWMStream.from_history(macd, signal_window)
+        if len(macd):
+            stream.macd = float(macd[-1])
+            stream.signal = stream.signal_ema.value
+        return stream
+
+    def state(self) -> dict:
+        return {'short_ema': self.short_ema.state(), 'long_ema': self.long_ema.state(),
+                'signal_ema': self.signal_ema.state(), 'macd': self.macd, 'signal': self.signal}
+
+    @classmethod
+    def from_state(cls, state: dict) -> 'MACDStream':
+        stream = cls()
+        stream.short_ema = EWMStream.from_state(state['short_ema'])
+        stream.long_ema = EWMStream.from_state(state['long_ema'])
+        stream.signal_ema = EWMStream.from_state(state['signal_ema'])
+        stream.macd = state['macd']
+        stream.signal = state['signal']
+        return stream
+
+
+class IndicatorStream:
+    """
+    Набор потоковых индикаторов, которые main.py рассчитывает для тикера: скользящее среднее, RSI и MACD.
+    Состояние можно сохранить в JSON и восстановить в другом процессе.
+
+    Parameters:
+        ma_window (int): Размер окна скользящего среднего.
+        rsi_window (int): Размер окна RSI.
+        macd_windows (tuple): Короткое, длинное и сигнальное окна MACD.
+    """
+
+    def __init__(self, ma_window: int = 5, rsi_window: int = 5, macd_windows: tuple = (12, 26, 9)):
+        self.moving_average = MovingAverageStream(ma_window)
+        self.rsi = RSIStream(rsi_window)
+        self.macd = MACDStream(*macd_windows)
+        self.last_timestamp: Optional[pd.Timestamp] = None
+
+    def _values(self) -> dict:
+        return {'Moving_Average': self.moving_average.value, 'RSI': self.rsi.value,
+                'MACD': self.macd.macd, 'Signal_Line': self.macd.signal}
+
+    def update(self, close: float, timestamp=None) -> dict:
+        """
+        Добавляет цену закрытия нового бара.
+
+        Parameters:
+            close (float): Цена закрытия бара.
+            timestamp (optional): Время бара. Бары не новее последнего обработанного пропускаются.
+
+        Returns:
+            dict: Текущие значения 'Moving_Average', 'RSI', 'MACD', 'Signal_Line'.
+        """
+        if timestamp is not None:
+            timestamp = pd.Timestamp(timestamp)
+            if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+                return self._values()
+            self.last_timestamp = timestamp
+        self.moving_average.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        return self._values()
+
+    def update_frame(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Добавляет новые бары из DataFrame (колонка Close) и возвращает значения индикаторов для каждого из них.
+        Бары, уже учтённые ранее (по времени индекса), пропускаются.
+        """
+        rows = []
+        index = []
+        for timestamp, close in data['Close'].items():
+            if self.last_timestamp is not None and pd.Timestamp(timestamp) <= self.last_timestamp:
+                continue
+            rows.append(self.update(close, timestamp))
+            index.append(timestamp)
+        return pd.DataFrame(rows, index=pd.Index(index, name=data.index.name),
+                            columns=['Moving_Average', 'RSI', 'MACD', 'Signal_Line'])
+
+    @classmethod
+    def from_history(cls, data: pd.DataFrame, ma_window: int = 5, rsi_window: int = 5,
+                     macd_windows: tuple = (12, 26, 9)) -> 'IndicatorStream':
+        """Инициализирует индикаторы по истории цен (DataFrame с колонкой Close)."""
+        stream = cls(ma_window, rsi_window, macd_windows)
+        stream.moving_average = MovingAverageStream.from_history(data, ma_window)
+        stream.rsi = RSIStream.from_history(data, rsi_window)
+        stream.macd = MACDStream.from_history(data, *macd_windows)
+        if isinstance(data.index, pd.DatetimeIndex) and len(data):
+            stream.last_timestamp = data.index[-1]
+        return stream
+
+    def state(self) -> dict:
+        return {
+            'moving_average': self.moving_average.state(),
+            'rsi': self.rsi.state(),
+            'macd': self.macd.state(),
+            'last_timestamp': None if self.last_timestamp is None else self.last_timestamp.isoformat(),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> 'IndicatorStream':
+        stream = cls()
+        stream.moving_average = MovingAverageStream.from_state(state['moving_average'])
+        stream.rsi = RSIStream.from_state(state['rsi'])
+        stream.macd = MACDStream.from_state(state['macd'])
+        if state['last_timestamp'] is not None:
+            stream.last_timestamp = pd.Timestamp(state['last_timestamp'])
+        return stream
+
+    def save(self, filename: str) -> None:
+        """Сохраняет состояние индикаторов в JSON файл (контрольная точка)."""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.state(), f)
+
+    @classmethod
+    def load(cls, filename: str) -> 'IndicatorStream':
+        """Восстанавливает индикаторы из контрольной точки."""
+        with open(filename, encoding='utf-8') as f:
+            return cls.from_state(json.load(f))
@@ -0,0 +1,141 @@
+import asyncio
+import sys
+import time
+import types
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from async_fetch import AsyncStockFetcher, TokenBucket, TransientFetchError, YFinanceProvider, fetch_batch, \
+    is_transient_error
+
+
+class FakeProvider:
+    """Источник данных с задержкой ответа и заданным числом временных ошибок по тикерам."""
+
+    def __init__(self, latency=0.05, failures=None, error=TransientFetchError):
+        self.latency = latency
+        self.failures = dict(failures or {})
+        self.error = error
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def history(self, ticker, period, start=None, end=None, interval='1d'):
+        self.calls.append((ticker, time.monotonic()))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if self.failures.get(ticker, 0) > 0:
+                self.failures[ticker] -= 1
+                raise self.error(f"временная ошибка {ticker}")
+            return pd.DataFrame({'Close': [1.0, 2.0]}, index=pd.date_range('2024-01-01', periods=2, name='Date'))
+        finally:
+            self.in_flight -= 1
+
+
+class TestAsyncStockFetcher(unittest.TestCase):
+
+    def test_concurrent_throughput(self):
+        provider = FakeProvider(latency=0.05)
+        fetcher = AsyncStockFetcher(provider, concurrency=100)
+        tickers = [f'T{i}' for i in range(300)]
+        started = time.perf_counter()
+        results = asyncio.run(fetcher.fetch_many(tickers, '1mo'))
+        elapsed = time.perf_counter() - started
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual([result.ticker for result in results], tickers)
+        # Последовательно 300 * 0.05 = 15 с, при 100 одновременных запросах - около 0.15 с
+        self.assertLess(elapsed, 1.5)
+        self.assertGreater(len(tickers) / elapsed, 200)
+        self.assertEqual(provider.max_in_flight, 100)
+
+    def test_concurrency_limit(self):
+        provider = FakeProvider(latency=0.01)
+        asyncio.run(AsyncStockFetcher(provider, concurrency=5).fetch_many([f'T{i}' for i in range(40)], '1mo'))
+        self.assertEqual(provider.max_in_flight, 5)
+
+    def test_rate_limit(self):
+        provider = FakeProvider(latency=0)
+        fetcher = AsyncStockFetcher(provider, concurrency=50, rate=100, burst=10)
+        started = time.perf_counter()
+        asyncio.run(fetcher.fetch_many([f'T{i}' for i in range(60)], '1mo'))
+        # 10 запросов сразу, остальные 50 - со скоростью 100 в секунду
+        self.assertGreaterEqual(time.perf_counter() - started, 0.45)
+
+    def test_retries_with_backoff(self):
+        provider = FakeProvider(latency=0, failures={'AAPL': 2})
+        fetcher = AsyncStockFetcher(provider, retries=3, backoff=0.05, jitter=False)
+        started = time.perf_counter()
+        data = asyncio.run(fetcher.fetch('AAPL', '1mo'))
+        self.assertEqual(len(data), 2)
+        # Задержки 0.05 и 0.1 с
+        self.assertGreaterEqual(time.perf_counter() - started, 0.15)
+        self.assertEqual(fetcher.stats(), {'requests': 3, 'retries': 2, 'failures': 0})
+
+    def test_retries_exhausted_and_permanent_errors(self):
+        provider = FakeProvider(latency=0, failures={'AAPL': 5, 'MSFT': 1})
+        fetcher = AsyncStockFetcher(provider, retries=2, backoff=0.001)
+        results = asyncio.run(fetcher.fetch_many(['AAPL', 'MSFT', 'GOOGL'], '1mo'))
+        self.assertEqual([result.ok for result in results], [False, True, True])
+        self.assertIn('TransientFetchError', results[0].error)
+        self.assertEqual(sum(ticker == 'AAPL' for ticker, _ in provider.calls), 3)
+
+        provider = FakeProvider(latency=0, failures={'AAPL': 1}, error=KeyError)
+        fetcher = AsyncStockFetcher(provider, retries=3, backoff=0.001)
+        with self.assertRaises(KeyError):
+            asyncio.run(fetcher.fetch('AAPL', '1mo'))
+        self.assertEqual(fetcher.stats()['requests'], 1)
+
+    def test_token_bucket(self):
+        async def take(bucket, n):
+            for _ in range(n):
+                await bucket.acquire()
+
+        bucket = TokenBucket(rate=50, capacity=5)
+        started = time.perf_counter()
+        asyncio.run(take(bucket, 15))
+        self.assertGreaterEqual(time.perf_counter() - started, 0.18)
+
+    def test_yfinance_provider_returns_download_shape(self):
+        expected = pd.read_csv('AAPL_3mo_stock_data.csv', index_col=0)
+        with patch('data_download.yf.Ticker') as mock_ticker:
+            mock_ticker.return_value.history.return_value = expected
+            results = fetch_batch(['AAPL'], '3mo', provider=YFinanceProvider(max_workers=2))
+        pd.testing.assert_frame_equal(results[0].data, expected)
+        mock_ticker.return_value.history.assert_called_once_with(period='3mo', interval='1d', raise_errors=True)
+
+    def test_yfinance_errors_are_retried(self):
+        expected = pd.read_csv('AAPL_3mo_stock_data.csv', index_col=0)
+        # С raise_errors=True yfinance пробрасывает сетевую ошибку, а не возвращает пустые данные
+        with patch('data_download.yf.Ticker') as mock_ticker:
+            history = mock_ticker.return_value.history
+            history.side_effect = [ConnectionResetError("соединение разорвано"), expected]
+            fetcher = AsyncStockFetcher(YFinanceProvider(max_workers=2), backoff=0.01, jitter=False)
+            try:
+                results = asyncio.run(fetcher.fetch_many(['AAPL'], '3mo'))
+            finally:
+                fetcher.close()
+        self.assertTrue(results[0].ok, results[0].error)
+        pd.testing.assert_frame_equal(results[0].data, expected)
+        self.assertEqual(history.call_count, 2)
+        self.assertEqual(fetcher.stats()['retries'], 1)
+
+    def test_transient_errors_with_any_yfinance_version(self):
+        class YFRateLimitError(Exception):
+            pass
+
+        # В yfinance 0.2.37 нет YFRateLimitError, в новых версиях он есть в yfinance.exceptions
+        old = types.SimpleNamespace(exceptions=types.SimpleNamespace())
+        new = types.SimpleNamespace(exceptions=types.SimpleNamespace(YFRateLimitError=YFRateLimitError))
+        for module, rate_limited in ((old, False), (new, True)):
+            with patch.dict(sys.modules, {'yfinance': module}):
+                self.assertTrue(is_transient_error(ConnectionError()))
+                self.assertFalse(is_transient_error(ValueError()))
+                self.assertEqual(is_transient_error(YFRateLimitError()), rate_limited)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from batch_analysis import analyze_batch, read_tickers_file, summarize_batch
+
+
+class FakeTicker:
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def __init__(self, ticker, *args, **kwargs):
+        self.ticker = ticker
+
+    def history(self, *args, **kwargs):
+        with FakeTicker.lock:
+            FakeTicker.active += 1
+            FakeTicker.max_active = max(FakeTicker.max_active, FakeTicker.active)
+        try:
+            time.sleep(0.02)
+            if self.ticker == 'FAIL':
+                raise ConnectionError('connection reset')
+            if self.ticker == 'EMPTY':
+                return pd.DataFrame()
+            return pd.DataFrame({'Close': [float(i) for i in range(1, 41)]},
+                                index=pd.date_range('2024-01-01', periods=40))
+        finally:
+            with FakeTicker.lock:
+                FakeTicker.active -= 1
+
+
+class TestBatchAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        FakeTicker.active = 0
+        FakeTicker.max_active = 0
+
+    @patch('data_download.yf.Ticker', FakeTicker)
+    def test_analyze_batch_isolates_failures(self):
+        results = analyze_batch(['AAPL', 'FAIL', 'EMPTY', 'MSFT'], '1mo', max_workers=4)
+
+        self.assertEqual([r.ticker for r in results], ['AAPL', 'FAIL', 'EMPTY', 'MSFT'])
+        self.assertEqual([r.ok for r in results], [True, False, False, True])
+        self.assertIn('connection reset', results[1].error)
+        for column in ('Moving_Average', 'RSI', 'MACD', 'Signal_Line'):
+            self.assertIn(column, results[0].data.columns)
+
+    @patch('data_download.yf.Ticker', FakeTicker)
+    def test_worker_pool_is_bounded(self):
+        analyze_batch([f'T{i}' for i in range(12)], '1mo', max_workers=3)
+        self.assertLessEqual(FakeTicker.max_active, 3)
+        self.assertGreater(FakeTicker.max_active, 1)
+
+    def test_read_tickers_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'tickers.txt')
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write('aapl, msft\n# комментарий\nGOOGL AAPL\n')
+            self.assertEqual(read_tickers_file(filename), ['AAPL', 'MSFT', 'GOOGL'])
+
+    @patch('data_download.yf.Ticker', FakeTicker)
+    def test_summarize_batch(self):
+        results = analyze_batch(['AAPL', 'FAIL'], '1mo', max_workers=2)
+        summary = summarize_batch(results, 2.0)
+        self.assertEqual(summary['succeeded'], 1)
+        self.assertEqual(summary['failed'], 1)
+        self.assertEqual(summary['tickers_per_second'], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.image as mpimg
+import numpy as np
+import pandas as pd
+
+from batch_plotting import ChartJob, render_charts_batch
+from data_download import add_moving_average, calculate_rsi, calculate_macd
+from data_plotting import create_and_save_plot
+
+
+def make_data(seed, n=120):
+    rng = np.random.default_rng(seed)
+    close = 100 * (seed + 1) + np.cumsum(rng.normal(0, 1, n))
+    data = pd.DataFrame({'Close': close}, index=pd.bdate_range('2024-01-02', periods=n, tz='America/New_York'))
+    return calculate_macd(calculate_rsi(add_moving_average(data), 5))
+
+
+class TestBatchPlotting(unittest.TestCase):
+
+    @patch('builtins.print')
+    def test_batch_output_matches_single_chart(self, mocked_print):
+        with tempfile.TemporaryDirectory() as tmp:
+            jobs = [ChartJob(ticker, make_data(i), 2.0 + i, os.path.join(tmp, f'{ticker}.png'))
+                    for i, ticker in enumerate(['AAPL', 'MSFT', 'GOOGL'])]
+            results = render_charts_batch(jobs, workers=1)
+
+            self.assertEqual([r.ticker for r in results], ['AAPL', 'MSFT', 'GOOGL'])
+            self.assertTrue(all(r.error is None and r.seconds > 0 and r.peak_rss_mb > 0 for r in results))
+
+            # Последний график построен в шаблоне, уже использованном для двух других тикеров
+            single = os.path.join(tmp, 'single.png')
+            create_and_save_plot(jobs[-1].data, 'GOOGL', '6mo', None, None, jobs[-1].std_deviation, filename=single)
+            np.testing.assert_array_equal(mpimg.imread(single), mpimg.imread(jobs[-1].filename))
+
+    def test_failures_are_isolated(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            bad = pd.DataFrame({'Close': [1.0, 2.0]})
+            jobs = [ChartJob('BAD', bad, 1.0, os.path.join(tmp, 'bad.png')),
+                    ChartJob('AAPL', make_data(0), 1.0, os.path.join(tmp, 'AAPL.png'))]
+            results = render_charts_batch(jobs, workers=2)
+            self.assertIsNotNone(results[0].error)
+            self.assertIsNone(results[1].error)
+            self.assertTrue(os.path.exists(jobs[1].filename))
+
+
+if __name__ == '__main__':
+    unittest.main()
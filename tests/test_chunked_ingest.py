@@ -0,0 +1,80 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+import data_download as dd
+import main
+from benchmarks.synthetic import generate_ohlcv
+from chunked_ingest import AGGREGATIONS, OHLCVResampler, _parse_dates, ingest_file, iter_chunks
+
+
+class TestChunkedIngest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # Минутные бары за две недели, включая переход на летнее время 10 марта 2024
+        self.data = generate_ohlcv(20000, seed=5, start='2024-03-01', freq='min', volatility=0.001)
+        self.data = self.data[['Open', 'High', 'Low', 'Close', 'Volume']]
+        self.csv = os.path.join(self.tmp.name, 'bars.csv')
+        self.parquet = os.path.join(self.tmp.name, 'bars.parquet')
+        self.data.to_csv(self.csv)
+        self.data.reset_index().to_parquet(self.parquet)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def expected(self, rule):
+        resampler = self.data.resample(rule)
+        bars = resampler.agg(AGGREGATIONS)[resampler.size() > 0]
+        dd.add_moving_average(bars, 5)
+        dd.calculate_rsi(bars, 5)
+        dd.calculate_macd(bars)
+        return bars
+
+    def test_resampling_across_chunk_boundaries(self):
+        for rule in ('1D', '1h'):
+            expected = self.expected(rule)
+            for path in (self.csv, self.parquet):
+                for chunk_size in (997, 20000):
+                    data, stats = ingest_file(path, rule, chunk_size)
+                    pd.testing.assert_frame_equal(data, expected, check_freq=False, rtol=1e-9)
+                    self.assertEqual((stats.rows, stats.bars), (len(self.data), len(expected)))
+                    self.assertEqual(stats.chunks, -(-len(self.data) // chunk_size))
+                    self.assertGreater(stats.rows_per_second, 0)
+
+    def test_chunks_are_bounded_and_timezone_aware(self):
+        chunks = list(iter_chunks(self.csv, 3000, tz='America/New_York'))
+        self.assertTrue(all(len(chunk) <= 3000 for chunk in chunks))
+        self.assertTrue(chunks[0].index.equals(self.data.index[:3000]))
+
+    def test_parse_dates_fallback(self):
+        for values in (['2024-03-08 09:30:00-05:00', '2024-03-11 09:30:00-04:00'], ['2024-03-08', '2024-03-11'],
+                       ['2024-03-08T09:30:00Z'], ['2024-03-08 09:30:00.250+01:00']):
+            dates = pd.Series(values)
+            self.assertTrue(_parse_dates(dates).equals(pd.DatetimeIndex(pd.to_datetime(dates, utc=True,
+                                                                                     format='ISO8601'))))
+
+    def test_unsorted_input_rejected(self):
+        resampler = OHLCVResampler('1D')
+        resampler.update(self.data.iloc[5000:6000])
+        with self.assertRaises(ValueError):
+            resampler.update(self.data.iloc[:1000])
+        with self.assertRaises(ValueError):
+            OHLCVResampler('1D').update(self.data.iloc[::-1])
+
+    def test_main_ingest_mode(self):
+        args = main.parse_args(['--ingest', self.csv, '--ticker', 'spy', '--headless', '--output-dir', self.tmp.name,
+                                '--format', 'csv', '--chunk-size', '5000'])
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            data = main.run_ingest(args)
+        self.assertEqual(len(data), len(self.expected('1D')))
+        self.assertIn('строк/с', output.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, 'SPY_1D_bars.csv')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import batch_analysis as ba
+import main
+from benchmarks.synthetic import generate_ohlcv
+from compact_frames import compact_frame, compact_universe, expand_frame, memory_report, precision_report
+
+
+class TestCompactFrames(unittest.TestCase):
+
+    def setUp(self):
+        self.data = generate_ohlcv(500, seed=1)
+
+    def test_dtypes_and_sparse_actions(self):
+        compact = compact_frame(self.data)
+        self.assertEqual(list(compact.data.columns), ['Open', 'High', 'Low', 'Close', 'Volume'])
+        self.assertTrue((compact.data[['Open', 'High', 'Low', 'Close']].dtypes == np.float32).all())
+        self.assertEqual(compact.data['Volume'].dtype, np.uint32)
+        dividends = self.data['Dividends']
+        pd.testing.assert_series_equal(compact.actions['Dividends'], dividends[dividends != 0], check_freq=False)
+        self.assertEqual(str(compact.data.index.tz), 'America/New_York')
+
+    def test_expand_restores_layout(self):
+        restored = expand_frame(compact_frame(self.data), float_dtype='float64')
+        self.assertEqual(list(restored.columns), list(self.data.columns))
+        pd.testing.assert_frame_equal(restored[['Dividends', 'Stock Splits']], self.data[['Dividends', 'Stock Splits']])
+        np.testing.assert_allclose(restored['Close'], self.data['Close'], rtol=1e-7)
+        self.assertTrue(restored.index.equals(self.data.index))
+
+    def test_csv_index_parsed_with_timezone(self):
+        data = pd.read_csv('AAPL_3mo_stock_data.csv', index_col=0)
+        compact = compact_frame(data, tz='America/New_York')
+        self.assertIsInstance(compact.data.index, pd.DatetimeIndex)
+        self.assertEqual(compact.data.index[0], pd.Timestamp('2024-01-30', tz='America/New_York'))
+        self.assertEqual(compact_frame(data).data.index[0], pd.Timestamp('2024-01-30 05:00', tz='UTC'))
+        # Цены закрытия Yahoo Finance - значения float32, поэтому Close переводится практически без потерь
+        np.testing.assert_allclose(compact.data['Close'].to_numpy(np.float64), data['Close'].to_numpy(), rtol=1e-12)
+        self.assertEqual(compact.data['Moving_Average'].dtype, np.float32)
+
+    def test_naive_index_stays_naive(self):
+        data = self.data.tz_localize(None)
+        self.assertIsNone(compact_frame(data).data.index.tz)
+        self.assertTrue(compact_frame(data).data.index.equals(data.index))
+        self.assertEqual(str(compact_frame(data, tz='America/New_York').data.index.tz), 'America/New_York')
+        dates = data.iloc[:3].set_axis(data.index[:3].strftime('%Y-%m-%d %H:%M:%S'))
+        self.assertIsNone(compact_frame(dates).data.index.tz)
+
+    def test_large_prices_keep_float64(self):
+        data = self.data.copy()
+        data['Close'] = data['Close'] * 3000 + 0.013
+        compact = compact_frame(data)
+        self.assertEqual(compact.data['Close'].dtype, np.float64)
+        self.assertEqual(compact.data['Open'].dtype, np.float32)
+        self.assertEqual(compact_frame(data, tolerance=1.0).data['Close'].dtype, np.float32)
+
+    def test_memory_report(self):
+        compact = compact_frame(self.data)
+        report = memory_report(self.data, compact)
+        self.assertEqual(report.loc['Total', 'after_bytes'], compact.memory_usage())
+        self.assertEqual(report.loc['Close', 'saved_percent'], 50)
+        self.assertGreater(report.loc['Total', 'saved_percent'], 50)
+        self.assertEqual(report.loc['Dividends', 'dtype'], 'sparse')
+
+    def test_precision_report(self):
+        report = precision_report(self.data, compact_frame(self.data))
+        self.assertEqual(list(report.index),
+                         ['Close', 'Moving_Average', 'RSI', 'MACD', 'Signal_Line', 'average', 'std'])
+        self.assertTrue((report.loc[['Close', 'Moving_Average', 'average', 'std'], 'max_rel_error'] < 1e-6).all())
+        self.assertLess(report.loc['RSI', 'max_abs_error'], 1e-3)
+        self.assertTrue((precision_report(self.data, compact_frame(self.data, float_dtype='float64')) == 0).all().all())
+
+    def test_universe_and_batch_mode(self):
+        universe = {'A': self.data, 'B': generate_ohlcv(100, seed=2)}
+        self.assertEqual(len(compact_universe(universe)['B'].data), 100)
+        with patch('data_download.download_stock_data', return_value=self.data.copy()):
+            result = ba.analyze_ticker('AAPL', '1y', compact=True)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.data['RSI'].dtype, np.float32)
+        self.assertEqual(len(result.actions), (self.data['Dividends'] != 0).sum())
+
+    def test_compact_export_matches_regular_export(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            exported = {}
+            for name, flags in (('regular', []), ('compact', ['--compact'])):
+                output = os.path.join(tmp, name)
+                args = main.parse_args(['--tickers', 'aapl', '--output-dir', output, '--format', 'parquet'] + flags)
+                with patch('data_download.download_stock_data', side_effect=lambda *a, **k: self.data.copy()), \
+                        contextlib.redirect_stdout(io.StringIO()):
+                    main.run_batch(args)
+                exported[name] = pd.read_parquet(os.path.join(output, os.listdir(output)[0]))
+        pd.testing.assert_index_equal(exported['compact'].columns, exported['regular'].columns)
+        pd.testing.assert_series_equal(exported['compact'].dtypes, exported['regular'].dtypes)
+        self.assertTrue((exported['compact'].dtypes[['Close', 'RSI']] == np.float64).all())
+        np.testing.assert_allclose(exported['compact']['Close'], exported['regular']['Close'], rtol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
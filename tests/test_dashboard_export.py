@@ -0,0 +1,94 @@
+import base64
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+import data_download as dd
+import main
+from benchmarks.synthetic import generate_ohlcv, generate_universe
+from dashboard_export import TICKER_PLACEHOLDER, export_dashboard, ticker_payload
+
+
+def decode(text, dtype):
+    return np.frombuffer(base64.b64decode(text), dtype=dtype)
+
+
+def with_indicators(data):
+    dd.add_moving_average(data)
+    dd.calculate_rsi(data, 5)
+    dd.calculate_macd(data)
+    return data
+
+
+class TestDashboardExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.frames = {ticker: with_indicators(data) for ticker, data in generate_universe(3, 300).items()}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_payload(self, ticker):
+        with open(os.path.join(self.tmp.name, 'data', f'{ticker}.js'), encoding='utf-8') as f:
+            content = f.read()
+        prefix = f'dashboardData({json.dumps(ticker)}, '
+        self.assertTrue(content.startswith(prefix))
+        return json.loads(content[len(prefix):content.rindex(')')])
+
+    def test_files_and_shared_bundle(self):
+        result = export_dashboard(self.frames, self.tmp.name)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.tmp.name, 'data'))), ['T0000.js', 'T0001.js', 'T0002.js'])
+        self.assertEqual(result.files, 5)
+        sizes = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(self.tmp.name)
+                    for name in names)
+        self.assertEqual(result.bytes_written, sizes)
+        with open(result.path, encoding='utf-8') as f:
+            page = f.read()
+        self.assertIn('<script src="plotly.min.js"></script>', page)
+        self.assertIn('"T0000", "T0001", "T0002"', page)
+        self.assertIn(TICKER_PLACEHOLDER, page)
+        # Библиотека plotly.js не встраивается в страницу и не записывается повторно
+        self.assertLess(len(page), 100_000)
+        again = export_dashboard(self.frames, self.tmp.name)
+        self.assertEqual(again.files, 4)
+
+    def test_payload_round_trip(self):
+        export_dashboard(self.frames, self.tmp.name)
+        data = self.frames['T0001']
+        payload = self.read_payload('T0001')
+        self.assertAlmostEqual(payload['std'], data['Close'].std(ddof=1))
+        self.assertEqual(len(payload['dates']), 1)
+        dates = payload['dates'][0]
+        seconds = dates['base'] // 1000 + decode(dates['offsets'], '<i4')
+        expected = data.index.tz_localize(None).as_unit('s').asi8
+        np.testing.assert_array_equal(seconds, expected)
+        for column in ('Close', 'Moving_Average', 'RSI', 'MACD', 'Signal_Line'):
+            np.testing.assert_allclose(decode(payload['series'][column]['y'], '<f4'), data[column], rtol=1e-6)
+
+    def test_downsampled_payload(self):
+        data = with_indicators(generate_ohlcv(20000, seed=4))
+        payload = ticker_payload(data, downsample='lttb', max_points=500)
+        closes = decode(payload['series']['Close']['y'], '<f4')
+        self.assertEqual(len(closes), 500)
+        self.assertEqual(len(decode(payload['dates'][payload['series']['Close']['x']]['offsets'], '<i4')), 500)
+
+    def test_batch_mode_dashboard(self):
+        data = self.frames['T0000'].iloc[:, :7].copy()
+        dashboard = os.path.join(self.tmp.name, 'dash')
+        args = main.parse_args(['--tickers', 'aapl', 'msft', '--dashboard', dashboard])
+        with patch('data_download.download_stock_data', side_effect=lambda *a, **k: data.copy()), \
+                contextlib.redirect_stdout(io.StringIO()) as output:
+            main.run_batch(args)
+        self.assertIn('Панель графиков', output.getvalue())
+        self.assertEqual(sorted(os.listdir(os.path.join(dashboard, 'data'))), ['AAPL.js', 'MSFT.js'])
+
+
+if __name__ == '__main__':
+    unittest.main()
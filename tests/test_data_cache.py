@@ -0,0 +1,124 @@
+import unittest
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from data_cache import StockDataCache, resolve_date_range
+from data_download import fetch_stock_data
+
+
+def make_history(start=None, end=None, period=None, interval='1d'):
+    """Фиктивный ответ Yahoo Finance: рабочие дни в диапазоне [start, end)."""
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp.now().normalize() + pd.Timedelta(days=1)
+    start = pd.Timestamp(start) if start is not None else end - pd.Timedelta(days=400)
+    index = pd.bdate_range(start, end - pd.Timedelta(days=1), tz='America/New_York', name='Date')
+    close = np.arange(len(index), dtype=float) + index.day
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                         'Volume': np.full(len(index), 1000)}, index=index)
+
+
+class TestDataCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = StockDataCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resolve_date_range(self):
+        today = pd.Timestamp('2024-04-30')
+        self.assertEqual(resolve_date_range('3mo', today=today),
+                         (pd.Timestamp('2024-01-30'), pd.Timestamp('2024-05-01'), True))
+        self.assertEqual(resolve_date_range('', '2024-01-01', '2024-02-01', today=today),
+                         (pd.Timestamp('2024-01-01'), pd.Timestamp('2024-02-01'), False))
+        self.assertIsNone(resolve_date_range('max', today=today)[0])
+
+    @patch('builtins.print')
+    @patch('data_download.yf.Ticker')
+    def test_repeated_request_is_served_from_cache(self, mock_ticker, mocked_print):
+        history = mock_ticker.return_value.history
+        history.side_effect = make_history
+        first = fetch_stock_data('AAPL', '', start='2024-01-01', end='2024-02-01', cache=self.cache)
+        second = fetch_stock_data('AAPL', '', start='2024-01-01', end='2024-02-01', cache=self.cache)
+
+        self.assertEqual(history.call_count, 1)
+        pd.testing.assert_frame_equal(first, second, check_freq=False)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+    @patch('builtins.print')
+    @patch('data_download.yf.Ticker')
+    def test_only_missing_ranges_are_fetched(self, mock_ticker, mocked_print):
+        history = mock_ticker.return_value.history
+        history.side_effect = make_history
+        fetch_stock_data('AAPL', '', start='2024-02-01', end='2024-03-01', cache=self.cache)
+        data = fetch_stock_data('AAPL', '', start='2024-01-01', end='2024-04-01', cache=self.cache)
+
+        calls = [(c.kwargs['start'], c.kwargs['end']) for c in history.call_args_list[1:]]
+        self.assertEqual(calls, [(pd.Timestamp('2024-01-01'), pd.Timestamp('2024-02-01')),
+                                 (pd.Timestamp('2024-02-29'), pd.Timestamp('2024-04-01'))])
+        expected = make_history('2024-01-01', '2024-04-01')
+        pd.testing.assert_index_equal(data.index, expected.index, exact=False, check_names=False)
+        self.assertFalse(data.index.has_duplicates)
+        self.assertEqual(self.cache.stats()['partial_hits'], 1)
+
+    @patch('builtins.print')
+    @patch('data_download.yf.Ticker')
+    def test_stale_open_ended_data_refetches_tail(self, mock_ticker, mocked_print):
+        history = mock_ticker.return_value.history
+        history.side_effect = make_history
+        fetch_stock_data('AAPL', '1mo', cache=self.cache)
+        fetch_stock_data('AAPL', '1mo', cache=self.cache)
+        self.assertEqual(history.call_count, 1)
+
+        self.cache.max_age = timedelta(0)
+        fetch_stock_data('AAPL', '1mo', cache=self.cache)
+        self.assertEqual(history.call_count, 2)
+        self.assertIsNone(history.call_args.kwargs['end'])
+
+    def test_eviction_by_size(self):
+        self.cache.get('AAPL', '', make_history, start='2020-01-01', end='2024-01-01')
+        size = self.cache.size_bytes()
+        self.cache.max_bytes = int(size * 1.5)
+        self.cache.get('MSFT', '', make_history, start='2020-01-01', end='2024-01-01')
+
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+        self.assertLessEqual(self.cache.size_bytes(), self.cache.max_bytes)
+        self.cache.get('MSFT', '', make_history, start='2020-01-01', end='2024-01-01')
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_empty_result_is_not_cached(self):
+        empty = make_history('2024-01-06', '2024-01-08')
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(len(self.cache.get('AAPL', '', lambda start, end: empty, start='2024-01-01',
+                                            end='2024-02-01')), 0)
+        data = self.cache.get('AAPL', '', make_history, start='2024-01-01', end='2024-02-01')
+
+        self.assertEqual(len(data), len(make_history('2024-01-01', '2024-02-01')))
+        self.assertEqual(self.cache.stats()['misses'], 2)
+
+    def test_concurrent_requests(self):
+        calls = []
+
+        def loader(start, end):
+            calls.append((start, end))
+            return make_history(start, end)
+
+        tickers = ['AAPL', 'MSFT', 'GOOG', 'AMZN'] * 8
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda ticker: self.cache.get(ticker, '', loader, start='2024-01-01',
+                                                                      end='2024-02-01'), tickers))
+
+        self.assertEqual(len(calls), 4)
+        self.assertTrue(all(len(result) == len(results[0]) for result in results))
+        stats = self.cache.stats()
+        self.assertEqual((stats['misses'], stats['hits']), (4, len(tickers) - 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
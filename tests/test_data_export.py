@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data_export import export_data, load_data, detect_format
+
+
+def make_data(start='2024-01-02', periods=30):
+    index = pd.bdate_range(start, periods=periods, tz='America/New_York', name='Date')
+    close = np.linspace(100, 130, periods)
+    return pd.DataFrame({'Open': close - 1, 'Close': close, 'Volume': np.arange(periods) * 1000}, index=index)
+
+
+class TestDataExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format('AAPL.csv'), 'csv')
+        self.assertEqual(detect_format('AAPL.feather'), 'feather')
+        self.assertEqual(detect_format('AAPL_dataset'), 'parquet')
+
+    def test_round_trip_all_formats(self):
+        data = make_data()
+        for name in ('AAPL_parquet', 'AAPL.feather'):
+            export_data(data, self.path(name), chunk_size=7)
+            pd.testing.assert_frame_equal(load_data(self.path(name)), data, check_freq=False)
+        export_data(data, self.path('AAPL.csv'))
+        loaded = load_data(self.path('AAPL.csv'))
+        np.testing.assert_allclose(loaded['Close'], data['Close'])
+        self.assertTrue((loaded.index == data.index).all())
+
+    def test_append_writes_only_new_rows(self):
+        data = make_data(periods=40)
+        for name in ('AAPL_parquet', 'AAPL.feather', 'AAPL.csv'):
+            path = self.path(name)
+            self.assertEqual(export_data(data.iloc[:25], path, append=True), 25)
+            self.assertEqual(export_data(data, path, append=True), 15)
+            self.assertEqual(export_data(data, path, append=True), 0)
+            loaded = load_data(path)
+            self.assertEqual(len(loaded), 40, name)
+            self.assertFalse(loaded.index.has_duplicates)
+        self.assertEqual(len(os.listdir(self.path('AAPL_parquet'))), 2)
+
+    def test_load_selected_columns_and_date_range(self):
+        data = make_data(periods=40)
+        for name in ('AAPL_parquet', 'AAPL.feather', 'AAPL.csv'):
+            export_data(data, self.path(name))
+            loaded = load_data(self.path(name), columns=['Close'], start='2024-01-10', end='2024-01-20')
+            self.assertEqual(list(loaded.columns), ['Close'])
+            expected = data.loc['2024-01-10':'2024-01-19', 'Close']
+            np.testing.assert_allclose(loaded['Close'], expected, err_msg=name)
+
+    def test_same_date_range_in_all_formats(self):
+        # Часовые бары вокруг полуночи и перехода на летнее время: граница без часового пояса - местное время данных
+        index = pd.date_range('2024-03-08 18:00', '2024-03-12 06:00', freq='h', tz='America/New_York', name='Date')
+        data = pd.DataFrame({'Close': np.arange(len(index), dtype=float)}, index=index)
+        expected = data[(data.index >= pd.Timestamp('2024-03-09 22:00', tz='America/New_York'))
+                        & (data.index < pd.Timestamp('2024-03-11', tz='America/New_York'))]
+        for name in ('AAPL_parquet', 'AAPL.feather', 'AAPL.csv'):
+            export_data(data, self.path(name))
+            loaded = load_data(self.path(name), start='2024-03-09 22:00', end='2024-03-11')
+            np.testing.assert_array_equal(loaded['Close'], expected['Close'], err_msg=name)
+            self.assertTrue((loaded.index == expected.index).all(), name)
+            aware = load_data(self.path(name), start=pd.Timestamp('2024-03-10 03:00', tz='UTC'))
+            self.assertEqual(aware.index[0], pd.Timestamp('2024-03-09 22:00', tz='America/New_York'), name)
+
+    def test_overwrite_without_append(self):
+        path = self.path('AAPL_parquet')
+        export_data(make_data(periods=10), path)
+        export_data(make_data(periods=5), path)
+        self.assertEqual(len(load_data(path)), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
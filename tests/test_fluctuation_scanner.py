@@ -0,0 +1,83 @@
+import contextlib
+import io
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import data_download as dd
+from benchmarks.synthetic import generate_panel
+from fluctuation_scanner import (alerts_to_frame, rolling_fluctuation, scan_panel, scan_ticker, scan_universe,
+                                 sliding_max, sliding_min)
+
+
+class TestFluctuationScanner(unittest.TestCase):
+
+    def setUp(self):
+        self.panel = generate_panel(300, 12, seed=7, gap_rate=0.02)
+
+    def test_sliding_extremes_match_pandas(self):
+        values = self.panel.to_numpy()
+        for window in (1, 2, 7, 20, 299, 300, 301):
+            expected_max = self.panel.rolling(window, min_periods=1).max().to_numpy().copy()
+            expected_min = self.panel.rolling(window, min_periods=1).min().to_numpy().copy()
+            expected_max[:window - 1] = expected_min[:window - 1] = np.nan
+            np.testing.assert_allclose(sliding_max(values, window), expected_max)
+            np.testing.assert_allclose(sliding_min(values, window), expected_min)
+        # Одномерный ряд без пропусков
+        close = generate_panel(100, 1, ragged=False, gap_rate=0)['T0000']
+        np.testing.assert_allclose(sliding_max(close.to_numpy(), 5), close.rolling(5).max().to_numpy())
+        np.testing.assert_allclose(sliding_min(close.to_numpy(), 5), close.rolling(5).min().to_numpy())
+
+    def test_rolling_fluctuation_requires_full_window(self):
+        close = self.panel['T0003']
+        fluctuation, _, _ = rolling_fluctuation(close.to_numpy(), 10)
+        rolling = close.rolling(10)
+        expected = (rolling.max() - rolling.min()) / rolling.min() * 100
+        np.testing.assert_allclose(fluctuation, expected.to_numpy())
+
+    def test_whole_period_window_matches_notify(self):
+        data = pd.read_csv('AAPL_3mo_stock_data.csv', index_col=0)
+        alerts = scan_ticker('AAPL', data, window=len(data), threshold=5)
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(round(alerts[0].fluctuation, 1), dd.notify_if_strong_fluctuations(data, 'AAPL'))
+        self.assertEqual((alerts[0].start, alerts[0].end), (data.index[0], data.index[-1]))
+
+    def test_threshold_uses_rounded_fluctuation_like_notify(self):
+        for closes, expected in (([100.0, 105.04], 0), ([100.0, 105.06], 1)):
+            data = pd.DataFrame({'Close': closes}, index=pd.bdate_range('2024-01-01', periods=2))
+            with contextlib.redirect_stdout(io.StringIO()):
+                notified = dd.notify_if_strong_fluctuations(data, 'X', 5)
+            self.assertEqual(len(scan_ticker('X', data, window=2, threshold=5)), expected)
+            self.assertEqual(notified is not None, bool(expected))
+
+    def test_consecutive_windows_merged_into_one_alert(self):
+        close = pd.Series([100.0] * 10 + [120.0] + [100.0] * 10, index=pd.bdate_range('2024-01-01', periods=21))
+        alerts = scan_ticker('X', close, window=3, threshold=5)
+        self.assertEqual(len(alerts), 1)
+        alert = alerts[0]
+        # Окна, содержащие скачок: с концом на 10, 11 и 12 позиции
+        self.assertEqual((alert.start, alert.end), (close.index[8], close.index[12]))
+        self.assertAlmostEqual(alert.fluctuation, 20.0)
+        self.assertEqual((alert.max_price, alert.min_price), (120.0, 100.0))
+
+    def test_universe_scan_is_parallel_and_consistent(self):
+        expected = scan_panel(self.panel, 20, 15)
+        self.assertTrue(expected)
+        from_panel = list(scan_universe(self.panel, 20, 15, workers=3, chunk_size=5))
+        frames = {ticker: self.panel[[ticker]].rename(columns={ticker: 'Close'}) for ticker in self.panel.columns}
+        from_frames = list(scan_universe(frames, 20, 15, workers=3, chunk_size=5))
+
+        def key(alert):
+            return alert.ticker, alert.start
+
+        self.assertEqual(sorted(from_panel, key=key), sorted(expected, key=key))
+        self.assertEqual(sorted(from_frames, key=key), sorted(expected, key=key))
+
+        frame = alerts_to_frame(expected)
+        self.assertEqual(len(frame), len(expected))
+        self.assertTrue((frame['fluctuation'] > 15).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from data_download import add_moving_average, calculate_rsi, calculate_macd, calculate_standard_deviation, \
+    calculate_and_display_average_price
+from history_store import HistoryStore
+
+
+def make_bars(start='2024-01-02 09:30', periods=500):
+    index = pd.date_range(start, periods=periods, freq='min', tz='America/New_York', name='Date')
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 0.1, periods))
+    return pd.DataFrame({'Open': close - 0.05, 'High': close + 0.1, 'Low': close - 0.1, 'Close': close,
+                         'Volume': np.arange(periods, dtype=np.int64), 'Dividends': 0.0}, index=index)
+
+
+class TestHistoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = HistoryStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_and_query_round_trip(self):
+        data = make_bars()
+        self.assertEqual(self.store.append('AAPL', data.iloc[:300]), 300)
+        self.assertEqual(self.store.append('AAPL', data.iloc[200:]), 200)
+        self.assertEqual(self.store.append('AAPL', data), 0)
+        self.assertEqual(self.store.tickers(), ['AAPL'])
+
+        view = self.store.query('AAPL')
+        expected = data[['Open', 'High', 'Low', 'Close', 'Volume']]
+        pd.testing.assert_frame_equal(view.to_frame(), expected, check_freq=False, check_index_type=False)
+
+    def test_date_range_query_is_zero_copy(self):
+        data = make_bars()
+        self.store.append('AAPL', data)
+        view = self.store.query('AAPL', start='2024-01-02 10:00', end='2024-01-02 11:00')
+
+        self.assertEqual(len(view), 60)
+        self.assertEqual(view.index[0], pd.Timestamp('2024-01-02 10:00', tz='America/New_York'))
+        full = self.store.query('AAPL')
+        self.assertTrue(np.shares_memory(view['Close'].to_numpy(), full.arrays['Close']))
+        self.assertIsInstance(full.arrays['Close'], np.memmap)
+
+    @patch('builtins.print')
+    def test_indicator_functions_accept_views(self, mocked_print):
+        data = make_bars()
+        self.store.append('AAPL', data)
+        view = self.store.query('AAPL', start='2024-01-02 10:00')
+        expected = data.loc['2024-01-02 10:00':, ['Close']].copy()
+
+        view = calculate_macd(calculate_rsi(add_moving_average(view, 5), 14))
+        add_moving_average(expected, 5)
+        calculate_rsi(expected, 14)
+        calculate_macd(expected)
+        for column in ('Moving_Average', 'RSI', 'MACD', 'Signal_Line'):
+            np.testing.assert_allclose(view[column], expected[column], err_msg=column)
+        self.assertAlmostEqual(calculate_standard_deviation(view), expected['Close'].std())
+        self.assertIsNotNone(calculate_and_display_average_price(view, 'AAPL'))
+
+    def test_unknown_ticker(self):
+        with self.assertRaises(KeyError):
+            self.store.query('MSFT')
+
+
+if __name__ == '__main__':
+    unittest.main()
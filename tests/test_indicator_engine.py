@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from data_download import add_moving_average, calculate_rsi, calculate_macd, calculate_standard_deviation, \
+    calculate_and_display_average_price
+from indicator_engine import compute_indicators, indicators_to_frame
+
+
+def make_prices(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    close[[n // 10, n // 10 + 1, n // 2]] = np.nan
+    return pd.DataFrame({'Close': close}, index=pd.date_range('2020-01-01', periods=n))
+
+
+class TestIndicatorEngine(unittest.TestCase):
+
+    @patch('builtins.print')
+    def test_matches_data_download_functions(self, mocked_print):
+        data = make_prices()
+        result = compute_indicators(data, ma_window=5, rsi_window=14, macd_windows=(12, 26, 9))
+
+        expected = data.copy()
+        add_moving_average(expected, window_size=5)
+        calculate_rsi(expected, window_size=14)
+        calculate_macd(expected, short_window=12, long_window=26, signal_window=9)
+        for column in ('Moving_Average', 'RSI', 'MACD', 'Signal_Line'):
+            np.testing.assert_allclose(result[column], expected[column].to_numpy(), rtol=1e-12, atol=1e-12,
+                                       err_msg=column)
+        self.assertAlmostEqual(result['std'], calculate_standard_deviation(data), places=10)
+        self.assertAlmostEqual(round(result['average'], 6), calculate_and_display_average_price(data, 'AAPL'))
+
+    def test_long_moving_average_windows(self):
+        data = make_prices(3000, seed=1)
+        for window in (1, 50, 700):
+            result = compute_indicators(data, ma_window=window, rsi_window=None, macd_windows=None)
+            expected = data['Close'].rolling(window).mean().to_numpy()
+            np.testing.assert_allclose(result['Moving_Average'], expected, rtol=1e-12, err_msg=str(window))
+
+    def test_input_frame_is_not_modified(self):
+        data = make_prices(100)
+        before = data.copy()
+        compute_indicators(data)
+        pd.testing.assert_frame_equal(data, before)
+
+    def test_constant_prices_give_nan_rsi_like_pandas(self):
+        data = pd.DataFrame({'Close': [10.0] * 20})
+        result = compute_indicators(data, rsi_window=5)
+        expected = calculate_rsi(data.copy(), window_size=5)['RSI'].to_numpy()
+        np.testing.assert_array_equal(np.isnan(result['RSI']), np.isnan(expected))
+
+    def test_skipped_indicators_and_short_series(self):
+        result = compute_indicators(np.array([1.0, 2.0]), ma_window=5, rsi_window=None, macd_windows=None,
+                                    std=False, average=False)
+        self.assertEqual(list(result), ['Moving_Average'])
+        self.assertTrue(np.isnan(result['Moving_Average']).all())
+
+    def test_indicators_to_frame(self):
+        data = make_prices(50)
+        result = compute_indicators(data)
+        frame = indicators_to_frame(result, data.index)
+        self.assertEqual(list(frame.columns), ['Moving_Average', 'RSI', 'MACD', 'Signal_Line'])
+        pd.testing.assert_index_equal(frame.index, data.index)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import data_download as dd
+from indicator_graph import IndicatorGraph, node_key
+
+
+class TestIndicatorGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.data = pd.read_csv('AAPL_3mo_stock_data.csv', index_col=0)[['Close']]
+
+    def test_apply_matches_data_download(self):
+        expected = self.data.copy()
+        dd.add_moving_average(expected, 5)
+        dd.calculate_rsi(expected, 5)
+        dd.calculate_macd(expected, 12, 26, 9)
+        result = IndicatorGraph().apply(self.data.copy(), 'AAPL', 5, 5, (12, 26, 9))
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_statistics_match_data_download(self):
+        stats = IndicatorGraph().statistics(self.data, 'AAPL')
+        self.assertAlmostEqual(stats['average'], self.data['Close'].mean())
+        self.assertAlmostEqual(stats['std'], dd.calculate_standard_deviation(self.data))
+        self.assertAlmostEqual(round(stats['fluctuation'], 1), dd.notify_if_strong_fluctuations(self.data, 'AAPL', 0))
+
+    def test_shared_intermediates_computed_once(self):
+        graph = IndicatorGraph()
+        graph.apply(self.data.copy(), 'AAPL', ma_window=None, rsi_window=None)
+        # close, ema(12), ema(26), MACD, ema(MACD, 9), Signal_Line: MACD не пересчитывается для сигнальной линии
+        self.assertEqual(graph.stats()['misses'], 6)
+
+    def test_rerun_with_tweaked_parameters_only_computes_changes(self):
+        graph = IndicatorGraph()
+        graph.apply(self.data.copy(), 'AAPL', 5, 5, (12, 26, 9))
+        misses = graph.stats()['misses']
+        graph.apply(self.data.copy(), 'AAPL', 5, 14, (12, 26, 9))
+        stats = graph.stats()
+        # Новые узлы: rolling_mean(gain, 14), rolling_mean(loss, 14), RSI(14)
+        self.assertEqual(stats['misses'] - misses, 3)
+        # Moving_Average, MACD, Signal_Line и общие gain, loss
+        self.assertEqual(stats['hits'], 5)
+
+    def test_new_bar_changes_key(self):
+        graph = IndicatorGraph()
+        graph.statistics(self.data, 'AAPL')
+        changed = self.data.copy()
+        changed.iloc[-1, 0] += 1
+        self.assertNotAlmostEqual(graph.statistics(changed, 'AAPL')['average'],
+                                  graph.statistics(self.data, 'AAPL')['average'])
+        self.assertEqual(graph.stats()['hits'], 3)
+
+    def test_revised_history_changes_key(self):
+        graph = IndicatorGraph()
+        graph.statistics(self.data, 'AAPL')
+        revised = self.data.copy()
+        # Исправление цены в середине истории: даты, длина и последний бар не меняются
+        revised.iloc[len(revised) // 2, 0] += 10
+        self.assertAlmostEqual(graph.statistics(revised, 'AAPL')['average'], revised['Close'].mean())
+        self.assertEqual(graph.stats()['hits'], 0)
+
+    def test_lru_eviction(self):
+        graph = IndicatorGraph(max_entries=4)
+        graph.evaluate(self.data, 'AAPL', [node_key('Moving_Average', window=5)])
+        self.assertEqual(graph.stats()['entries'], 3)
+        graph.evaluate(self.data, 'AAPL', [node_key('Moving_Average', window=10)])
+        stats = graph.stats()
+        self.assertEqual((stats['entries'], stats['evictions']), (4, 1))
+        # close использовался последним для окна 10 и остался в кэше, узлы окна 5 вытеснены первыми
+        graph.evaluate(self.data, 'AAPL', [node_key('close')])
+        self.assertEqual(graph.stats()['hits'], 2)
+
+    def test_max_bytes(self):
+        graph = IndicatorGraph(max_bytes=3 * self.data['Close'].memory_usage(index=False))
+        graph.apply(self.data.copy(), 'AAPL')
+        self.assertLessEqual(graph.stats()['size_bytes'], 3 * self.data['Close'].memory_usage(index=False))
+        self.assertGreater(graph.stats()['evictions'], 0)
+
+    def test_cached_close_does_not_reference_caller_frame(self):
+        data = self.data.copy()
+        close = IndicatorGraph().evaluate(data, 'AAPL', [node_key('close')])[node_key('close')]
+        self.assertFalse(np.shares_memory(close.to_numpy(), data['Close'].to_numpy()))
+
+    def test_nan_handling(self):
+        data = self.data.copy()
+        data.iloc[[3, 10], 0] = np.nan
+        expected = dd.calculate_rsi(data.copy(), 5)
+        result = IndicatorGraph().apply(data.copy(), 'AAPL', None, 5, None)
+        pd.testing.assert_series_equal(result['RSI'], expected['RSI'])
+
+
+if __name__ == '__main__':
+    unittest.main()
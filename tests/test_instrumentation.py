@@ -0,0 +1,91 @@
+import contextlib
+import io
+import json
+import os
+import pstats
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import main
+from instrumentation import PipelineMetrics, profiled
+
+
+class TestPipelineMetrics(unittest.TestCase):
+
+    def test_stage_records_time_rows_and_memory(self):
+        metrics = PipelineMetrics()
+        with metrics.stage('fetch') as stage:
+            sum(range(100000))
+            stage.rows = 42
+        with metrics.stage('moving_average', 42):
+            pass
+        self.assertEqual([s.name for s in metrics.stages], ['fetch', 'moving_average'])
+        fetch = metrics.stages[0]
+        self.assertEqual(fetch.rows, 42)
+        self.assertGreater(fetch.wall_seconds, 0)
+        self.assertGreaterEqual(fetch.cpu_seconds, 0)
+        self.assertGreater(fetch.peak_rss_mb, 0)
+        self.assertIsNone(fetch.peak_alloc_mb)
+        self.assertIsNone(fetch.error)
+
+    def test_trace_memory(self):
+        metrics = PipelineMetrics(trace_memory=True)
+        with metrics.stage('alloc'):
+            values = np.ones(4 * 2 ** 20 // 8)
+            del values
+        self.assertGreaterEqual(metrics.stages[0].peak_alloc_mb, 4)
+
+    def test_error_is_recorded_and_raised(self):
+        metrics = PipelineMetrics()
+        with self.assertRaises(ValueError):
+            with metrics.stage('export_csv'):
+                raise ValueError('disk full')
+        self.assertEqual(metrics.stages[0].error, 'ValueError: disk full')
+
+    def test_disabled_metrics_collect_nothing(self):
+        metrics = PipelineMetrics(enabled=False)
+        with metrics.stage('fetch') as stage:
+            stage.rows = 10
+        self.assertEqual(metrics.stages, [])
+
+    def test_write_json_and_profile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            metrics = PipelineMetrics()
+            profile_path = os.path.join(tmp, 'run.prof')
+            with contextlib.redirect_stdout(io.StringIO()), profiled(profile_path):
+                with metrics.stage('rsi_macd', 3):
+                    sorted(range(1000))
+            metrics.write_json(os.path.join(tmp, 'metrics.json'))
+            with open(os.path.join(tmp, 'metrics.json'), encoding='utf-8') as f:
+                data = json.load(f)
+            self.assertEqual(data['stages'][0]['name'], 'rsi_macd')
+            self.assertEqual(data['stages'][0]['rows'], 3)
+            self.assertGreater(pstats.Stats(profile_path).total_calls, 0)
+
+    def test_main_records_every_stage(self):
+        data = pd.DataFrame({'Close': np.linspace(100, 110, 40)},
+                            index=pd.date_range('2024-01-01', periods=40, name='Date'))
+        metrics = PipelineMetrics()
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch('builtins.input', side_effect=['AAPL', '1mo', '']), \
+                patch('data_download.fetch_stock_data', return_value=data), \
+                patch('data_plotting.create_and_save_plot'), patch('data_plotting.create_and_show_plot'), \
+                contextlib.redirect_stdout(io.StringIO()):
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                main.main(metrics)
+            finally:
+                os.chdir(cwd)
+        self.assertEqual([s.name for s in metrics.stages],
+                         ['fetch', 'moving_average', 'average_price', 'std_deviation', 'fluctuations', 'export_csv',
+                          'rsi_macd', 'plot_png', 'plot_html'])
+        self.assertTrue(all(s.rows == 40 for s in metrics.stages))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import main
+from data_cache import StockDataCache
+
+
+class TestMain(unittest.TestCase):
+
+    def setUp(self):
+        self.data = pd.DataFrame({'Close': np.linspace(100, 110, 40)},
+                                 index=pd.date_range('2024-01-01', periods=40, name='Date'))
+
+    def run_analysis(self, **kwargs):
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch('data_download.fetch_stock_data', return_value=self.data), \
+                contextlib.redirect_stdout(io.StringIO()):
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                main.run_analysis('AAPL', '1mo', **kwargs)
+            finally:
+                os.chdir(cwd)
+            return sorted(os.listdir(tmp))
+
+    def test_import_does_not_load_plotting_and_network_libraries(self):
+        code = "import sys, main; print(sorted(m for m in ('yfinance', 'matplotlib', 'plotly') if m in sys.modules))"
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+        self.assertEqual(output.strip(), '[]')
+
+    def test_headless_skips_charts(self):
+        with patch('data_plotting.create_and_save_plot') as save_plot, \
+                patch('data_plotting.create_and_show_plot') as show_plot:
+            files = self.run_analysis(headless=True)
+        self.assertEqual(files, ['AAPL_1mo_stock_data.csv'])
+        save_plot.assert_not_called()
+        show_plot.assert_not_called()
+
+    def test_no_show_writes_html_without_browser(self):
+        with patch('plotly.graph_objects.Figure.show') as show:
+            files = self.run_analysis(show=False)
+        self.assertEqual(files, ['AAPL_1mo_chart.png', 'AAPL_1mo_stock_data.csv', 'AAPL_interactive_chart.html'])
+        show.assert_not_called()
+
+    @patch('data_download.yf.Ticker')
+    def test_single_ticker_uses_cache(self, mock_ticker):
+        history = mock_ticker.return_value.history
+        history.return_value = self.data.tz_localize('America/New_York')
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+            cache = StockDataCache(os.path.join(tmp, 'cache'))
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                for _ in range(2):
+                    main.run_analysis('AAPL', '', '2024-01-01', '2024-02-10', headless=True, cache=cache)
+            finally:
+                os.chdir(cwd)
+            stats = cache.stats()
+        self.assertEqual(history.call_count, 1)
+        self.assertEqual((stats['misses'], stats['hits']), (1, 1))
+
+    def test_interactive_style_prompt_follows_report(self):
+        events = []
+        answers = iter(['aapl', '1mo', 'ggplot'])
+
+        def answer(prompt):
+            events.append('input')
+            return next(answers)
+
+        def fetch(*args, **kwargs):
+            events.append('fetch')
+            return self.data
+
+        with patch('builtins.input', side_effect=answer), patch('data_download.fetch_stock_data', side_effect=fetch), \
+                patch('data_download.export_data_to_csv'), \
+                patch('data_plotting.create_and_save_plot') as save_plot, \
+                patch('data_plotting.create_and_show_plot'), contextlib.redirect_stdout(io.StringIO()):
+            main.main()
+        self.assertEqual(events, ['input', 'input', 'fetch', 'input'])
+        self.assertEqual(save_plot.call_args.kwargs['style'], 'ggplot')
+
+    def test_parse_args_single_ticker(self):
+        args = main.parse_args(['--ticker', 'msft', '--period', '1y', '--headless'])
+        self.assertEqual((args.ticker, args.period, args.headless, args.tickers), ('msft', '1y', True, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data_download import add_moving_average, calculate_rsi, calculate_macd
+from panel_indicators import compute_panel_indicators, make_panel, panel_moving_average, panel_rsi
+
+
+def make_frames(n=250, tickers=('AAPL', 'MSFT', 'GOOGL', 'TSLA'), seed=3):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2022-01-03', periods=n)
+    frames = {}
+    for i, ticker in enumerate(tickers):
+        close = 50 * (i + 1) * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        frame = pd.DataFrame({'Close': close}, index=dates)
+        # Разные даты начала истории и пропуски в данных
+        frame = frame.iloc[i * 20:]
+        if i % 2:
+            frame = frame.drop(frame.index[[10, 11, len(frame) // 2]])
+        frames[ticker] = frame
+    return frames
+
+
+class TestPanelIndicators(unittest.TestCase):
+
+    def test_matches_per_ticker_functions(self):
+        frames = make_frames()
+        panel = make_panel(frames)
+        ma_windows, rsi_windows, macd_params = [3, 5, 20], [5, 14], [(12, 26, 9), (5, 35, 5)]
+        result = compute_panel_indicators(panel, ma_windows, rsi_windows, macd_params)
+
+        for ticker, frame in frames.items():
+            # Собственная история тикера: с его первой даты, пропущенные дни - строки с NaN, как в панели
+            dates = panel.index[panel.index >= frame.index[0]]
+            data = frame.reindex(dates)
+            for window in rsi_windows:
+                self.assertTrue(result['RSI'].sel(window)[ticker][panel.index < frame.index[0]].isna().all())
+            for window in ma_windows:
+                expected = add_moving_average(data.copy(), window)['Moving_Average']
+                np.testing.assert_allclose(result['Moving_Average'].sel(window)[ticker][dates], expected, rtol=1e-9)
+            for window in rsi_windows:
+                expected = calculate_rsi(data.copy(), window)['RSI']
+                np.testing.assert_allclose(result['RSI'].sel(window)[ticker][dates], expected, rtol=1e-9)
+            for params in macd_params:
+                expected = calculate_macd(data.copy(), *params)
+                np.testing.assert_allclose(result['MACD'].sel(params)[ticker][dates], expected['MACD'], rtol=1e-12)
+                np.testing.assert_allclose(result['Signal_Line'].sel(params)[ticker][dates], expected['Signal_Line'],
+                                           rtol=1e-12)
+
+    def test_ragged_start_rsi(self):
+        dates = pd.bdate_range('2024-01-01', periods=30)
+        frames = {'AAA': pd.DataFrame({'Close': np.linspace(100, 120, 30)}, index=dates),
+                  'BBB': pd.DataFrame({'Close': [10, 11, 10.5, 11.5, 11.2, 12, 11.4, 11.9, 12.3, 12.0]},
+                                      index=dates[20:])}
+        rsi = panel_rsi(make_panel(frames), [5]).sel(5)['BBB']
+
+        self.assertTrue(rsi.iloc[:24].isna().all())
+        np.testing.assert_allclose(rsi.iloc[24:].round(2), [71.43, 77.78, 56.25, 71.88, 65.38, 65.38])
+        np.testing.assert_allclose(rsi.iloc[20:], calculate_rsi(frames['BBB'].copy(), 5)['RSI'], rtol=1e-12)
+
+    def test_result_shape_and_tidy_format(self):
+        panel = make_panel(make_frames(n=60, tickers=('AAPL', 'MSFT')))
+        result = panel_moving_average(panel, [5, 10])
+        self.assertEqual(result.values.shape, (2, len(panel), 2))
+
+        tidy = result.to_tidy()
+        self.assertEqual(list(tidy.columns), ['Date', 'Ticker', 'Params', 'Moving_Average'])
+        self.assertEqual(len(tidy), int(np.count_nonzero(~np.isnan(result.values))))
+        row = tidy[(tidy['Ticker'] == 'MSFT') & (tidy['Params'] == 10)].iloc[0]
+        self.assertEqual(row['Moving_Average'], result.sel(10).loc[row['Date'], 'MSFT'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+
+from data_download import add_moving_average, calculate_rsi, calculate_macd
+from data_plotting import create_and_save_plot, create_and_show_plot, prepare_plot_series
+from plot_downsampling import downsample_series, lttb_indices, minmax_indices, point_budget
+
+
+def make_data(n=20000):
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    data = pd.DataFrame({'Close': close}, index=pd.date_range('2020-01-01', periods=n, freq='min'))
+    return calculate_macd(calculate_rsi(add_moving_average(data)))
+
+
+class TestPlotDownsampling(unittest.TestCase):
+
+    def test_lttb_keeps_endpoints_and_budget(self):
+        y = np.sin(np.linspace(0, 20, 5000))
+        indices = lttb_indices(np.arange(5000.0), y, 500)
+        self.assertEqual(len(indices), 500)
+        self.assertEqual((indices[0], indices[-1]), (0, 4999))
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertGreater(y[indices].max(), 0.99)
+
+    def test_minmax_keeps_extremes(self):
+        y = np.random.default_rng(1).normal(size=10000)
+        indices = minmax_indices(y, 200)
+        self.assertLessEqual(len(indices), 200)
+        self.assertIn(int(np.argmax(y)), indices)
+        self.assertIn(int(np.argmin(y)), indices)
+
+    def test_short_series_is_unchanged(self):
+        series = pd.Series([1.0, np.nan, 3.0], index=pd.date_range('2024-01-01', periods=3))
+        self.assertEqual(len(downsample_series(series, 100)), 2)
+        self.assertEqual(point_budget(800, 'minmax'), 1600)
+
+    @patch('builtins.print')
+    def test_prepare_plot_series(self, mocked_print):
+        data = make_data()
+        series = prepare_plot_series(data, 'lttb', pixel_width=1000)
+        self.assertEqual(len(series['Close']), 1000)
+        self.assertEqual(len(prepare_plot_series(data)['Close']), len(data))
+        mocked_print.assert_called_with("Прореживание (lttb): 1000 точек на ряд вместо 20000")
+
+    @patch('builtins.print')
+    @patch('plotly.graph_objects.Figure.show')
+    @patch('plotly.graph_objects.Figure.write_html', autospec=True)
+    def test_plots_with_downsampling(self, mocked_write_html, mocked_show, mocked_print):
+        data = make_data()
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'chart.png')
+            create_and_save_plot(data, 'TEST', '1mo', None, None, 1.0, filename=filename, downsample='minmax')
+            self.assertTrue(os.path.exists(filename))
+
+        create_and_show_plot(data, 'TEST', 1.0, downsample='lttb')
+        fig = mocked_write_html.call_args[0][0]
+        self.assertEqual({trace.type for trace in fig.data}, {'scatter'})
+        self.assertEqual(len(fig.data[0].x), 800)
+
+        create_and_show_plot(data, 'TEST', 1.0)
+        fig = mocked_write_html.call_args[0][0]
+        self.assertEqual({trace.type for trace in fig.data}, {'scattergl'})
+
+
+if __name__ == '__main__':
+    unittest.main()
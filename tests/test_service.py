@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import data_download as dd
+from benchmarks.synthetic import generate_ohlcv
+from service import ServiceError, SharedCache, StockService, make_server
+
+
+class TestSharedCache(unittest.TestCase):
+
+    def test_lru_eviction_and_stats(self):
+        cache = SharedCache(max_entries=2, ttl=None)
+        for key in ('a', 'b', 'a', 'c', 'b'):
+            cache.get_or_compute(key, lambda: key.upper())
+        # c вытеснил b (a использовался позже), b вычислен заново
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 4, 'evictions': 2, 'hit_rate': 0.2, 'entries': 2})
+
+    def test_ttl(self):
+        cache = SharedCache(ttl=0.05)
+        calls = []
+        cache.get_or_compute('a', lambda: calls.append(1))
+        cache.get_or_compute('a', lambda: calls.append(1))
+        time.sleep(0.06)
+        cache.get_or_compute('a', lambda: calls.append(1))
+        self.assertEqual(len(calls), 2)
+
+    def test_concurrent_identical_keys_computed_once(self):
+        cache = SharedCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return 42
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(lambda _: cache.get_or_compute('key', compute), range(8)))
+        self.assertEqual(results, [42] * 8)
+        self.assertEqual(len(calls), 1)
+
+    def test_errors_not_cached(self):
+        cache = SharedCache()
+        with self.assertRaises(ValueError):
+            cache.get_or_compute('a', lambda: int('x'))
+        self.assertEqual(cache.get_or_compute('a', lambda: 1), 1)
+
+    def test_disabled(self):
+        cache = SharedCache(max_entries=0)
+        calls = []
+        for _ in range(3):
+            cache.get_or_compute('a', lambda: calls.append(1))
+        self.assertEqual((len(calls), cache.stats()['entries']), (3, 0))
+
+
+class TestStockService(unittest.TestCase):
+
+    def setUp(self):
+        self.data = generate_ohlcv(120, seed=3)
+        self.calls = []
+
+        def provider(ticker, period, start, end):
+            self.calls.append((ticker, period, start, end))
+            if ticker == 'FAIL':
+                raise ConnectionError("нет соединения")
+            return self.data if ticker == 'AAPL' else pd.DataFrame()
+
+        self.server = make_server(port=0, provider=provider)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get(self, path):
+        try:
+            with urllib.request.urlopen(self.base + path) as response:
+                return response.status, response.headers['Content-Type'], response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers['Content-Type'], e.read()
+
+    def test_data_and_indicators(self):
+        status, _, body = self.get('/data?ticker=aapl&period=6mo')
+        self.assertEqual(status, 200)
+        self.assertEqual(len(json.loads(body)['data']), len(self.data))
+        self.assertEqual(self.calls, [('AAPL', '6mo', None, None)])
+
+        status, _, body = self.get('/indicators?ticker=AAPL&period=6mo&ma=10&rsi=14&macd=12,26,9')
+        self.assertEqual(status, 200)
+        body = json.loads(body)
+        expected = self.data[['Close']].copy()
+        dd.add_moving_average(expected, 10)
+        dd.calculate_rsi(expected, 14)
+        dd.calculate_macd(expected, 12, 26, 9)
+        self.assertEqual(body['columns'], list(expected.columns))
+        self.assertAlmostEqual(body['data'][-1][3], expected['MACD'].iloc[-1])
+        self.assertAlmostEqual(body['std'], dd.calculate_standard_deviation(self.data))
+        # Данные загружены один раз для обоих запросов
+        self.assertEqual(len(self.calls), 1)
+
+    def test_charts(self):
+        status, content_type, body = self.get('/chart.png?ticker=AAPL&style=ggplot')
+        self.assertEqual((status, content_type), (200, 'image/png'))
+        self.assertTrue(body.startswith(b'\x89PNG'))
+        status = self.get('/chart.png?ticker=AAPL&style=ggplot&downsample=lttb')[0]
+        self.assertEqual(status, 200)
+
+        status, content_type, body = self.get('/chart.html?ticker=AAPL&plotlyjs=directory')
+        self.assertEqual((status, content_type), (200, 'text/html; charset=utf-8'))
+        self.assertIn(b'plotly.min.js', body)
+        status, _, script = self.get('/plotly.min.js')
+        self.assertEqual(status, 200)
+        self.assertGreater(len(script), len(body))
+
+    def test_repeated_requests_hit_cache(self):
+        for _ in range(3):
+            self.assertEqual(self.get('/indicators?ticker=AAPL')[0], 200)
+        stats = json.loads(self.get('/stats')[2])
+        self.assertEqual((stats['response_cache']['hits'], stats['response_cache']['misses']), (2, 1))
+        self.assertEqual(len(self.calls), 1)
+
+    def test_errors(self):
+        cases = {'/data': 400, '/indicators?ticker=AAPL&macd=1,2': 400, '/chart.png?ticker=AAPL&downsample=x': 400,
+                 '/data?ticker=UNKNOWN': 404, '/nothing': 404, '/data?ticker=FAIL': 502}
+        for path, expected in cases.items():
+            status, content_type, body = self.get(path)
+            self.assertEqual((status, content_type), (expected, 'application/json'), path)
+            self.assertIn('error', json.loads(body))
+        self.assertEqual(self.get('/health')[0], 200)
+
+    def test_handle_without_server(self):
+        service = StockService(provider=lambda *args: self.data, cache_entries=0)
+        content_type, body = service.handle('/data', {'ticker': 'AAPL', 'start': '2000-01-03', 'end': '2000-06-01'})
+        self.assertEqual(content_type, 'application/json')
+        with self.assertRaises(ServiceError):
+            service.handle('/indicators', {'ticker': 'AAPL', 'rsi': '0'})
+
+
+if __name__ == '__main__':
+    unittest.main()
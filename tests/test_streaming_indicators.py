@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data_download import add_moving_average, calculate_rsi, calculate_macd
+from streaming_indicators import IndicatorStream, MovingAverageStream, RSIStream, MACDStream
+
+
+def make_prices(n=300, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    close[[40, 41, n - 30]] = np.nan
+    return pd.DataFrame({'Close': close}, index=pd.date_range('2023-01-02', periods=n, freq='h', tz='UTC'))
+
+
+def full_recompute(data, ma_window=5, rsi_window=5, macd_windows=(12, 26, 9)):
+    data = data.copy()
+    add_moving_average(data, window_size=ma_window)
+    calculate_rsi(data, window_size=rsi_window)
+    calculate_macd(data, *macd_windows)
+    return data
+
+
+class TestStreamingIndicators(unittest.TestCase):
+
+    def assert_matches(self, actual, expected):
+        for column in ('Moving_Average', 'RSI', 'MACD', 'Signal_Line'):
+            np.testing.assert_allclose(actual[column].to_numpy(dtype=float), expected[column].to_numpy(),
+                                       rtol=1e-10, atol=1e-10, err_msg=column)
+
+    def test_incremental_updates_match_full_recompute(self):
+        data = make_prices()
+        for split in (3, 42, 100, 271, 280):
+            stream = IndicatorStream.from_history(data.iloc[:split])
+            updates = stream.update_frame(data.iloc[split:])
+            self.assert_matches(updates, full_recompute(data).iloc[split:])
+
+    def test_from_empty_history_matches_full_recompute(self):
+        data = make_prices(60)
+        stream = IndicatorStream.from_history(data.iloc[:0])
+        self.assert_matches(stream.update_frame(data), full_recompute(data))
+
+    def test_single_indicators_with_custom_windows(self):
+        data = make_prices(200, seed=2)
+        expected = full_recompute(data, ma_window=10, rsi_window=14, macd_windows=(5, 35, 5))
+
+        ma = MovingAverageStream.from_history(data.iloc[:150], window_size=10)
+        rsi = RSIStream.from_history(data.iloc[:150], window_size=14)
+        macd = MACDStream.from_history(data.iloc[:150], 5, 35, 5)
+        closes = data['Close'].iloc[150:]
+        np.testing.assert_allclose(ma.update_many(closes), expected['Moving_Average'].iloc[150:], rtol=1e-10)
+        np.testing.assert_allclose(rsi.update_many(closes), expected['RSI'].iloc[150:], rtol=1e-10)
+        np.testing.assert_allclose(macd.update_many(closes), expected[['MACD', 'Signal_Line']].iloc[150:],
+                                   rtol=1e-10)
+
+    def test_long_stream_with_flat_segment(self):
+        data = make_prices(20000, seed=3)
+        data.iloc[5000:5100, 0] = data['Close'].iloc[4999]
+        expected = full_recompute(data, ma_window=200, rsi_window=14)
+
+        ma = MovingAverageStream(200)
+        rsi = RSIStream(14)
+        np.testing.assert_allclose(ma.update_many(data['Close']), expected['Moving_Average'], rtol=1e-10)
+        np.testing.assert_allclose(rsi.update_many(data['Close']), expected['RSI'], rtol=1e-10, atol=1e-10)
+        # Окно без изменений цены даёт NaN, как и calculate_rsi
+        self.assertTrue(np.isnan(RSIStream(5).update_many(data['Close'].iloc[5000:5100])[10:]).all())
+
+    def test_checkpoint_and_resume(self):
+        data = make_prices()
+        stream = IndicatorStream.from_history(data.iloc[:200])
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'state.json')
+            stream.save(filename)
+            resumed = IndicatorStream.load(filename)
+
+        updates = resumed.update_frame(data)
+        self.assertEqual(len(updates), 100)
+        self.assert_matches(updates, full_recompute(data).iloc[200:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.run_benchmarks import compare_results, run, run_pipeline
+from benchmarks.synthetic import OHLCV_COLUMNS, generate_ohlcv, generate_panel, generate_universe
+
+
+class TestSynthetic(unittest.TestCase):
+
+    def test_ohlcv_shape_matches_downloaded_data(self):
+        reference = pd.read_csv('AAPL_3mo_stock_data.csv', index_col=0)
+        data = generate_ohlcv(500, freq='min')
+        self.assertEqual(list(data.columns), list(reference.columns.drop('Moving_Average')))
+        self.assertEqual(list(data.columns), OHLCV_COLUMNS)
+        self.assertEqual(len(data), 500)
+        self.assertEqual(str(data.index.tz), 'America/New_York')
+        self.assertEqual(data['Volume'].dtype, np.int64)
+
+    def test_ohlcv_consistent_and_seeded(self):
+        data = generate_ohlcv(2000, seed=3)
+        self.assertTrue((data['High'] >= data[['Open', 'Close']].max(axis=1)).all())
+        self.assertTrue((data['Low'] <= data[['Open', 'Close']].min(axis=1)).all())
+        pd.testing.assert_frame_equal(data, generate_ohlcv(2000, seed=3))
+        self.assertFalse(data['Close'].equals(generate_ohlcv(2000, seed=4)['Close']))
+
+    def test_long_series_stay_in_timestamp_range(self):
+        data = generate_ohlcv(10_000_000, freq='min')
+        # Последний бар представим в наносекундах (даты до 2262 года)
+        self.assertEqual(data.index.as_unit('ns')[-1], data.index[-1])
+        self.assertLess(data.index[-1], pd.Timestamp('2100-01-01', tz='America/New_York'))
+        del data
+        self.assertLess(generate_ohlcv(100_000).index[-1].tz_convert(None), pd.Timestamp.max)
+        with self.assertRaisesRegex(ValueError, 'freq'):
+            generate_ohlcv(1_000_000, freq='B')
+
+    def test_universe_and_panel(self):
+        universe = generate_universe(3, 100)
+        self.assertEqual(list(universe), ['T0000', 'T0001', 'T0002'])
+        panel = generate_panel(200, 5)
+        self.assertEqual(panel.shape, (200, 5))
+        self.assertTrue(panel.iloc[-1].notna().any())
+
+
+class TestRunBenchmarks(unittest.TestCase):
+
+    def test_run_measures_requested_stages(self):
+        results = run([200], [2], stages=('fetch', 'rsi_macd'), repeat=1)
+        self.assertEqual([r['stage'] for r in results], ['fetch', 'rsi_macd'])
+        for record in results:
+            self.assertEqual((record['rows'], record['tickers']), (200, 2))
+            self.assertGreater(record['seconds'], 0)
+            self.assertIn('peak_mb', record)
+
+    def test_failed_stage_aborts_pipeline(self):
+        frames = generate_universe(2, 50)
+        with patch('data_download.fetch_stock_data', return_value=None), self.assertRaisesRegex(RuntimeError, 'fetch'):
+            run_pipeline(frames, ('fetch',))
+        with patch('data_download.calculate_macd', side_effect=lambda data, **kwargs: data), \
+                self.assertRaisesRegex(RuntimeError, 'MACD'):
+            run_pipeline(frames, ('rsi_macd',))
+
+    def test_compare_results_flags_regressions(self):
+        baseline = [{'rows': 10, 'tickers': 1, 'stage': 'fetch', 'seconds': 0.10, 'peak_mb': 10.0},
+                    {'rows': 10, 'tickers': 1, 'stage': 'rsi_macd', 'seconds': 0.001, 'peak_mb': 1.0}]
+        current = [{'rows': 10, 'tickers': 1, 'stage': 'fetch', 'seconds': 0.20, 'peak_mb': 10.5},
+                   # Рост в 3 раза, но меньше абсолютного порога - шум
+                   {'rows': 10, 'tickers': 1, 'stage': 'rsi_macd', 'seconds': 0.003, 'peak_mb': 1.2},
+                   {'rows': 99, 'tickers': 1, 'stage': 'fetch', 'seconds': 5.0}]
+        regressions = compare_results(current, baseline, tolerance=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual((regressions[0]['stage'], regressions[0]['metric']), ('fetch', 'seconds'))
+        self.assertAlmostEqual(regressions[0]['change'], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()